@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Compares DesktopEntry parsing against the previous line-splitting parser
+
+Usage: scripts/benchmark_desktop_entry.py [DIRECTORY...] [--count N]
+
+Desktop files are collected from the given directories, or from the usual
+application directories, and repeated until N files are parsed per round.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tweakslite.desktop_entry import DesktopEntry, logger  # noqa: E402
+
+DEFAULT_DIRECTORIES = [
+    "/usr/share/applications",
+    "/usr/local/share/applications",
+    "/var/lib/flatpak/exports/share/applications",
+    os.path.expanduser("~/.local/share/applications"),
+    os.path.expanduser("~/.local/share/flatpak/exports/share/applications"),
+]
+
+
+class LegacyDesktopEntry:
+    """The parser DesktopEntry used before, kept for comparison"""
+
+    def __init__(self, path, content):
+        logger.debug(f"Creating DesktopEntry for {path}")
+        self.path = path
+        self.content = content
+        self.name = None
+        self.exec = None
+        self.icon = None
+        self.description = ""
+        self.no_display = False
+        self.terminal = False
+        self.hidden = False
+
+        current_group = None
+        for line in content.split("\n"):
+            line = line.strip()
+            if line.startswith("["):
+                current_group = line
+                continue
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            if current_group == "[Desktop Entry]":
+                key, value = line.split("=", 1)
+                key = key.strip()
+                value = value.strip()
+                if key == "Name":
+                    self.name = value
+                elif key == "Exec":
+                    self.exec = value
+                elif key == "Icon":
+                    self.icon = value
+                elif key == "Comment":
+                    self.description = value
+                elif key == "NoDisplay":
+                    self.no_display = value.lower() == "true"
+                elif key == "Terminal":
+                    self.terminal = value.lower() == "true"
+                elif key == "Hidden":
+                    self.hidden = value.lower() == "true"
+
+
+def load_files(directories):
+    """Reads every desktop file in the directories"""
+    files = []
+    for directory in directories:
+        for path in sorted(glob.glob(os.path.join(directory, "*.desktop"))):
+            try:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    files.append((path, f.read()))
+            except OSError:
+                continue
+    return files
+
+
+def measure(label, parse, files, rounds):
+    """Runs parse over all files and prints the best round"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for path, content in files:
+            parse(path, content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    per_file = best / len(files) * 1e6
+    print(f"{label:<12} {best * 1000:9.2f} ms  {per_file:7.2f} us/file")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directories", nargs="*", default=DEFAULT_DIRECTORIES)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    files = load_files(args.directories)
+    if not files:
+        print("No desktop files found", file=sys.stderr)
+        return 1
+    unique = len(files)
+    files = (files * (args.count // unique + 1))[: args.count]
+    print(f"Parsing {len(files)} files ({unique} unique), best of {args.rounds}")
+
+    legacy = measure("legacy", LegacyDesktopEntry, files, args.rounds)
+    current = measure("DesktopEntry", DesktopEntry, files, args.rounds)
+    print(f"ratio        {current / legacy:9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Times keystroke queries against a search index of synthetic applications
+
+Usage: scripts/benchmark_search_index.py [--count N] [--rounds N]
+
+Each query is run with an empty result cache, as typing a new character
+would, and the best round is reported per query.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tweakslite.search_index import SearchIndex  # noqa: E402
+
+QUERIES = ["w", "wo", "wor", "word", "word4", "tool", "utilty", "app 5"]
+
+
+def build_index(count):
+    """Builds an index shaped like the application picker's"""
+    index = SearchIndex()
+    for i in range(count):
+        index.add(
+            i, [(f"Application {i} word{i % 97} tool{i % 13}", 4), ("Utility", 1)]
+        )
+    return index
+
+
+def measure(index, query, rounds):
+    """Runs one query uncached and returns the best time in seconds"""
+    best = None
+    for _ in range(rounds):
+        index._cache.clear()
+        start = time.perf_counter()
+        index.search(query)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_index(args.count)
+    print(f"Indexed {args.count} keys in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    total = 0
+    for query in QUERIES:
+        best = measure(index, query, args.rounds)
+        total += best
+        print(f"{query!r:<10} {best * 1000:8.3f} ms")
+    print(f"{'average':<10} {total / len(QUERIES) * 1000:8.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
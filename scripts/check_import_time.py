@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Checks how long importing the application takes on a cold interpreter
+
+Usage: scripts/check_import_time.py [--budget MS] [--top N]
+
+Imports tweakslite.application in a fresh interpreter run with
+`-X importtime`, prints the slowest imports and fails when the total import
+time exceeds the budget, or when a module that is meant to be loaded on
+first use was imported at startup.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+IMPORT_CODE = (
+    "import gi; "
+    "gi.require_version('Gtk', '4.0'); "
+    "gi.require_version('Adw', '1'); "
+    "import tweakslite.application"
+)
+
+# Modules the application only loads once something needs them
+DEFERRED_MODULES = ("dbus", "gi.repository.GnomeDesktop", "tweakslite.views")
+
+DEFAULT_BUDGET_MS = 400
+
+
+def measure_imports():
+    """Gets (module, self µs, cumulative µs) for every import at startup"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CODE],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        sys.exit(f"Importing the application failed:\n{result.stderr}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+
+def is_deferred(module):
+    return any(
+        module == name or module.startswith(f"{name}.") for name in DEFERRED_MODULES
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"maximum total import time in ms (default {DEFAULT_BUDGET_MS})",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="number of slowest imports to show"
+    )
+    args = parser.parse_args()
+
+    imports = measure_imports()
+    total_ms = sum(self_us for _, self_us, _ in imports) / 1000
+
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    for module, self_us, cumulative_us in sorted(imports, key=lambda i: -i[1])[
+        : args.top
+    ]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}  {module}")
+    print(f"\n{len(imports)} modules imported in {total_ms:.1f} ms")
+
+    failed = False
+    deferred = [module for module, _, _ in imports if is_deferred(module)]
+    if deferred:
+        print(f"Imported at startup but meant to load on first use: {deferred}")
+        failed = True
+    if total_ms > args.budget:
+        print(f"Import time exceeds the budget of {args.budget:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
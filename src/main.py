@@ -14,16 +14,28 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import sys
-import logging
-import signal
-import gi
+import time
+
+# Imports are timed for --profile-startup, which is only parsed later
+IMPORT_START = time.monotonic()
+
+import sys  # noqa: E402
+import logging  # noqa: E402
+import signal  # noqa: E402
+import gi  # noqa: E402
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
+from gi.repository import Adw, Gtk  # noqa: E402, F401
+
+GI_IMPORTED = time.monotonic()
+
 from tweakslite.application import TweaksLiteApp  # noqa: E402
+from tweakslite.startup_profile import enable_profiling  # noqa: E402
 from tweakslite.utils import setup_logging  # noqa: E402
 
+IMPORTED = time.monotonic()
+
 
 def signal_handler(signum, frame):
     """Handle interrupt signals gracefully"""
@@ -43,6 +55,15 @@ def main():
         # Remove debug flag so GTK doesn't complain
         sys.argv.remove("--debug")
 
+    # Check for startup profiling, optionally written as JSON to a file
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+            sys.argv.remove(arg)
+            json_path = arg.partition("=")[2] or None
+            profiler = enable_profiling(IMPORT_START, json_path)
+            profiler.add("gi imports", IMPORT_START, GI_IMPORTED)
+            profiler.add("application imports", GI_IMPORTED, IMPORTED)
+
     # Setup logging
     setup_logging(debug_enabled)
 
@@ -12,6 +12,13 @@ __license__ = "GPL-3.0-or-later"
 __author__ = "Jay W"
 __copyright__ = "Copyright (C) 2024 Jay W"
 
-from .application import TweaksLiteApp
-
 __all__ = ["TweaksLiteApp"]
+
+
+def __getattr__(name):
+    # The application pulls in GTK, so it is only imported when asked for
+    if name == "TweaksLiteApp":
+        from .application import TweaksLiteApp
+
+        return TweaksLiteApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,5 @@
 from gi.repository import Adw, Gio, Gtk
+from .startup_profile import get_profiler, profile_phase
 from .window import TweaksLiteWindow
 import logging
 
@@ -22,13 +23,18 @@ class TweaksLiteApp(Adw.Application):
         win = self.props.active_window
         if not win:
             logger.debug("Creating new application window")
-            win = TweaksLiteWindow(application=self)
+            with profile_phase("create window"):
+                win = TweaksLiteWindow(application=self)
+            profiler = get_profiler()
+            if profiler:
+                profiler.watch_first_frame(win)
         win.present()
 
     def do_startup(self):
         """Initializes the application on startup"""
         logger.debug("Starting up application")
-        Adw.Application.do_startup(self)
+        with profile_phase("application startup"):
+            Adw.Application.do_startup(self)
 
         # Add actions
         logger.debug("Setting up application actions")
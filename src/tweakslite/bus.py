@@ -0,0 +1,25 @@
+import logging
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.bus")
+
+_main_loop_set = False
+
+
+def get_session_bus():
+    """Gets the dbus-python session bus connection
+
+    dbus-python and its GLib main loop integration are only imported here,
+    the first time something talks to the bus, so startup does not pay for
+    them. The connection itself is shared by dbus-python.
+    """
+    global _main_loop_set
+    import dbus
+
+    if not _main_loop_set:
+        from dbus.mainloop.glib import DBusGMainLoop
+
+        logger.debug("Connecting to the session bus")
+        DBusGMainLoop(set_as_default=True)
+        _main_loop_set = True
+    return dbus.SessionBus()
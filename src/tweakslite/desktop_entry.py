@@ -1,58 +1,264 @@
 import os
 import logging
+from functools import lru_cache
 
 # Get logger for this module
 logger = logging.getLogger("tweakslite.desktop_entry")
 
+DESKTOP_ENTRY_GROUP = "[Desktop Entry]"
+AUTOSTART_PREFIX = "X-GNOME-Autostart-"
+
+# Keys that may carry Key[locale] translations
+LOCALIZED_KEYS = frozenset(("Name", "GenericName", "Comment", "Keywords", "Icon"))
+
+ESCAPES = {"s": " ", "n": "\n", "t": "\t", "r": "\r", "\\": "\\", ";": ";"}
+
+
+def unescape(value):
+    """Resolves the \\s, \\n, \\t, \\r and \\\\ escape sequences of a value"""
+    if "\\" not in value:
+        return value
+    result = []
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == "\\" and i + 1 < len(value):
+            result.append(ESCAPES.get(value[i + 1], value[i : i + 2]))
+            i += 2
+        else:
+            result.append(char)
+            i += 1
+    return "".join(result)
+
+
+def split_list(value):
+    """Splits a list value on unescaped semicolons, dropping empty items"""
+    if "\\" not in value:
+        return [item for item in value.split(";") if item]
+    items = []
+    start = 0
+    i = 0
+    while i < len(value):
+        if value[i] == "\\":
+            i += 2
+            continue
+        if value[i] == ";":
+            items.append(value[start:i])
+            start = i + 1
+        i += 1
+    items.append(value[start:])
+    return [unescape(item) for item in items if item]
+
+
+def parse_boolean(value):
+    """Parses a boolean value"""
+    return value.lower() == "true"
+
+
+# Desktop Entry key -> (attribute, value parser)
+KNOWN_KEYS = {
+    "Type": ("type", unescape),
+    "Name": ("name", unescape),
+    "GenericName": ("generic_name", unescape),
+    "Comment": ("description", unescape),
+    "Icon": ("icon", unescape),
+    "Exec": ("exec", unescape),
+    "TryExec": ("try_exec", unescape),
+    "Keywords": ("keywords", split_list),
+    "Categories": ("categories", split_list),
+    "OnlyShowIn": ("only_show_in", split_list),
+    "NotShowIn": ("not_show_in", split_list),
+    "NoDisplay": ("no_display", parse_boolean),
+    "Terminal": ("terminal", parse_boolean),
+    "Hidden": ("hidden", parse_boolean),
+}
+
+
+@lru_cache(maxsize=8)
+def get_locale_variants(locale):
+    """Lists the Key[locale] suffixes matching a locale, best match first
+
+    Follows the Desktop Entry specification: for lang_COUNTRY.ENCODING@MODIFIER
+    the order is lang_COUNTRY@MODIFIER, lang_COUNTRY, lang@MODIFIER, lang.
+    """
+    if not locale or locale in ("C", "POSIX"):
+        return ()
+    locale, _, modifier = locale.partition("@")
+    locale = locale.split(".", 1)[0]
+    lang, _, country = locale.partition("_")
+    variants = []
+    if country and modifier:
+        variants.append(f"{lang}_{country}@{modifier}")
+    if country:
+        variants.append(f"{lang}_{country}")
+    if modifier:
+        variants.append(f"{lang}@{modifier}")
+    variants.append(lang)
+    return tuple(variants)
+
+
+def get_current_locale():
+    """Gets the locale used for messages from the environment"""
+    for variable in ("LC_ALL", "LC_MESSAGES", "LANG"):
+        value = os.environ.get(variable)
+        if value:
+            return value
+    return None
+
+
+_current_variants = None
+
+
+def get_current_locale_variants():
+    """Gets the locale variants of the current locale, looked up only once"""
+    global _current_variants
+    if _current_variants is None:
+        _current_variants = get_locale_variants(get_current_locale())
+    return _current_variants
+
 
 class DesktopEntry:
-    def __init__(self, path, content):
+    """Contents of the [Desktop Entry] group of a desktop file
+
+    Only the [Desktop Entry] group is scanned, in a single pass that ends where
+    the next group starts. Localized keys resolve to the best translation
+    for the current locale.
+    """
+
+    __slots__ = (
+        "path",
+        "content",
+        "mtime",
+        "type",
+        "name",
+        "generic_name",
+        "description",
+        "icon",
+        "exec",
+        "try_exec",
+        "keywords",
+        "categories",
+        "only_show_in",
+        "not_show_in",
+        "no_display",
+        "terminal",
+        "hidden",
+        "autostart",
+    )
+
+    def __init__(self, path, content, mtime=None, locale=None):
         logger.debug(f"Creating DesktopEntry for {path}")
         self.path = path
         self.content = content  # Store the original content
+        self.mtime = mtime
+        self.type = None
         self.name = None
-        self.exec = None
-        self.icon = None
+        self.generic_name = None
         self.description = ""
+        self.icon = None
+        self.exec = None
+        self.try_exec = None
+        self.keywords = []
+        self.categories = []
+        self.only_show_in = []
+        self.not_show_in = []
         self.no_display = False
         self.terminal = False
         self.hidden = False
+        self.autostart = {}  # X-GNOME-Autostart-* keys without the prefix
 
-        # Parse desktop file content
-        logger.debug("Parsing desktop file content")
-        current_group = None
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("["):
-                current_group = line
-                continue
-            if not line or line.startswith("#") or "=" not in line:
+        if locale is None:
+            variants = get_current_locale_variants()
+        else:
+            variants = get_locale_variants(locale)
+        self._parse(content, variants)
+
+    def _parse(self, content, variants):
+        """Reads the keys of the [Desktop Entry] group"""
+        unlocalized = len(variants)
+        # Rank of the translation chosen so far for each localized key
+        ranks = {}
+
+        # Only the [Desktop Entry] group is looked at, up to the next group
+        start = content.find(DESKTOP_ENTRY_GROUP)
+        if start < 0:
+            return
+        start += len(DESKTOP_ENTRY_GROUP)
+        end = content.find("\n[", start)
+        group = content[start:end] if end >= 0 else content[start:]
+
+        get_known = KNOWN_KEYS.get
+        for line in group.splitlines():
+            key, separator, value = line.partition("=")
+            if not separator:
                 continue
-            if current_group == "[Desktop Entry]":
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = value.strip()
-                if key == "Name":
-                    self.name = value
-                elif key == "Exec":
-                    self.exec = value
-                elif key == "Icon":
-                    self.icon = value
-                elif key == "Comment":
-                    self.description = value
-                elif key == "NoDisplay":
-                    self.no_display = value.lower() == "true"
-                elif key == "Terminal":
-                    self.terminal = value.lower() == "true"
-                elif key == "Hidden":
-                    self.hidden = value.lower() == "true"
+            # Comments and blank keys fall through without matching anything
+            key = key.strip()
+
+            if key[-1:] == "]":
+                bracket = key.find("[")
+                suffix = key[bracket + 1 : -1]
+                if bracket < 0 or suffix not in variants:
+                    continue
+                key = key[:bracket]
+                if key not in LOCALIZED_KEYS:
+                    continue
+                rank = variants.index(suffix)
+                if ranks.get(key, unlocalized + 1) <= rank:
+                    continue
+                ranks[key] = rank
+            elif key in LOCALIZED_KEYS:
+                # A translation or an earlier value has already been used
+                if key in ranks:
+                    continue
+                ranks[key] = unlocalized
+
+            known = get_known(key)
+            if known is not None:
+                attribute, parse = known
+                setattr(self, attribute, parse(value.strip()))
+            elif key.startswith(AUTOSTART_PREFIX):
+                self.autostart[key[len(AUTOSTART_PREFIX) :]] = unescape(value.strip())
 
     def should_show(self):
-        return not (self.no_display or self.terminal or self.hidden)
+        if self.no_display or self.terminal or self.hidden:
+            return False
+        desktops = os.environ.get("XDG_CURRENT_DESKTOP")
+        return self.is_shown_in(desktops.split(":") if desktops else [])
+
+    def is_shown_in(self, desktops):
+        """Applies OnlyShowIn and NotShowIn to a list of desktop names"""
+        if not desktops:
+            return True
+        if self.only_show_in and not any(d in self.only_show_in for d in desktops):
+            return False
+        return not any(d in self.not_show_in for d in desktops)
+
+    def is_autostart_enabled(self):
+        """Checks X-GNOME-Autostart-enabled, which defaults to true"""
+        return self.autostart.get("enabled", "true").lower() != "false"
+
+    def get_autostart_delay(self):
+        """Gets X-GNOME-Autostart-Delay in seconds"""
+        try:
+            return int(self.autostart.get("Delay", 0))
+        except ValueError:
+            return 0
 
     def get_name(self):
         return self.name or os.path.basename(self.path)
 
+    def get_generic_name(self):
+        return self.generic_name
+
+    def get_keywords(self):
+        return self.keywords
+
+    def get_executable(self):
+        """Gets the program run by Exec, like Gio.AppInfo.get_executable"""
+        command = self.try_exec or self.exec
+        return command.split(None, 1)[0] if command and command.strip() else None
+
     def get_icon_name(self):
         if self.icon:
             logger.debug(f"Processing icon: {self.icon}")
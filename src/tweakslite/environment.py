@@ -0,0 +1,112 @@
+import logging
+import os
+import shutil
+from gi.repository import Gio, GLib
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.environment")
+
+FLATPAK_INFO = "/.flatpak-info"
+HOST_ROOT = "/run/host"
+
+CAPABILITIES = (
+    "is_flatpak",
+    "host_root",
+    "has_host_dconf",
+    "has_shell_extensions",
+)
+
+
+class RuntimeEnvironment:
+    """Capabilities of the environment the application runs in
+
+    Each capability is probed the first time it is needed and remembered for
+    the rest of the session, so hot paths never touch the filesystem or the
+    bus again. Keyword arguments override the probes, e.g. in tests.
+    """
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(CAPABILITIES)
+        if unknown:
+            raise TypeError(f"Unknown capabilities: {', '.join(sorted(unknown))}")
+        self._values = dict(overrides)
+
+    def _get(self, name, probe):
+        """Returns a remembered capability, probing it on first use"""
+        try:
+            return self._values[name]
+        except KeyError:
+            value = self._values[name] = probe()
+            logger.debug(f"Probed {name}: {value!r}")
+            return value
+
+    @property
+    def is_flatpak(self):
+        """Whether the application runs inside Flatpak"""
+        return self._get("is_flatpak", lambda: os.path.exists(FLATPAK_INFO))
+
+    @property
+    def host_root(self):
+        """Directory where the host file system is visible, or None"""
+        return self._get("host_root", self._probe_host_root)
+
+    @property
+    def has_host_dconf(self):
+        """Whether the dconf command line tool exists on the host"""
+        return self._get("has_host_dconf", self._probe_host_dconf)
+
+    @property
+    def has_shell_extensions(self):
+        """Whether GNOME Shell exposes its extensions interface"""
+        return self._get("has_shell_extensions", self._probe_shell)
+
+    def _probe_host_root(self):
+        """Finds the host /usr mounted into the sandbox"""
+        if not self.is_flatpak:
+            return "/"
+        if os.path.isdir(os.path.join(HOST_ROOT, "usr", "share")):
+            return HOST_ROOT
+        return None
+
+    def _probe_host_dconf(self):
+        """Looks up the dconf binary on the host"""
+        if not self.is_flatpak:
+            return shutil.which("dconf") is not None
+        from .utils import run_command
+
+        return bool(run_command(["sh", "-c", "command -v dconf || true"]))
+
+    def _probe_shell(self):
+        """Asks GNOME Shell for its extensions interface"""
+        try:
+            proxy = Gio.DBusProxy.new_for_bus_sync(
+                Gio.BusType.SESSION,
+                Gio.DBusProxyFlags.DO_NOT_AUTO_START
+                | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS,
+                None,
+                "org.gnome.Shell",
+                "/org/gnome/Shell",
+                "org.gnome.Shell.Extensions",
+                None,
+            )
+            return proxy.get_name_owner() is not None
+        except GLib.Error as e:
+            logger.warning(f"Could not reach GNOME Shell: {e.message}")
+            return False
+
+
+_environment = None
+
+
+def get_runtime_environment():
+    """Returns the shared runtime environment, creating it on first use"""
+    global _environment
+    if _environment is None:
+        _environment = RuntimeEnvironment()
+    return _environment
+
+
+def set_runtime_environment(environment):
+    """Replaces the shared runtime environment, None resetting it"""
+    global _environment
+    _environment = environment
@@ -0,0 +1,252 @@
+import atexit
+import logging
+import os
+import selectors
+import shlex
+import subprocess
+import threading
+import time
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.host")
+
+# Shell loop executed once on the host. It first prints its working
+# directory on a line of its own. Each request is a line holding the byte
+# length of the command followed by the command itself; each response is a
+# "<returncode> <stdout length> <stderr length>" line followed by the raw
+# stdout and stderr bytes. Commands run as jobs in their own process group,
+# whose id is kept in the "pid" file of the working directory while they run.
+HELPER_SCRIPT = r"""
+export LC_ALL=C
+set -m
+tmp=$(mktemp -d) || exit 1
+trap 'rm -rf "$tmp"' EXIT
+printf '%s\n' "$tmp"
+while IFS= read -r len; do
+    cmd=""
+    if [ "$len" -gt 0 ]; then
+        IFS= read -r -N "$len" cmd || exit 0
+    fi
+    bash -c "$cmd" >"$tmp/out" 2>"$tmp/err" </dev/null &
+    printf '%d' "$!" >"$tmp/pid"
+    wait "$!"
+    rc=$?
+    rm -f "$tmp/pid"
+    printf '%d %d %d\n' "$rc" "$(wc -c <"$tmp/out")" "$(wc -c <"$tmp/err")"
+    cat "$tmp/out" "$tmp/err"
+done
+"""
+
+# Stops the process group of the command the helper is running, if any
+INTERRUPT_SCRIPT = 'pid=$(cat "$1" 2>/dev/null) && kill -TERM "-$pid"; true'
+
+DEFAULT_TIMEOUT = 30
+
+# Seconds between checks for cancellation while waiting for a command
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class HostHelperError(Exception):
+    """Raised when a command could not be sent to the host helper
+
+    The command did not run, so it is safe to retry it some other way.
+    """
+
+
+class HostHelperLostError(Exception):
+    """Raised when the host helper failed after a command was sent
+
+    The command may or may not have run on the host, so it must not be
+    run again.
+    """
+
+
+class HostHelper:
+    """Long-lived host shell that runs commands over a framed pipe protocol"""
+
+    def __init__(self, spawn_prefix=("flatpak-spawn", "--host"), timeout=None):
+        self.spawn_prefix = list(spawn_prefix)
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.process = None
+        self.work_dir = None
+        self._buffer = b""
+        self._lock = threading.Lock()
+        self._cancelled = None
+        self._interrupted = False
+
+    def _start(self):
+        """Starts the helper process on the host"""
+        argv = self.spawn_prefix + ["bash", "-c", HELPER_SCRIPT]
+        logger.debug("Starting host helper process")
+        try:
+            self.process = subprocess.Popen(
+                argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            self.process = None
+            raise HostHelperError(f"Could not start host helper: {e}") from e
+        self.work_dir = None
+        self._buffer = b""
+
+    def is_running(self):
+        """Checks whether the helper process is alive"""
+        return self.process is not None and self.process.poll() is None
+
+    def close(self):
+        """Stops the helper process"""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        logger.debug("Host helper process stopped")
+
+    def _read_exact(self, size, deadline):
+        """Reads exactly size bytes from the helper before the deadline"""
+        while len(self._buffer) < size:
+            self._fill(deadline)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _read_line(self, deadline):
+        """Reads one newline-terminated line from the helper"""
+        while b"\n" not in self._buffer:
+            self._fill(deadline)
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def _fill(self, deadline):
+        """Reads whatever is available on the helper's stdout
+
+        Interrupts the running command once the request is cancelled.
+        """
+        fd = self.process.stdout.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired("host helper", self.timeout)
+                if self._cancelled is None or self._interrupted:
+                    wait = remaining
+                elif self._cancelled.is_set() and self.work_dir is not None:
+                    self._interrupt()
+                    wait = remaining
+                else:
+                    wait = min(remaining, CANCEL_POLL_INTERVAL)
+                if selector.select(wait):
+                    break
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            raise HostHelperError("Host helper exited unexpectedly")
+        self._buffer += chunk
+
+    def _interrupt(self):
+        """Stops the command the helper is running, keeping the helper"""
+        self._interrupted = True
+        logger.debug("Interrupting host command")
+        argv = self.spawn_prefix + [
+            "sh",
+            "-c",
+            INTERRUPT_SCRIPT,
+            "sh",
+            os.path.join(self.work_dir, "pid"),
+        ]
+        try:
+            subprocess.run(
+                argv,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Could not interrupt host command: {e}")
+
+    def _roundtrip(self, script, deadline):
+        """Sends one request and reads its framed response"""
+        payload = script.encode()
+        try:
+            self.process.stdin.write(b"%d\n" % len(payload) + payload)
+            self.process.stdin.flush()
+        except OSError as e:
+            # The helper only runs a command once it has read all of it
+            raise HostHelperError(f"Could not send command: {e}") from e
+
+        try:
+            if self.work_dir is None:
+                self.work_dir = self._read_line(deadline).decode()
+            header = self._read_line(deadline).split()
+            if len(header) != 3:
+                raise HostHelperError(f"Malformed host helper response: {header!r}")
+            returncode, out_len, err_len = (int(value) for value in header)
+            stdout = self._read_exact(out_len, deadline)
+            stderr = self._read_exact(err_len, deadline)
+        except (OSError, HostHelperError) as e:
+            raise HostHelperLostError(str(e)) from e
+        return returncode, stdout, stderr
+
+    def _run_locked(self, command, script, timeout):
+        """Sends a command, starting the helper if needed"""
+        # Retry once with a fresh process if the helper died before it
+        # got the command
+        for attempt in range(2):
+            if not self.is_running():
+                self._start()
+            deadline = time.monotonic() + timeout
+            try:
+                return self._roundtrip(script, deadline)
+            except subprocess.TimeoutExpired:
+                logger.error(f"Host helper timed out after {timeout}s")
+                self.close()
+                raise subprocess.TimeoutExpired(command, timeout)
+            except HostHelperLostError as e:
+                logger.error(f"Host helper failed while running a command: {e}")
+                self.close()
+                raise
+            except HostHelperError as e:
+                logger.warning(f"Host helper failed: {e}")
+                self.close()
+                if attempt:
+                    raise
+
+    def run(self, command, timeout=None, text=True, cancelled=None):
+        """Runs a command on the host and returns a CompletedProcess
+
+        With text=False stdout and stderr are returned as bytes. Setting the
+        threading.Event cancelled stops the command while it runs; the
+        helper itself keeps running.
+        """
+        script = command if isinstance(command, str) else shlex.join(command)
+        timeout = timeout or self.timeout
+
+        with self._lock:
+            self._cancelled = cancelled
+            self._interrupted = False
+            try:
+                returncode, stdout, stderr = self._run_locked(command, script, timeout)
+            finally:
+                self._cancelled = None
+
+        if text:
+            stdout = stdout.decode(errors="replace")
+            stderr = stderr.decode(errors="replace")
+        return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+
+
+_helper = None
+
+
+def get_host_helper():
+    """Returns the shared host helper, creating it on first use"""
+    global _helper
+    if _helper is None:
+        _helper = HostHelper()
+        atexit.register(_helper.close)
+    return _helper
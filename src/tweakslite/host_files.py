@@ -0,0 +1,77 @@
+import os
+import logging
+from .environment import get_runtime_environment
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.host_files")
+
+# Host directories Flatpak mounts below the host root when permitted
+HOST_ROOT_PREFIXES = ("/usr/", "/etc/")
+
+
+class HostFiles:
+    """Reads host files directly wherever the sandbox can see them
+
+    Outside Flatpak every path is local. In Flatpak, /usr and /etc of the
+    host appear below the host root (/run/host), and other paths such as
+    the Flatpak export directories are visible as-is when the app has the
+    filesystem permission. Callers fall back to host commands for the paths
+    this returns None for.
+    """
+
+    def __init__(self, environment=None):
+        self.environment = environment or get_runtime_environment()
+
+    def local_path(self, path):
+        """Maps a host path to where it can be read here, or None"""
+        if not self.environment.is_flatpak:
+            return path
+        if path.startswith(HOST_ROOT_PREFIXES):
+            host_root = self.environment.host_root
+            if not host_root:
+                return None
+            path = os.path.join(host_root, path.lstrip("/"))
+        return path if os.path.exists(path) else None
+
+    def scan_directory(self, directory, suffix=".desktop"):
+        """Lists the files of a host directory with their mtimes
+
+        Returns (host path, mtime) pairs, following symlinks the way Flatpak
+        exports are linked, or None if the directory is not visible here.
+        A directory missing outside Flatpak simply has no files.
+        """
+        local = self.local_path(directory)
+        if local is None:
+            return None
+        files = []
+        try:
+            with os.scandir(local) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(suffix):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        # Dangling export symlink
+                        continue
+                    files.append((os.path.join(directory, entry.name), str(mtime)))
+        except FileNotFoundError:
+            return [] if not self.environment.is_flatpak else None
+        except OSError as e:
+            logger.debug(f"Cannot scan {directory} directly: {e}")
+            return None
+        return files
+
+    def read_file(self, path):
+        """Reads a host text file, or returns None if it is not visible here"""
+        local = self.local_path(path)
+        if local is None:
+            return None
+        try:
+            with open(local, "rb") as f:
+                return f.read().decode("utf-8", errors="replace")
+        except OSError as e:
+            logger.debug(f"Cannot read {path} directly: {e}")
+            return None
@@ -0,0 +1,155 @@
+import os
+import logging
+import threading
+from gi.repository import Gdk, Gio, Gtk
+from .environment import get_runtime_environment
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.icons")
+
+FALLBACK_ICON = "application-x-executable"
+
+# Size application icons are shown at, used when preloading them
+ICON_SIZE = 32
+
+# File name extensions some desktop files wrongly put on icon names
+ICON_EXTENSIONS = (".png", ".svg", ".xpm")
+
+# Icon directories of Flatpak applications
+FLATPAK_ICON_DIRS = [
+    "/var/lib/flatpak/exports/share/icons",
+    os.path.join(
+        os.environ.get("HOME", ""), ".local/share/flatpak/exports/share/icons"
+    ),
+]
+
+
+def get_icon_value(app):
+    """Gets the Icon value of a DesktopEntry or Gio.AppInfo as a string"""
+    if isinstance(app, Gio.DesktopAppInfo):
+        return app.get_string("Icon")
+    if isinstance(app, Gio.AppInfo):
+        icon = app.get_icon()
+        return icon.to_string() if icon else None
+    return getattr(app, "icon", None)
+
+
+class IconResolver:
+    """Resolves desktop file Icon values to icons that exist
+
+    Values are names in the icon theme, names with a file extension, or
+    absolute paths which in Flatpak may only exist below the host root.
+    Resolved icons are cached until the icon theme changes. Resolution only
+    needs the icon theme, which GTK lets other threads use, so the cache can
+    be warmed from a worker thread; the textures are preloaded as well.
+    """
+
+    def __init__(self, theme=None, environment=None):
+        self.environment = environment or get_runtime_environment()
+        self.theme = theme
+        self.generation = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+        if theme is not None:
+            self._add_search_paths()
+            theme.connect("changed", self._on_theme_changed)
+
+    def _add_search_paths(self):
+        """Lets the theme find host and Flatpak application icons"""
+        host_root = self.environment.host_root
+        directories = list(FLATPAK_ICON_DIRS)
+        if host_root and host_root != "/":
+            directories += [
+                os.path.join(host_root, "usr/share/icons"),
+                os.path.join(host_root, "usr/share/pixmaps"),
+            ]
+        search_path = self.theme.get_search_path() or []
+        for directory in directories:
+            if directory not in search_path and os.path.isdir(directory):
+                self.theme.add_search_path(directory)
+
+    def _on_theme_changed(self, theme):
+        """Forgets everything resolved with the previous theme"""
+        logger.debug("Icon theme changed, clearing icon cache")
+        with self._lock:
+            self.generation += 1
+            self._cache.clear()
+
+    def resolve(self, value):
+        """Gets a Gio.Icon for an Icon value, falling back to a generic icon"""
+        icon = self._cache.get(value)
+        if icon is not None:
+            return icon
+
+        generation = self.generation
+        icon = self._resolve(value)
+        with self._lock:
+            # Drop results computed against a theme that has since changed
+            if generation == self.generation:
+                self._cache[value] = icon
+        return icon
+
+    def _resolve(self, value):
+        if not value:
+            return self._themed(FALLBACK_ICON)
+
+        if os.path.isabs(value):
+            for path in self._candidate_paths(value):
+                if os.path.isfile(path):
+                    icon = Gio.FileIcon.new(Gio.File.new_for_path(path))
+                    self._preload(icon)
+                    return icon
+            # Fall back to a theme icon with the same name as the file
+            value = os.path.splitext(os.path.basename(value))[0]
+        elif value.lower().endswith(ICON_EXTENSIONS):
+            value = value.rsplit(".", 1)[0]
+
+        if self.theme is not None and not self.theme.has_icon(value):
+            value = FALLBACK_ICON
+        return self._themed(value)
+
+    def _candidate_paths(self, path):
+        """Lists where an absolute icon path may be found"""
+        host_root = self.environment.host_root
+        if host_root and host_root != "/":
+            return [path, os.path.join(host_root, path.lstrip("/"))]
+        return [path]
+
+    def _themed(self, name):
+        icon = Gio.ThemedIcon.new(name)
+        self._preload(icon)
+        return icon
+
+    def _preload(self, icon):
+        """Starts loading the texture so showing the icon does not block"""
+        if self.theme is None:
+            return
+        self.theme.lookup_by_gicon(
+            icon, ICON_SIZE, 1, Gtk.TextDirection.NONE, Gtk.IconLookupFlags.PRELOAD
+        )
+
+    def set_image(self, image, value):
+        """Shows the icon for an Icon value in a Gtk.Image"""
+        image.set_from_gicon(self.resolve(value))
+
+
+_icon_resolver = None
+
+
+def get_icon_resolver():
+    """Gets the icon resolver for the default display
+
+    Must first be called on the main thread, which owns the icon theme.
+    """
+    global _icon_resolver
+    if _icon_resolver is None:
+        display = Gdk.Display.get_default()
+        theme = Gtk.IconTheme.get_for_display(display) if display else None
+        _icon_resolver = IconResolver(theme)
+    return _icon_resolver
+
+
+def set_icon_resolver(resolver):
+    """Replaces the shared icon resolver, or resets it when None"""
+    global _icon_resolver
+    _icon_resolver = resolver
@@ -1,4 +1,5 @@
 from .dconf import DConfSettings
 from .autostart import AutostartManager
+from .app_index import ApplicationIndex
 
-__all__ = ["DConfSettings", "AutostartManager"]
+__all__ = ["DConfSettings", "AutostartManager", "ApplicationIndex"]
@@ -0,0 +1,191 @@
+import os
+import logging
+import shlex
+import sqlite3
+from gi.repository import GLib
+from ..host_files import HostFiles
+from ..utils import run_command
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.managers.app_index")
+
+# Bumped whenever the layout of the cache database changes
+INDEX_VERSION = 1
+
+HOST_APPLICATION_DIR = "/usr/share/applications"
+
+# Lists the desktop files of the given directories as
+# "<directory>\0<path>\0<mtime>\0", following the symlinks Flatpak exports
+LIST_SCRIPT = (
+    "find -L {directories} -maxdepth 1 -name '*.desktop' -type f "
+    "-printf '%H\\0%p\\0%T@\\0' 2>/dev/null; true"
+)
+
+# Prints each given file as "<path>\0<content>\0"
+READ_SCRIPT = (
+    "for f in {paths}; do "
+    "printf '%s\\0' \"$f\"; cat \"$f\" 2>/dev/null; printf '\\0'; "
+    "done"
+)
+
+
+def get_flatpak_application_dirs():
+    """Gets the directories where Flatpak exports application desktop files"""
+    return [
+        "/var/lib/flatpak/exports/share/applications",
+        os.path.join(
+            os.environ.get("HOME", ""),
+            ".local/share/flatpak/exports/share/applications",
+        ),
+    ]
+
+
+def get_default_cache_path():
+    """Gets the location of the index database"""
+    return os.path.join(GLib.get_user_cache_dir(), "tweakslite", "applications.db")
+
+
+def _split_records(data, size):
+    """Splits a NUL-delimited stream into records of size fields"""
+    fields = data.split("\0")
+    count = len(fields) // size
+    return [tuple(fields[i * size : (i + 1) * size]) for i in range(count)]
+
+
+class ApplicationIndex:
+    """On-disk index of the desktop files of installed applications
+
+    The contents of every desktop file are kept in an SQLite database keyed by
+    path and mtime. Loading lists the application directories and only reads
+    the files that are new or changed since the last load. Directories and
+    files the sandbox can see are read directly; the rest are listed and
+    read with one batched host command each.
+    """
+
+    def __init__(self, directories=None, cache_path=None, host_files=None):
+        self.directories = directories or (
+            [HOST_APPLICATION_DIR] + get_flatpak_application_dirs()
+        )
+        self.cache_path = cache_path or get_default_cache_path()
+        self.host_files = host_files or HostFiles()
+
+    def _connect(self):
+        """Opens the database, recreating it if it is unusable or outdated"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            try:
+                return self._open(self.cache_path)
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Recreating application index: {e}")
+                os.remove(self.cache_path)
+                return self._open(self.cache_path)
+        except (OSError, sqlite3.DatabaseError) as e:
+            # Still works, but everything is read again on every load
+            logger.error(f"Application index unavailable: {e}")
+            return self._open(":memory:")
+
+    @staticmethod
+    def _open(path):
+        """Opens a database and creates the schema if needed"""
+        connection = sqlite3.connect(path)
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_VERSION:
+                connection.executescript(
+                    f"""
+                    DROP TABLE IF EXISTS entries;
+                    CREATE TABLE entries (
+                        path TEXT PRIMARY KEY,
+                        directory TEXT NOT NULL,
+                        mtime TEXT NOT NULL,
+                        content TEXT NOT NULL
+                    );
+                    PRAGMA user_version = {INDEX_VERSION};
+                    """
+                )
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def _list_files(self):
+        """Lists the desktop files of all directories with their mtimes"""
+        listing = {}
+        hidden = []
+        for directory in self.directories:
+            files = self.host_files.scan_directory(directory)
+            if files is None:
+                hidden.append(directory)
+                continue
+            for path, mtime in files:
+                listing[path] = (directory, mtime)
+        if not hidden:
+            return listing
+
+        logger.debug(f"Listing {len(hidden)} directories through the host")
+        script = LIST_SCRIPT.format(
+            directories=" ".join(shlex.quote(d) for d in hidden)
+        )
+        output = run_command(script, shell=True) or ""
+        for directory, path, mtime in _split_records(output, 3):
+            listing[path] = (directory, mtime)
+        return listing
+
+    def _read_files(self, paths):
+        """Reads the contents of several files, directly where possible"""
+        contents = {}
+        hidden = []
+        for path in paths:
+            content = self.host_files.read_file(path)
+            if content is None:
+                hidden.append(path)
+            else:
+                contents[path] = content
+        if not hidden:
+            return contents
+
+        logger.debug(f"Reading {len(hidden)} files through the host")
+        script = READ_SCRIPT.format(paths=" ".join(shlex.quote(p) for p in hidden))
+        output = run_command(script, shell=True) or ""
+        contents.update(_split_records(output, 2))
+        return contents
+
+    def load(self):
+        """Brings the index up to date and returns it
+
+        Returns a dict mapping each directory to a list of (path, content)
+        pairs sorted by path.
+        """
+        listing = self._list_files()
+        connection = self._connect()
+        with connection:
+            cached = dict(connection.execute("SELECT path, mtime FROM entries"))
+            removed = [(path,) for path in cached if path not in listing]
+            changed = [
+                path
+                for path, (_, mtime) in listing.items()
+                if cached.get(path) != mtime
+            ]
+            contents = self._read_files(changed)
+            connection.executemany("DELETE FROM entries WHERE path = ?", removed)
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                [
+                    (path, listing[path][0], listing[path][1], contents[path])
+                    for path in changed
+                    if path in contents
+                ],
+            )
+            rows = connection.execute(
+                "SELECT directory, path, content FROM entries ORDER BY path"
+            ).fetchall()
+        connection.close()
+        logger.debug(
+            f"Application index: {len(rows)} files, {len(changed)} read, "
+            f"{len(removed)} removed"
+        )
+
+        index = {}
+        for directory, path, content in rows:
+            index.setdefault(directory, []).append((path, content))
+        return index
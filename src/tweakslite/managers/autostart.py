@@ -1,20 +1,84 @@
 import os
 import logging
-from gi.repository import Gio
-from ..utils import is_flatpak, run_command
+import shlex
+from gi.repository import Gio, GLib
+from ..environment import get_runtime_environment
+from ..startup_profile import profile_phase
+from ..utils import run_command, run_command_async
 from ..desktop_entry import DesktopEntry
+from .app_index import ApplicationIndex
 
 # Get logger for this module
 logger = logging.getLogger("tweakslite.managers.autostart")
 
+# Creates the autostart directory on the host and prints each desktop file in
+# it as "<path>\0<mtime>\0<content>\0", so one host call reads them all
+BULK_READ_SCRIPT = (
+    'dir={directory}; mkdir -p "$dir" && '
+    'for f in "$dir"/*.desktop; do '
+    '[ -f "$f" ] || continue; '
+    'printf \'%s\\0%s\\0\' "$f" "$(stat -c %Y "$f")"; '
+    "cat \"$f\"; printf '\\0'; "
+    "done"
+)
+
+# Events passed to the callbacks of AutostartManager.connect_changed
+ENTRY_ADDED = "added"
+ENTRY_CHANGED = "changed"
+ENTRY_REMOVED = "removed"
+
+# File monitor events after which a desktop file is read again
+RELOAD_EVENTS = (
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.MOVED_IN,
+)
+REMOVE_EVENTS = (
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_OUT,
+)
+
+
+def parse_desktop_file_stream(data):
+    """Builds DesktopEntry objects from the output of BULK_READ_SCRIPT
+
+    Records are located by offset in the buffer so the contents are sliced
+    out once instead of being split into lines and joined again.
+    """
+    entries = []
+    position = 0
+    while position < len(data):
+        path_end = data.find("\0", position)
+        mtime_end = data.find("\0", path_end + 1) if path_end >= 0 else -1
+        content_end = data.find("\0", mtime_end + 1) if mtime_end >= 0 else -1
+        if content_end < 0:
+            logger.warning("Ignoring truncated autostart file listing")
+            break
+
+        path = data[position:path_end]
+        try:
+            mtime = float(data[path_end + 1 : mtime_end])
+        except ValueError:
+            mtime = None
+        content = data[mtime_end + 1 : content_end]
+        position = content_end + 1
+
+        try:
+            entries.append(DesktopEntry(path, content, mtime=mtime))
+        except Exception as e:
+            logger.error(f"Error loading desktop file {path}: {e}", exc_info=True)
+    return entries
+
 
 class AutostartManager:
     """Manages startup applications through .desktop files"""
 
-    def __init__(self):
+    def __init__(self, environment=None):
         """Initialize the autostart manager"""
         logger.debug("Initializing AutostartManager")
-        if is_flatpak():
+        self.environment = environment or get_runtime_environment()
+        # Index of installed applications offered when adding an entry
+        self.app_index = ApplicationIndex()
+        if self.environment.is_flatpak:
             # In Flatpak, we need to use the host's autostart directory
             # Use $HOME instead of ~ for proper expansion in Flatpak
             self.autostart_dir = os.path.join(
@@ -24,43 +88,29 @@ class AutostartManager:
             self.autostart_dir = os.path.expanduser("~/.config/autostart")
 
         # Create directory if it doesn't exist
-        if not is_flatpak():
-            os.makedirs(self.autostart_dir, exist_ok=True)
+        if not self.environment.is_flatpak:
+            with profile_phase("autostart directory"):
+                os.makedirs(self.autostart_dir, exist_ok=True)
+
+        # Loaded entries by path, kept current by a monitor on the directory
+        self.entries = None
+        self._stamps = {}
+        self._monitor = None
+        self._loading = None
+        self._load_callbacks = []
+        self._subscribers = {}
+        self._next_subscriber_id = 1
 
     def get_autostart_files(self):
         """Returns list of current autostart applications"""
         logger.debug("Getting list of autostart applications")
         autostart_apps = []
 
-        if is_flatpak():
-            # First, ensure the directory exists on the host
+        if self.environment.is_flatpak:
+            # Read every file on the host with a single command
             logger.debug("Running in Flatpak environment")
-            mkdir_cmd = f"mkdir -p '{self.autostart_dir}'"
-            run_command(mkdir_cmd, shell=True)
-
-            # Use find command to list files
-            cmd = f"find '{self.autostart_dir}' -type f -name '*.desktop'"
-            logger.debug(f"Executing find command: {cmd}")
-            result = run_command(cmd, shell=True)
-
-            if result:
-                desktop_files = result.strip().split("\n")
-                logger.debug(f"Found {len(desktop_files)} desktop files")
-                for desktop_file in desktop_files:
-                    if not desktop_file.strip():
-                        continue
-
-                    try:
-                        # Get contents of the desktop file
-                        logger.debug(f"Reading desktop file: {desktop_file}")
-                        cat_cmd = f"cat '{desktop_file}'"
-                        content = run_command(cat_cmd, shell=True)
-
-                        if content:
-                            entry = DesktopEntry(desktop_file, content)
-                            autostart_apps.append(entry)
-                    except Exception as e:
-                        logger.error(f"Error loading desktop file: {e}", exc_info=True)
+            result = run_command(self._bulk_read_command(), shell=True)
+            autostart_apps = parse_desktop_file_stream(result or "")
         else:
             # Original functionality for non-Flatpak
             logger.debug("Running in non-Flatpak environment")
@@ -81,6 +131,170 @@ class AutostartManager:
         logger.debug(f"Found {len(autostart_apps)} autostart applications")
         return autostart_apps
 
+    def get_autostart_files_async(self, callback, cancellable=None):
+        """Lists autostart applications without blocking the main loop.
+
+        callback is invoked with the list of applications once all host
+        commands have finished. Returns the Gio.Cancellable used for them.
+        """
+        if cancellable is None:
+            cancellable = Gio.Cancellable()
+
+        if not self.environment.is_flatpak:
+            # Local directory reads are cheap enough to do directly
+            callback(self.get_autostart_files())
+            return cancellable
+
+        logger.debug("Getting list of autostart applications asynchronously")
+
+        def on_read(result):
+            if cancellable.is_cancelled():
+                return
+            autostart_apps = parse_desktop_file_stream(
+                (result or b"").decode(errors="replace")
+            )
+            logger.debug(f"Found {len(autostart_apps)} autostart applications")
+            callback(autostart_apps)
+
+        run_command_async(
+            self._bulk_read_command(),
+            on_read,
+            shell=True,
+            cancellable=cancellable,
+            binary=True,
+        )
+        return cancellable
+
+    def load_entries_async(self, callback):
+        """Calls callback with the list of autostart applications
+
+        The directory is only read the first time; afterwards the entries are
+        kept up to date by a file monitor and returned from memory.
+        """
+        if self.entries is not None:
+            callback(list(self.entries.values()))
+            return
+        self._load_callbacks.append(callback)
+        if self._loading is None:
+            self._loading = self.get_autostart_files_async(self._on_entries_loaded)
+
+    def _on_entries_loaded(self, apps):
+        """Records the initial listing and starts watching the directory"""
+        self._loading = None
+        self.entries = {}
+        for app in apps:
+            path = app.get_filename()
+            self.entries[path] = app
+            self._stamps[path] = self._stat(path)
+        self._start_monitor()
+
+        callbacks, self._load_callbacks = self._load_callbacks, []
+        for callback in callbacks:
+            callback(list(self.entries.values()))
+
+    def _start_monitor(self):
+        """Watches the autostart directory for changes made anywhere"""
+        try:
+            directory = Gio.File.new_for_path(self.autostart_dir)
+            self._monitor = directory.monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+        except GLib.Error as e:
+            logger.warning(f"Cannot watch {self.autostart_dir}: {e.message}")
+            return
+        self._monitor.connect("changed", self._on_directory_changed)
+
+    def stop_monitor(self):
+        """Stops watching the autostart directory"""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+
+    def _on_directory_changed(self, monitor, file, other_file, event_type):
+        """Applies one file monitor event to the entry map"""
+        if event_type == Gio.FileMonitorEvent.RENAMED:
+            self._forget_entry(file.get_path())
+            self.update_entry(other_file.get_path())
+        elif event_type in RELOAD_EVENTS:
+            self.update_entry(file.get_path())
+        elif event_type in REMOVE_EVENTS:
+            self._forget_entry(file.get_path())
+
+    @staticmethod
+    def _stat(path):
+        """Gets what tells two versions of a file apart, or None if it is gone"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _read_entry(self, path):
+        """Loads one autostart file, or returns None if it cannot be used"""
+        try:
+            if self.environment.is_flatpak:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    content = f.read()
+                return DesktopEntry(path, content, mtime=os.path.getmtime(path))
+            return Gio.DesktopAppInfo.new_from_filename(path)
+        except Exception as e:
+            logger.error(f"Error loading desktop file {path}: {e}")
+            return None
+
+    def update_entry(self, path):
+        """Reads one autostart file again and reports what changed"""
+        if self.entries is None or not path.endswith(".desktop"):
+            return
+        stamp = self._stat(path)
+        if stamp is None:
+            self._forget_entry(path)
+            return
+        if path in self.entries and self._stamps.get(path) == stamp:
+            return
+        app = self._read_entry(path)
+        if app is None:
+            self._forget_entry(path)
+            return
+        event = ENTRY_CHANGED if path in self.entries else ENTRY_ADDED
+        self.entries[path] = app
+        self._stamps[path] = stamp
+        logger.debug(f"Autostart entry {event}: {path}")
+        self._notify(event, path, app)
+
+    def _forget_entry(self, path):
+        """Drops an entry whose file was removed"""
+        if self.entries is None or path not in self.entries:
+            return
+        app = self.entries.pop(path)
+        self._stamps.pop(path, None)
+        logger.debug(f"Autostart entry removed: {path}")
+        self._notify(ENTRY_REMOVED, path, app)
+
+    def connect_changed(self, callback):
+        """Calls callback(event, path, app) when an entry is added, changed
+        or removed. Returns an id that can be passed to disconnect_changed.
+        """
+        handler_id = self._next_subscriber_id
+        self._next_subscriber_id += 1
+        self._subscribers[handler_id] = callback
+        return handler_id
+
+    def disconnect_changed(self, handler_id):
+        """Removes a callback added with connect_changed"""
+        self._subscribers.pop(handler_id, None)
+
+    def _notify(self, event, path, app):
+        """Calls the callbacks subscribed to entry changes"""
+        for callback in list(self._subscribers.values()):
+            try:
+                callback(event, path, app)
+            except Exception as e:
+                logger.error(f"Error notifying autostart change of {path}: {e}")
+
+    def _bulk_read_command(self):
+        """Builds the host command that dumps every autostart file"""
+        return BULK_READ_SCRIPT.format(directory=shlex.quote(self.autostart_dir))
+
     def add_app_to_autostart(self, app_info):
         """Adds an application to autostart"""
         try:
@@ -110,6 +324,8 @@ class AutostartManager:
                 f.write(content)
 
             logger.debug("Successfully copied file")
+            # Report the entry right away instead of waiting for the monitor
+            self.update_entry(dest_path)
             return True
 
         except Exception as e:
@@ -125,8 +341,10 @@ class AutostartManager:
             if os.path.exists(path):
                 os.remove(path)
                 logger.info(f"Removed {filename} from autostart")
+                self._forget_entry(path)
                 return True
             logger.warning(f"File {filename} not found in autostart directory")
+            self._forget_entry(path)
             return False
         except Exception as e:
             logger.error(f"Error removing app from autostart: {e}")
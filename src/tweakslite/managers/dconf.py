@@ -6,147 +6,524 @@ logger = logging.getLogger(__name__)
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gio  # noqa: E402
-import dbus  # noqa: E402
-from dbus.mainloop.glib import DBusGMainLoop  # noqa: E402
-import json  # noqa: E402
-from ..utils import is_flatpak, run_command  # noqa: E402
+from gi.repository import Gio, GLib  # noqa: E402
+import shlex  # noqa: E402
+from collections import deque  # noqa: E402
+from contextlib import contextmanager  # noqa: E402
+from ..environment import get_runtime_environment  # noqa: E402
+from ..bus import get_session_bus  # noqa: E402
+from ..utils import run_command, run_command_async  # noqa: E402
+from .dconf_snapshot import DConfSnapshot, DConfWatcher  # noqa: E402
+from .gvdb import DConfUserDatabase  # noqa: E402
+
+
+# dconf directories of the schemas managed by DConfSettings
+SCHEMA_PATHS = {
+    "interface": "/org/gnome/desktop/interface/",
+    "background": "/org/gnome/desktop/background/",
+    "input-sources": "/org/gnome/desktop/input-sources/",
+    "wm": "/org/gnome/desktop/wm/preferences/",
+    "sound": "/org/gnome/desktop/sound/",
+    "mutter": "/org/gnome/mutter/",
+}
+SCHEMA_DIRECTORIES = {path: schema for schema, path in SCHEMA_PATHS.items()}
+
+# GSettings schema ids of the schemas managed by DConfSettings
+SCHEMA_IDS = {
+    "interface": "org.gnome.desktop.interface",
+    "background": "org.gnome.desktop.background",
+    "input-sources": "org.gnome.desktop.input-sources",
+    "wm": "org.gnome.desktop.wm.preferences",
+    "sound": "org.gnome.desktop.sound",
+    "mutter": "org.gnome.mutter",
+}
+
+# Marks the dconf writer as not connected to yet
+WRITER_NOT_CONNECTED = object()
+
+# Delay in milliseconds before queued host writes are sent, so that rapid
+# changes to the same key collapse into a single write
+WRITE_BEHIND_INTERVAL = 150
+
+
+class SchemaSettings(dict):
+    """Gio.Settings objects by schema, created on first use
+
+    Creating one loads its schema and connects it to dconf, so startup only
+    pays for the schemas the first view reads.
+    """
+
+    def __init__(self, on_created):
+        super().__init__()
+        self._on_created = on_created
+
+    def __missing__(self, schema):
+        settings = Gio.Settings.new(SCHEMA_IDS[schema])
+        self[schema] = settings
+        self._on_created(schema, settings)
+        return settings
 
 
 class DConfSettings:
     """Helper class to manage dconf settings"""
 
-    def __init__(self):
+    def __init__(self, environment=None):
         logger.debug("Initializing DConfSettings")
-        DBusGMainLoop(set_as_default=True)
-        self.settings = {
-            "interface": Gio.Settings.new("org.gnome.desktop.interface"),
-            "background": Gio.Settings.new("org.gnome.desktop.background"),
-            "input-sources": Gio.Settings.new("org.gnome.desktop.input-sources"),
-            "wm": Gio.Settings.new("org.gnome.desktop.wm.preferences"),
-            "sound": Gio.Settings.new("org.gnome.desktop.sound"),
-            "mutter": Gio.Settings.new("org.gnome.mutter"),
-        }
-        self.dconf = Gio.Settings.new("org.gnome.desktop.interface")
+        self.environment = environment or get_runtime_environment()
+        self.settings = SchemaSettings(self._on_settings_created)
+
+        # Read caches keyed by (schema, key). Current values are dropped when
+        # the settings object emits "changed"; defaults and ranges are fixed
+        # by the installed schemas and are kept for the whole session.
+        self._value_cache = {}
+        self._default_cache = {}
+        self._range_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # In Flatpak the sandboxed GSettings may not see host values, so
+        # reads are served from one `dconf dump` of the host database, which
+        # is loaded in the background
+        self.snapshot = (
+            DConfSnapshot(on_loaded=self._on_host_values_loaded)
+            if self.environment.is_flatpak
+            else None
+        )
+        # When the host database file is shared with the sandbox it is read
+        # directly and the host dump is only a fallback
+        self.user_db = DConfUserDatabase() if self.environment.is_flatpak else None
+
+        # A running `dconf watch` keeps the snapshot in sync with changes made
+        # outside the application once the snapshot has been loaded
+        self.watcher = None
+
+        # Callbacks interested in changes to single keys, keyed by
+        # (schema, key), notified for local and host changes alike
+        self._subscribers = {}
+        self._next_subscriber_id = 1
+
+        # Pending host writes keyed by full dconf path, only the last value
+        # for each key is kept. A value of None means the key is reset.
+        # They are sent on the next write-behind tick or when a batch ends.
+        self._batch_depth = 0
+        self._pending = {}
+        self._flush_source_id = None
+        self.coalesced_writes = 0
 
-        # Setup dbus connection to dconf if not in Flatpak
-        if not is_flatpak():
-            bus = dbus.SessionBus()
-            self.dconf_service = bus.get_object(
+        # Host commands run asynchronously, one at a time and in order
+        self._host_queue = deque()
+        self._host_busy = False
+
+        # The dconf writer is connected to on the first host write; None
+        # once it turned out to be unavailable
+        self.dconf_interface = WRITER_NOT_CONNECTED
+
+    def _get_dconf_interface(self):
+        """Gets the D-Bus interface of the dconf writer, or None
+
+        In Flatpak the writer is reachable through --talk-name=ca.desrt.dconf
+        and lets host writes skip spawning a process; the dconf CLI is used
+        only as a fallback.
+        """
+        if self.dconf_interface is not WRITER_NOT_CONNECTED:
+            return self.dconf_interface
+        import dbus
+
+        self.dconf_interface = None
+        try:
+            dconf_service = get_session_bus().get_object(
                 "ca.desrt.dconf", "/ca/desrt/dconf/Writer/user"
             )
             self.dconf_interface = dbus.Interface(
-                self.dconf_service, dbus_interface="ca.desrt.dconf.Writer"
+                dconf_service, dbus_interface="ca.desrt.dconf.Writer"
             )
+        except dbus.exceptions.DBusException as e:
+            logger.warning(f"dconf writer unavailable, using dconf CLI: {e}")
+        return self.dconf_interface
 
     def _get_full_key(self, schema, key):
         """Get the full dconf key path"""
-        schema_map = {
-            "interface": "/org/gnome/desktop/interface/",
-            "background": "/org/gnome/desktop/background/",
-            "input-sources": "/org/gnome/desktop/input-sources/",
-            "wm": "/org/gnome/desktop/wm/preferences/",
-            "sound": "/org/gnome/desktop/sound/",
-            "mutter": "/org/gnome/mutter/",
-        }
-        full_key = f"{schema_map[schema]}{key}"
+        full_key = f"{SCHEMA_PATHS[schema]}{key}"
         logger.debug(f"Getting full key path: {full_key}")
         return full_key
 
+    def _split_full_key(self, full_key):
+        """Get the (schema, key) pair for a full dconf key path, if managed"""
+        directory, key = full_key.rsplit("/", 1)
+        schema = SCHEMA_DIRECTORIES.get(f"{directory}/")
+        if schema is None:
+            return None
+        return schema, key
+
     def _set_value_flatpak(self, schema, key, value, value_type):
-        """Set a value using dconf command in Flatpak environment"""
+        """Set a value on the host dconf database in Flatpak environment"""
         full_key = self._get_full_key(schema, key)
+        type_map = {"string": "s", "boolean": "b", "double": "d", "strv": "as"}
+        variant = GLib.Variant(type_map[value_type], value)
+
+        self._queue_change(full_key, variant)
+
+    def _queue_change(self, full_key, variant):
+        """Queues a host change, replacing any pending change to the same key"""
+        self.snapshot.update(full_key, variant)
+        if full_key in self._pending:
+            self.coalesced_writes += 1
+            logger.debug(
+                f"Coalesced write to {full_key} ({self.coalesced_writes} total)"
+            )
+        self._pending[full_key] = variant
+
+        if not self._batch_depth and self._flush_source_id is None:
+            self._flush_source_id = GLib.timeout_add(
+                WRITE_BEHIND_INTERVAL, self._on_flush_timeout
+            )
+
+    def _on_flush_timeout(self):
+        """Sends pending host changes on the write-behind tick"""
+        self._flush_source_id = None
+        if not self._batch_depth:
+            self._flush_pending()
+        return GLib.SOURCE_REMOVE
+
+    def _flush_pending(self):
+        """Sends all pending host changes as one changeset"""
+        if self._flush_source_id is not None:
+            GLib.source_remove(self._flush_source_id)
+            self._flush_source_id = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        logger.debug(f"Writing {len(pending)} pending dconf changes")
+        self._write_changes(pending)
+
+    def _write_changes(self, changes):
+        """Writes a changeset of full keys to GVariants, None resetting a key"""
+        dconf_interface = self._get_dconf_interface()
+        if dconf_interface is None:
+            self._run_host_command(self._changes_to_script(changes))
+            return
+        import dbus
+
+        # The writer takes a serialized a{smv} changeset as a byte array
+        changeset = GLib.Variant("a{smv}", changes)
+        blob = dbus.ByteArray(changeset.get_data_as_bytes().get_data())
 
-        if value_type == "string":
-            value = f"'{value}'"  # Wrap strings in quotes
-        elif value_type == "boolean":
-            value = str(value).lower()
-        elif value_type == "double":
-            value = str(value)
-        elif value_type == "strv":
-            value = json.dumps(value)  # Convert list to JSON string
+        def on_error(error):
+            logger.warning(f"dconf writer failed, using dconf CLI: {error}")
+            self.dconf_interface = None
+            self._run_host_command(self._changes_to_script(changes))
 
-        cmd = f"dconf write {full_key} {value}"
-        return run_command(cmd, shell=True)
+        logger.debug(f"Sending dconf changeset with {len(changes)} changes")
+        dconf_interface.Change(
+            blob,
+            reply_handler=lambda tag: None,
+            error_handler=on_error,
+        )
+
+    def _changes_to_script(self, changes):
+        """Builds a dconf CLI script applying a changeset"""
+        # Group written values by directory for the dconf load keyfile
+        groups = {}
+        resets = []
+        for full_key, variant in changes.items():
+            if variant is None:
+                resets.append(full_key)
+                continue
+            directory, key = full_key.rsplit("/", 1)
+            groups.setdefault(directory.strip("/"), []).append(
+                f"{key}={variant.print_(True)}"
+            )
+
+        commands = []
+        if groups:
+            keyfile = "\n\n".join(
+                f"[{directory}]\n" + "\n".join(lines)
+                for directory, lines in groups.items()
+            )
+            commands.append(f"dconf load / <<'EOF'\n{keyfile}\nEOF")
+        commands.extend(f"dconf reset {shlex.quote(key)}" for key in resets)
+        return "\n".join(commands)
+
+    def _run_host_command(self, cmd):
+        """Queues a host command to run without blocking the main loop"""
+        self._host_queue.append(cmd)
+        if not self._host_busy:
+            self._run_next_host_command()
+
+    def _run_next_host_command(self, *args):
+        """Starts the next queued host command once the previous one finished"""
+        if not self._host_queue:
+            self._host_busy = False
+            return
+        self._host_busy = True
+        cmd = self._host_queue.popleft()
+        run_command_async(cmd, self._run_next_host_command, shell=True)
+
+    def flush(self):
+        """Synchronously sends writes that have not reached the host yet"""
+        self._flush_pending()
+        if self.dconf_interface not in (None, WRITER_NOT_CONNECTED):
+            get_session_bus().flush()
+        while self._host_queue:
+            run_command(self._host_queue.popleft(), shell=True)
+
+    def begin_batch(self):
+        """Starts collecting host writes and resets into a single batch"""
+        self._batch_depth += 1
+
+    def commit_batch(self):
+        """Applies all pending host writes and resets as one changeset"""
+        if self._batch_depth == 0:
+            return
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._flush_pending()
+
+    @contextmanager
+    def batch(self):
+        """Context manager grouping writes and resets into one changeset"""
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.commit_batch()
+
+    def _on_settings_created(self, schema, settings):
+        """Watches a settings object for changes once it is created"""
+        logger.debug(f"Loading settings schema {SCHEMA_IDS[schema]}")
+        settings.connect("changed", self._on_settings_changed, schema)
+
+    def _on_settings_changed(self, settings, key, schema):
+        """Drops the cached value of a key when GSettings reports a change"""
+        self._value_cache.pop((schema, key), None)
+        self._notify(schema, key)
+
+    def connect_changed(self, schema, key, callback):
+        """Calls callback(schema, key) whenever the key changes.
+
+        Returns an id that can be passed to disconnect_changed.
+        """
+        # Changes are only reported by a settings object that exists
+        self.settings[schema]
+        handler_id = self._next_subscriber_id
+        self._next_subscriber_id += 1
+        self._subscribers.setdefault((schema, key), {})[handler_id] = callback
+        return handler_id
+
+    def disconnect_changed(self, handler_id):
+        """Removes a callback added with connect_changed"""
+        for callbacks in self._subscribers.values():
+            if callbacks.pop(handler_id, None) is not None:
+                return
+
+    def _notify(self, schema, key):
+        """Calls the callbacks subscribed to a key"""
+        for callback in list(self._subscribers.get((schema, key), {}).values()):
+            try:
+                callback(schema, key)
+            except Exception as e:
+                logger.error(f"Error notifying change of {schema} {key}: {e}")
+
+    def _start_watcher(self):
+        """Starts streaming host changes into the snapshot"""
+        self.watcher = DConfWatcher(self.snapshot.base_path, self._on_host_changed)
+        if not self.watcher.start():
+            logger.warning("Host changes will not be picked up while running")
+
+    def _on_host_changed(self, full_key, text):
+        """Applies a change reported by `dconf watch` to the snapshot"""
+        if full_key.endswith("/"):
+            # A whole directory changed, reload just that directory
+            self.refresh_host_values(full_key)
+            return
+        # Writes the application still has queued supersede the host value
+        if full_key in self._pending:
+            return
+        self.snapshot.set_text(full_key, text)
+        managed = self._split_full_key(full_key)
+        if managed is not None:
+            self._value_cache.pop(managed, None)
+            self._notify(*managed)
+
+    def close(self):
+        """Sends pending writes and stops watching the host"""
+        self.flush()
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.user_db is not None:
+            self.user_db.close()
+
+    def _get_value(self, schema, key):
+        """Get the current value of a key, served from the read cache"""
+        cache_key = (schema, key)
+        value = self._value_cache.get(cache_key)
+        if value is not None:
+            self.cache_hits += 1
+            return value
+        self.cache_misses += 1
+        if self.snapshot is not None:
+            # Writes still waiting in the queue take precedence over the host
+            # dump, and keys missing from both are at their default value
+            default = self.get_default_value(schema, key)
+            full_key = self._get_full_key(schema, key)
+            if full_key in self._pending:
+                value = self._pending[full_key]
+            else:
+                if self.watcher is None:
+                    self._start_watcher()
+                value = self._lookup_host_value(full_key, default.get_type_string())
+            if value is None:
+                value = default
+        else:
+            value = self.settings[schema].get_value(key)
+        self._value_cache[cache_key] = value
+        return value
+
+    def _lookup_host_value(self, full_key, type_string):
+        """Reads a host value from the user database file or the host dump"""
+        if not self.user_db.refresh():
+            if not self.environment.has_host_dconf:
+                return None
+            return self.snapshot.lookup(full_key, type_string)
+        value = self.user_db.lookup(full_key)
+        if value is not None and value.get_type_string() != type_string:
+            logger.warning(
+                f"Ignoring {full_key} stored with type {value.get_type_string()}"
+            )
+            return None
+        return value
+
+    def refresh_host_values(self, path="/org/gnome/"):
+        """Reloads host values below a dconf path in Flatpak environment"""
+        if self.snapshot is None:
+            return
+        # The database file is reopened on the next read once it changed
+        if self.snapshot.is_loaded() or not self.user_db.refresh():
+            # Subscribers are notified once the dump has arrived
+            self.snapshot.refresh(path)
+            return
+        self._on_host_values_loaded(path)
+
+    def _on_host_values_loaded(self, path):
+        """Drops cached values below path and notifies their subscribers"""
+        for schema, key in list(self._value_cache):
+            if self._get_full_key(schema, key).startswith(path):
+                del self._value_cache[(schema, key)]
+        for schema, key in list(self._subscribers):
+            if self._get_full_key(schema, key).startswith(path):
+                self._notify(schema, key)
+
+    def _invalidate(self, schema, key):
+        """Drops the cached value of a key after writing it"""
+        self._value_cache.pop((schema, key), None)
+
+    def get_cache_stats(self):
+        """Get read cache hit and miss counters"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "cached_values": len(self._value_cache),
+            "cached_defaults": len(self._default_cache),
+            "cached_ranges": len(self._range_cache),
+        }
+
+    def get_value(self, schema, key):
+        """Get the current value of a key as a GLib.Variant"""
+        return self._get_value(schema, key)
 
     def get_string(self, schema, key):
         """Get a string value from dconf"""
-        return self.settings[schema].get_string(key)
+        return self._get_value(schema, key).get_string()
 
     def set_string(self, schema, key, value):
         """Set a string value in dconf"""
         logger.debug(
             f"Setting string value - schema: {schema}, key: {key}, value: {value}"
         )
-        if is_flatpak():
+        if self.environment.is_flatpak:
             self._set_value_flatpak(schema, key, value, "string")
         self.settings[schema].set_string(key, value)
+        self._invalidate(schema, key)
 
     def get_boolean(self, schema, key):
         """Get a boolean value from dconf"""
-        return self.settings[schema].get_boolean(key)
+        return self._get_value(schema, key).get_boolean()
 
     def set_boolean(self, schema, key, value):
         """Set a boolean value in dconf"""
-        if is_flatpak():
+        if self.environment.is_flatpak:
             self._set_value_flatpak(schema, key, value, "boolean")
         self.settings[schema].set_boolean(key, value)
+        self._invalidate(schema, key)
+
+    def get_strv(self, schema, key):
+        """Get a string list value from dconf"""
+        return self._get_value(schema, key).get_strv()
 
     def reset(self, schema, key):
         """Resets a dconf key to its default value"""
         logger.info(f"Resetting dconf key - schema: {schema}, key: {key}")
         try:
-            if is_flatpak():
+            if self.environment.is_flatpak:
                 full_key = self._get_full_key(schema, key)
-                run_command(f"dconf reset {full_key}", shell=True)
+                self._queue_change(full_key, None)
             self.settings[schema].reset(key)
+            self._invalidate(schema, key)
         except Exception as e:
             logger.error(f"Error resetting {schema} {key}: {e}", exc_info=True)
 
     def get_default_string(self, schema, key):
         """Get the default string value for a key"""
-        value = self.settings[schema].get_default_value(key)
+        value = self.get_default_value(schema, key)
         if value:
             return value.get_string()
         return None
 
     def get_double(self, schema, key):
         """Get a double value from dconf"""
-        return self.settings[schema].get_double(key)
+        return self._get_value(schema, key).get_double()
 
     def get_default_double(self, schema, key):
         """Get the default double value for a key"""
-        value = self.settings[schema].get_default_value(key)
+        value = self.get_default_value(schema, key)
         if value:
             return value.get_double()
         return None
 
     def set_double(self, schema, key, value):
         """Set a double value in dconf"""
-        if is_flatpak():
+        if self.environment.is_flatpak:
             self._set_value_flatpak(schema, key, value, "double")
         self.settings[schema].set_double(key, value)
+        self._invalidate(schema, key)
 
     def get_default_boolean(self, schema, key):
         """Get the default boolean value for a key"""
-        value = self.settings[schema].get_default_value(key)
+        value = self.get_default_value(schema, key)
         if value:
             return value.get_boolean()
         return None
 
     def is_value_default(self, schema, key):
         """Check if the current value is the default value"""
-        current = self.settings[schema].get_value(key)
-        default = self.settings[schema].get_default_value(key)
+        current = self._get_value(schema, key)
+        default = self.get_default_value(schema, key)
         if current and default:
             return current.equal(default)
         return False
 
+    def get_range(self, schema, key):
+        """Get the range of a key, cached since schemas do not change"""
+        cache_key = (schema, key)
+        if cache_key not in self._range_cache:
+            self._range_cache[cache_key] = self.settings[schema].get_range(key)
+        return self._range_cache[cache_key]
+
     def get_available_values(self, schema, key):
         """Get list of available values for an enum key"""
-        range_type = self.settings[schema].get_range(key)[0]
-        if range_type == "enum":
-            return self.settings[schema].get_range(key)[1]
+        range_value = self.get_range(schema, key)
+        if range_value[0] == "enum":
+            return range_value[1]
         return None
 
     def mark_default_in_list(self, values, default_value):
@@ -155,22 +532,29 @@ class DConfSettings:
 
     def setting_add_to_list(self, schema, key, value):
         """Add a value to a list setting"""
-        values = self.settings[schema].get_strv(key)
+        values = self.get_strv(schema, key)
         if value not in values:
             values.append(value)
-            if is_flatpak():
+            if self.environment.is_flatpak:
                 self._set_value_flatpak(schema, key, values, "strv")
             self.settings[schema].set_strv(key, values)
+            self._invalidate(schema, key)
 
     def setting_remove_from_list(self, schema, key, value):
         """Remove a value from a list setting"""
-        values = self.settings[schema].get_strv(key)
+        values = self.get_strv(schema, key)
         if value in values:
             values.remove(value)
-            if is_flatpak():
+            if self.environment.is_flatpak:
                 self._set_value_flatpak(schema, key, values, "strv")
             self.settings[schema].set_strv(key, values)
+            self._invalidate(schema, key)
 
     def get_default_value(self, schema, key):
-        """Get the default value for a key"""
-        return self.settings[schema].get_default_value(key)
+        """Get the default value for a key, cached since defaults are fixed"""
+        cache_key = (schema, key)
+        if cache_key not in self._default_cache:
+            self._default_cache[cache_key] = self.settings[schema].get_default_value(
+                key
+            )
+        return self._default_cache[cache_key]
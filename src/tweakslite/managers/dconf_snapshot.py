@@ -0,0 +1,221 @@
+import logging
+from gi.repository import Gio, GLib
+from ..utils import run_command_async
+
+# Get logger for this module
+logger = logging.getLogger(__name__)
+
+
+def parse_dconf_dump(text, base_path):
+    """Parses `dconf dump` output into a tree of directory -> key -> text
+
+    Directories are absolute dconf paths ending with a slash and values are
+    kept in GVariant text format until they are first read.
+    """
+    base_path = base_path.rstrip("/") + "/"
+    tree = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            group = line[1:-1].strip("/")
+            directory = f"{base_path}{group}/" if group else base_path
+            current = tree.setdefault(directory, {})
+            continue
+        if current is None or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        current[key.strip()] = value.strip()
+    return tree
+
+
+class DConfSnapshot:
+    """In-memory copy of the host dconf database loaded with `dconf dump`
+
+    Dumps run asynchronously so the main loop never waits for the host.
+    Until the first one has arrived, lookups find no user values and the
+    defaults are used. on_loaded(path) is called on the main loop whenever
+    the values below path have been loaded or reloaded.
+    """
+
+    def __init__(self, base_path="/org/gnome/", on_loaded=None):
+        self.base_path = base_path
+        self.on_loaded = on_loaded
+        self.tree = None
+        self._variants = {}
+        self._loading = False
+
+    def is_loaded(self):
+        """Checks whether the snapshot has been loaded from the host"""
+        return self.tree is not None
+
+    def load(self):
+        """Starts loading the whole snapshot with a single host call"""
+        if self._loading:
+            return
+        self._loading = True
+        self._dump(self.base_path)
+
+    def refresh(self, path):
+        """Starts reloading only the directory tree below path"""
+        if not self.is_loaded():
+            self.load()
+            return
+        self._dump(path.rstrip("/") + "/")
+
+    def _dump(self, path):
+        """Runs `dconf dump` on the host without waiting for it"""
+        run_command_async(
+            ["dconf", "dump", path], lambda output: self._on_dumped(path, output)
+        )
+
+    def _on_dumped(self, path, output):
+        """Replaces the directories below path with a finished dump"""
+        if output is None:
+            logger.warning(f"Could not dump dconf path {path}")
+            output = ""
+        tree = parse_dconf_dump(output, path)
+        if path == self.base_path or not self.is_loaded():
+            self.tree = tree
+            self._variants = {}
+            self._loading = False
+            logger.debug(f"Loaded dconf snapshot with {len(self.tree)} directories")
+        else:
+            for directory in [d for d in self.tree if d.startswith(path)]:
+                del self.tree[directory]
+            self._variants = {
+                key: value
+                for key, value in self._variants.items()
+                if not key.startswith(path)
+            }
+            self.tree.update(tree)
+            logger.debug(f"Refreshed dconf snapshot below {path}")
+        if self.on_loaded is not None:
+            self.on_loaded(path)
+
+    def lookup(self, full_key, type_string):
+        """Gets the user value of a key as a GVariant, or None if it is unset
+
+        Returns None as well while the snapshot is still loading.
+        """
+        if not self.is_loaded():
+            self.load()
+            if not self.is_loaded():
+                return None
+        variant = self._variants.get(full_key)
+        if variant is not None:
+            return variant
+
+        directory, key = full_key.rsplit("/", 1)
+        text = self.tree.get(f"{directory}/", {}).get(key)
+        if text is None:
+            return None
+        try:
+            variant = GLib.Variant.parse(GLib.VariantType(type_string), text)
+        except GLib.Error as e:
+            logger.warning(f"Could not parse dconf value of {full_key}: {e}")
+            return None
+        self._variants[full_key] = variant
+        return variant
+
+    def set_text(self, full_key, text):
+        """Records a value reported by the host in GVariant text format"""
+        if not self.is_loaded():
+            return
+        directory, key = full_key.rsplit("/", 1)
+        values = self.tree.setdefault(f"{directory}/", {})
+        self._variants.pop(full_key, None)
+        if text is None:
+            values.pop(key, None)
+        else:
+            values[key] = text
+
+    def update(self, full_key, variant):
+        """Records a value written by the application, None resetting it"""
+        if not self.is_loaded():
+            return
+        directory, key = full_key.rsplit("/", 1)
+        values = self.tree.setdefault(f"{directory}/", {})
+        self._variants.pop(full_key, None)
+        if variant is None:
+            values.pop(key, None)
+        else:
+            values[key] = variant.print_(True)
+            self._variants[full_key] = variant
+
+
+class DConfWatcher:
+    """Streams host changes below a dconf path from a running `dconf watch`
+
+    callback is invoked with the full key and its new value in GVariant text
+    format, or None when the key was reset. Changes to a whole directory are
+    reported with a path ending in a slash and no value.
+    """
+
+    def __init__(self, path, callback, spawn_prefix=("flatpak-spawn", "--host")):
+        self.path = path
+        self.callback = callback
+        self.spawn_prefix = list(spawn_prefix)
+        self.process = None
+        self.stream = None
+        self.cancellable = None
+        self._current = None
+
+    def start(self):
+        """Starts the long-running `dconf watch` process"""
+        argv = self.spawn_prefix + ["dconf", "watch", self.path]
+        try:
+            self.process = Gio.Subprocess.new(argv, Gio.SubprocessFlags.STDOUT_PIPE)
+        except GLib.Error as e:
+            logger.warning(f"Could not watch dconf path {self.path}: {e.message}")
+            return False
+        self.stream = Gio.DataInputStream.new(self.process.get_stdout_pipe())
+        self.cancellable = Gio.Cancellable()
+        self._read_next()
+        logger.debug(f"Watching dconf path {self.path}")
+        return True
+
+    def stop(self):
+        """Stops the watch process"""
+        if self.process is None:
+            return
+        self.cancellable.cancel()
+        self.process.force_exit()
+        self.process = None
+
+    def _read_next(self):
+        """Waits for the next line of output"""
+        self.stream.read_line_async(
+            GLib.PRIORITY_DEFAULT, self.cancellable, self._on_line_read
+        )
+
+    def _on_line_read(self, stream, result):
+        """Handles one line of output and waits for the next"""
+        try:
+            line, _ = stream.read_line_finish_utf8(result)
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logger.warning(f"Error reading dconf watch output: {e.message}")
+            return
+        if line is None:
+            logger.warning("dconf watch exited")
+            self.process = None
+            return
+        self.handle_line(line)
+        self._read_next()
+
+    def handle_line(self, line):
+        """Parses one line of `dconf watch` output"""
+        if line.startswith("  ") and self._current is not None:
+            # Indented value following a changed key
+            text = line.strip()
+            self.callback(self._current, None if text in ("", "unset") else text)
+            self._current = None
+            return
+
+        # A path without a value line is a directory change
+        if self._current is not None:
+            self.callback(self._current, None)
+        self._current = line.strip() if line.startswith("/") else None
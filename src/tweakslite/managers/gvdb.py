@@ -0,0 +1,230 @@
+import logging
+import mmap
+import os
+import struct
+import sys
+from gi.repository import GLib
+
+# Get logger for this module
+logger = logging.getLogger(__name__)
+
+# Signature of a GVDB file written in little and big endian byte order
+GVDB_SIGNATURE_LE = b"GVariant"
+GVDB_SIGNATURE_BE = b"raVGtnai"
+
+# Header: signature, version, options and the pointer to the root table
+HEADER_FORMAT = "8sIIII"
+# Hash item: hash, parent, key start, key size, type, unused, value pointer
+ITEM_FORMAT = "IIIHccII"
+ITEM_SIZE = struct.calcsize("<" + ITEM_FORMAT)
+
+NO_PARENT = 0xFFFFFFFF
+
+
+class GvdbError(Exception):
+    """Raised when a file is not a valid GVDB database"""
+
+
+def gvdb_hash(key):
+    """Hashes a key the way GVDB does (djb2 over signed chars)"""
+    value = 5381
+    for byte in key:
+        if byte >= 128:
+            byte -= 256
+        value = (value * 33 + byte) & 0xFFFFFFFF
+    return value
+
+
+class GvdbTable:
+    """Read-only GVDB hash table decoded in place from a memory mapping
+
+    Only the header, bloom filter and bucket offsets are read up front; keys
+    are compared and values decoded directly from the mapping on lookup.
+    """
+
+    def __init__(self, data, start=None, end=None, byteorder=None):
+        self.data = data
+        if byteorder is None:
+            byteorder, start, end = self._read_header(data)
+        self.byteorder = byteorder
+        self._swapped = (byteorder == "<") != (sys.byteorder == "little")
+        self._item = struct.Struct(byteorder + ITEM_FORMAT)
+
+        if start + 8 > end or end > len(data):
+            raise GvdbError("Hash table outside of file")
+        bloom_header, self.n_buckets = struct.unpack_from(byteorder + "II", data, start)
+        self.bloom_shift = bloom_header >> 27
+        n_bloom_words = bloom_header & ((1 << 27) - 1)
+
+        offset = start + 8
+        self.bloom_words = struct.unpack_from(
+            f"{byteorder}{n_bloom_words}I", data, offset
+        )
+        offset += 4 * n_bloom_words
+        self.buckets = struct.unpack_from(f"{byteorder}{self.n_buckets}I", data, offset)
+        self._items_offset = offset + 4 * self.n_buckets
+        if self._items_offset > end:
+            raise GvdbError("Hash table buckets outside of table")
+        self.n_items = (end - self._items_offset) // ITEM_SIZE
+
+    @classmethod
+    def open(cls, path):
+        """Memory-maps a GVDB file and returns its root table"""
+        with open(path, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # Zero-length files cannot be mapped
+                raise GvdbError(f"Could not map {path}: {e}") from e
+        return cls(data)
+
+    def close(self):
+        """Releases the memory mapping"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    @staticmethod
+    def _read_header(data):
+        """Reads the file header and returns the byte order and root pointer"""
+        if len(data) < struct.calcsize("<" + HEADER_FORMAT):
+            raise GvdbError("File too short")
+        signature = bytes(data[:8])
+        if signature == GVDB_SIGNATURE_LE:
+            byteorder = "<"
+        elif signature == GVDB_SIGNATURE_BE:
+            byteorder = ">"
+        else:
+            raise GvdbError("Invalid GVDB signature")
+        _, version, _, start, end = struct.unpack_from(
+            byteorder + HEADER_FORMAT, data, 0
+        )
+        if version != 0:
+            raise GvdbError(f"Unsupported GVDB version {version}")
+        return byteorder, start, end
+
+    def _get_item(self, index):
+        """Unpacks one hash item"""
+        return self._item.unpack_from(self.data, self._items_offset + index * ITEM_SIZE)
+
+    def _bloom_filter(self, hash_value):
+        """Checks the bloom filter, False meaning the key is surely absent"""
+        if not self.bloom_words:
+            return True
+        word = self.bloom_words[(hash_value // 32) % len(self.bloom_words)]
+        mask = 1 << (hash_value & 31)
+        mask |= 1 << ((hash_value >> self.bloom_shift) & 31)
+        return word & mask == mask
+
+    def _check_name(self, item, key):
+        """Compares a key against an item and the chain of its parents"""
+        length = len(key)
+        while True:
+            _, parent, key_start, key_size = item[:4]
+            if key_size > length:
+                return False
+            length -= key_size
+            if (
+                self.data[key_start : key_start + key_size]
+                != key[length : length + key_size]
+            ):
+                return False
+            if length == 0 and parent == NO_PARENT:
+                return True
+            if parent >= self.n_items or key_size == 0:
+                return False
+            item = self._get_item(parent)
+
+    def _find(self, key):
+        """Finds the hash item of a key"""
+        if not self.n_buckets or not self.n_items:
+            return None
+        key = key.encode()
+        hash_value = gvdb_hash(key)
+        if not self._bloom_filter(hash_value):
+            return None
+
+        bucket = hash_value % self.n_buckets
+        first = self.buckets[bucket]
+        if bucket == self.n_buckets - 1:
+            last = self.n_items
+        else:
+            last = min(self.buckets[bucket + 1], self.n_items)
+        for index in range(first, last):
+            item = self._get_item(index)
+            if item[0] == hash_value and self._check_name(item, key):
+                return item
+        return None
+
+    def lookup(self, key):
+        """Gets the value stored under key as a GLib.Variant, or None"""
+        item = self._find(key)
+        if item is None or item[4] != b"v":
+            return None
+        start, end = item[6], item[7]
+        if start > end or end > len(self.data):
+            return None
+        # GVariant needs its own aligned buffer, so only the looked-up value
+        # is copied out of the mapping
+        variant = GLib.Variant.new_from_bytes(
+            GLib.VariantType("v"), GLib.Bytes.new(self.data[start:end]), False
+        )
+        if self._swapped:
+            variant = variant.byteswap()
+        return variant.get_variant()
+
+
+def get_user_database_path():
+    """Gets the path of the dconf user database following dconf's rules"""
+    config_dir = os.environ.get("DCONF_USER_CONFIG_DIR")
+    if config_dir:
+        config_dir = os.path.join(GLib.get_home_dir(), config_dir)
+    else:
+        config_dir = os.path.join(GLib.get_user_config_dir(), "dconf")
+    return os.path.join(config_dir, "user")
+
+
+class DConfUserDatabase:
+    """Reads values straight from the dconf user database file
+
+    The file is replaced atomically by dconf-service, so it is mapped again
+    whenever its inode, mtime or size changes.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_user_database_path()
+        self.table = None
+        self._stamp = None
+
+    def refresh(self):
+        """Reopens the database if it changed, returning whether it is usable"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            if self._stamp is not None:
+                logger.debug(f"dconf user database {self.path} disappeared")
+            self.close()
+            return False
+
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            self.close()
+            self._stamp = stamp
+            try:
+                self.table = GvdbTable.open(self.path)
+                logger.debug(f"Mapped dconf user database {self.path}")
+            except (OSError, GvdbError) as e:
+                logger.warning(f"Could not read dconf database {self.path}: {e}")
+        return self.table is not None
+
+    def lookup(self, full_key):
+        """Gets the user value of a key as a GVariant, or None if it is unset"""
+        if self.table is None:
+            return None
+        return self.table.lookup(full_key)
+
+    def close(self):
+        """Unmaps the database"""
+        if self.table is not None:
+            self.table.close()
+        self.table = None
+        self._stamp = None
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import logging
+from gi.repository import GLib, Gtk
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.prefetch")
+
+# Time an idle slice may spend building views before yielding, in seconds
+SLICE_BUDGET = 0.008
+
+# Time prefetching waits after the last user input, in milliseconds
+INPUT_PAUSE_MS = 500
+
+
+def get_default_history_path():
+    """Gets the location of the page visit history"""
+    return os.path.join(GLib.get_user_cache_dir(), "tweakslite", "visits.json")
+
+
+class VisitHistory:
+    """Counts how often each settings page was opened, across sessions"""
+
+    def __init__(self, path=None):
+        self.path = path or get_default_history_path()
+        self.counts = {}
+        self._dirty = False
+        try:
+            with open(self.path) as f:
+                counts = json.load(f)
+            if isinstance(counts, dict):
+                self.counts = {
+                    str(category): int(count) for category, count in counts.items()
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable visit history: {e}")
+
+    def record(self, category):
+        """Counts a visit of a page"""
+        self.counts[category] = self.counts.get(category, 0) + 1
+        self._dirty = True
+
+    def get_count(self, category):
+        return self.counts.get(category, 0)
+
+    def save(self):
+        """Writes the counts if they changed since they were loaded"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.counts, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save visit history: {e}")
+
+
+class ViewPrefetcher:
+    """Builds the views the user has not opened yet while the app is idle
+
+    Prefetching starts once the window has painted its first frame. Views
+    are built most-visited first, in low-priority idle slices that stop
+    starting new views once SLICE_BUDGET is spent, and user input pauses
+    prefetching until INPUT_PAUSE_MS have passed without any.
+    """
+
+    def __init__(self, categories, build_view, history, clock=time.monotonic):
+        """build_view(category) builds the view of a category if it is missing"""
+        order = {category: i for i, category in enumerate(categories)}
+        self.pending = sorted(
+            categories,
+            key=lambda category: (-history.get_count(category), order[category]),
+        )
+        self.build_view = build_view
+        self.clock = clock
+        self._idle_id = None
+        self._resume_id = None
+        self._paint_handler = None
+        self._stopped = False
+
+    def attach(self, window):
+        """Starts after the first frame of the window and pauses on input"""
+        for controller, signal in (
+            (Gtk.EventControllerKey(), "key-pressed"),
+            (Gtk.GestureClick(button=0), "pressed"),
+            (
+                Gtk.EventControllerScroll(
+                    flags=Gtk.EventControllerScrollFlags.BOTH_AXES
+                ),
+                "scroll",
+            ),
+        ):
+            controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+            controller.connect(signal, self._on_input)
+            window.add_controller(controller)
+
+        if window.get_mapped():
+            self._wait_for_paint(window)
+        else:
+            window.connect("map", self._wait_for_paint)
+
+    def _wait_for_paint(self, window):
+        frame_clock = window.get_frame_clock()
+        if frame_clock is None or self._paint_handler is not None:
+            return
+
+        def on_after_paint(frame_clock):
+            frame_clock.disconnect(self._paint_handler)
+            logger.debug("First frame painted, starting view prefetch")
+            self.start()
+
+        self._paint_handler = frame_clock.connect("after-paint", on_after_paint)
+
+    def _on_input(self, *args):
+        """Pauses prefetching while the user is interacting"""
+        self.pause()
+        # Let key and scroll events reach the widgets
+        return False
+
+    def start(self):
+        """Schedules the next idle slice"""
+        if self._stopped or self._idle_id is not None or self._resume_id is not None:
+            return
+        if self.pending:
+            self._idle_id = GLib.idle_add(self._run_slice, priority=GLib.PRIORITY_LOW)
+
+    def pause(self):
+        """Stops prefetching until there has been no input for a while"""
+        if self._stopped or not self.pending:
+            return
+        if self._idle_id is not None:
+            GLib.source_remove(self._idle_id)
+            self._idle_id = None
+        if self._resume_id is not None:
+            GLib.source_remove(self._resume_id)
+        self._resume_id = GLib.timeout_add(INPUT_PAUSE_MS, self._on_resume)
+
+    def _on_resume(self):
+        self._resume_id = None
+        self.start()
+        return GLib.SOURCE_REMOVE
+
+    def stop(self):
+        """Cancels any scheduled prefetching"""
+        self._stopped = True
+        for source_id in (self._idle_id, self._resume_id):
+            if source_id is not None:
+                GLib.source_remove(source_id)
+        self._idle_id = self._resume_id = None
+
+    def _run_slice(self):
+        """Builds views until the slice budget is spent"""
+        start = self.clock()
+        while self.pending:
+            category = self.pending.pop(0)
+            try:
+                self.build_view(category)
+            except Exception as e:
+                logger.warning(f"Could not prefetch {category}: {e}")
+            if self.clock() - start >= SLICE_BUDGET:
+                break
+        logger.debug(
+            f"Prefetch slice took {(self.clock() - start) * 1000:.1f} ms, "
+            f"{len(self.pending)} views left"
+        )
+        if self.pending:
+            return GLib.SOURCE_CONTINUE
+        self._idle_id = None
+        return GLib.SOURCE_REMOVE
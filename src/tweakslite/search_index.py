@@ -0,0 +1,168 @@
+import re
+import logging
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.search_index")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Score multipliers for the ways a query token can match an indexed word
+EXACT_MATCH = 3.0
+PREFIX_MATCH = 2.0
+FUZZY_MATCH = 1.0
+
+# Minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+# Query tokens shorter than this only match by prefix
+MIN_FUZZY_LENGTH = 3
+
+# Results of recent queries are kept so that retyping or deleting is free
+MAX_CACHED_QUERIES = 64
+
+
+def tokenize(text):
+    """Splits text into casefolded words"""
+    return TOKEN_PATTERN.findall(text.casefold()) if text else []
+
+
+def trigrams(word):
+    """Gets the trigrams of a word, padded so short words still have some"""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    """Node of the prefix trie
+
+    postings maps every key with a word below this node to the best field
+    weight of such a word, so a prefix lookup is a walk down the trie.
+    """
+
+    __slots__ = ("children", "postings")
+
+    def __init__(self):
+        self.children = {}
+        self.postings = {}
+
+
+class SearchIndex:
+    """In-memory type-ahead search index
+
+    Keys are added with weighted text fields. Every word is stored in a prefix
+    trie for as-you-type matching and in a trigram table that catches typos.
+    A query matches a key when each of its words matches one of the key's
+    words, and results are ranked by the summed, weighted match quality.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.words = {}  # word -> {key: best weight}
+        self.trigrams = {}  # trigram -> set of words
+        self.trigram_counts = {}  # word -> number of trigrams
+        self.order = {}  # key -> insertion position, breaks ranking ties
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.order)
+
+    def add(self, key, fields):
+        """Indexes a key under (text, weight) fields"""
+        self.order.setdefault(key, len(self.order))
+        self._cache.clear()
+        for text, weight in fields:
+            for word in tokenize(text):
+                self._add_word(key, word, weight)
+
+    def _add_word(self, key, word, weight):
+        postings = self.words.get(word)
+        if postings is None:
+            postings = self.words[word] = {}
+            word_trigrams = trigrams(word)
+            self.trigram_counts[word] = len(word_trigrams)
+            for trigram in word_trigrams:
+                self.trigrams.setdefault(trigram, set()).add(word)
+        if postings.get(key, 0) >= weight:
+            return
+        postings[key] = weight
+
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            if node.postings.get(key, 0) < weight:
+                node.postings[key] = weight
+
+    def _match_token(self, token):
+        """Scores the keys matching one query word"""
+        scores = {}
+
+        node = self.root
+        for char in token:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            for key, weight in node.postings.items():
+                scores[key] = weight * PREFIX_MATCH
+            for key, weight in self.words.get(token, {}).items():
+                if scores[key] < weight * EXACT_MATCH:
+                    scores[key] = weight * EXACT_MATCH
+
+        if len(token) >= MIN_FUZZY_LENGTH:
+            query_trigrams = trigrams(token)
+            hits = {}
+            for trigram in query_trigrams:
+                for word in self.trigrams.get(trigram, ()):
+                    hits[word] = hits.get(word, 0) + 1
+            for word, count in hits.items():
+                # Jaccard similarity of the two trigram sets
+                similarity = count / (
+                    len(query_trigrams) + self.trigram_counts[word] - count
+                )
+                if similarity < FUZZY_THRESHOLD:
+                    continue
+                for key, weight in self.words[word].items():
+                    score = weight * FUZZY_MATCH * similarity
+                    if scores.get(key, 0) < score:
+                        scores[key] = score
+        return scores
+
+    def search(self, query):
+        """Gets the keys matching a query mapped to their scores
+
+        An empty query matches nothing; callers show everything instead.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+        cache_key = " ".join(tokens)
+        results = self._cache.get(cache_key)
+        if results is not None:
+            return results
+
+        results = None
+        for token in tokens:
+            scores = self._match_token(token)
+            if results is None:
+                results = scores
+            else:
+                results = {
+                    key: score + scores[key]
+                    for key, score in results.items()
+                    if key in scores
+                }
+            if not results:
+                break
+        if len(self._cache) >= MAX_CACHED_QUERIES:
+            self._cache.clear()
+        self._cache[cache_key] = results
+        return results
+
+    def rank(self, query):
+        """Gets the keys matching a query, best match first"""
+        results = self.search(query)
+        order = self.order
+        return sorted(results, key=lambda key: (-results[key], order[key]))
@@ -0,0 +1,133 @@
+import logging
+from .managers.dconf import SCHEMA_PATHS
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.settings_registry")
+
+
+class Setting:
+    """Description of one settings key managed by a view
+
+    type is the GVariant type string of the key. options maps the values of
+    a key with a fixed set of choices to the labels shown for them. Settings
+    with reset set to False are left alone when their view is reset.
+    """
+
+    __slots__ = (
+        "view",
+        "section",
+        "schema",
+        "key",
+        "type",
+        "label",
+        "subtitle",
+        "options",
+        "reset",
+    )
+
+    def __init__(
+        self,
+        view,
+        section,
+        schema,
+        key,
+        type,
+        label,
+        subtitle=None,
+        options=None,
+        reset=True,
+    ):
+        self.view = view
+        self.section = section
+        self.schema = schema
+        self.key = key
+        self.type = type
+        self.label = label
+        self.subtitle = subtitle
+        self.options = dict(options) if options else {}
+        self.reset = reset
+
+    def __repr__(self):
+        return f"<Setting {self.schema} {self.key}>"
+
+    def get_option_labels(self):
+        """Lists the labels of the choices, in order"""
+        return list(self.options.values())
+
+    def get_option_values(self):
+        """Lists the values of the choices, in order"""
+        return list(self.options)
+
+
+class SettingsRegistry:
+    """Every settings key the views manage, in registration order
+
+    View modules register their keys when they are imported, so searching,
+    resetting and exporting settings only need the modules, not the widgets.
+    """
+
+    def __init__(self):
+        self._settings = {}
+
+    def register(self, view, section, schema, key, type, label, **kwargs):
+        """Adds a setting and returns it; registering a key again replaces it"""
+        setting = Setting(view, section, schema, key, type, label, **kwargs)
+        self._settings[(schema, key)] = setting
+        return setting
+
+    def get(self, schema, key):
+        return self._settings.get((schema, key))
+
+    def get_settings(self, view=None):
+        """Lists the settings of one view, or of all views"""
+        return [s for s in self._settings.values() if view is None or s.view == view]
+
+    def get_views(self):
+        """Lists the views that registered settings"""
+        return list(dict.fromkeys(s.view for s in self._settings.values()))
+
+    def get_search_text(self, view):
+        """Lists the sections, labels and option labels of a view's settings"""
+        texts = []
+        for setting in self.get_settings(view):
+            texts += [setting.section, setting.label, setting.subtitle]
+            texts += setting.get_option_labels()
+        return [text for text in dict.fromkeys(texts) if text]
+
+    def reset(self, dconf, view=None):
+        """Resets settings to their defaults as one changeset"""
+        with dconf.batch():
+            for setting in self.get_settings(view):
+                if setting.reset:
+                    dconf.reset(setting.schema, setting.key)
+
+    def diff_against_defaults(self, dconf, view=None):
+        """Lists (setting, value, default) for settings changed from default"""
+        changes = []
+        for setting in self.get_settings(view):
+            value = dconf.get_value(setting.schema, setting.key)
+            default = dconf.get_default_value(setting.schema, setting.key)
+            if value is not None and default is not None and not value.equal(default):
+                changes.append((setting, value, default))
+        return changes
+
+    def export_profile(self, dconf, view=None):
+        """Exports the changed settings in the keyfile format of `dconf dump`
+
+        The result can be applied with `dconf load /`.
+        """
+        groups = {}
+        for setting, value, _ in self.diff_against_defaults(dconf, view):
+            path = SCHEMA_PATHS[setting.schema].strip("/")
+            groups.setdefault(path, []).append(f"{setting.key}={value.print_(True)}")
+        return "".join(
+            f"[{path}]\n" + "\n".join(lines) + "\n\n" for path, lines in groups.items()
+        )
+
+
+registry = SettingsRegistry()
+
+
+def register(view, section, schema, key, type, label, **kwargs):
+    """Registers a setting in the shared registry"""
+    return registry.register(view, section, schema, key, type, label, **kwargs)
@@ -0,0 +1,90 @@
+import bisect
+import importlib
+import logging
+from .settings_registry import registry
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.settings_search")
+
+
+def get_view_module_name(category):
+    """Gets the name of the views module of a sidebar category"""
+    return category.lower().replace(" & ", "_and_").replace(" ", "_")
+
+
+def get_view_search_text(category):
+    """Gets the texts of a view's registered settings and its SEARCH_TEXT
+
+    Only the view module is imported, which registers its settings; the view
+    itself is never built.
+    """
+    try:
+        module = importlib.import_module(
+            f"tweakslite.views.{get_view_module_name(category)}"
+        )
+    except ImportError as e:
+        logger.error(f"Error loading search text of {category}: {e}")
+        return ()
+    return (
+        *registry.get_search_text(category),
+        *getattr(module, "SEARCH_TEXT", ()),
+    )
+
+
+class SettingsSearchIndex:
+    """Search index over the texts of every settings page
+
+    Built once from page metadata: the category name, its search terms, and
+    the row titles, subtitles and options each view module declares. A query
+    matches a category when it prefixes one of its words or occurs anywhere
+    in one of its texts, so searching never builds widgets or touches the
+    system.
+    """
+
+    def __init__(self, texts):
+        """texts maps each category to the strings it can be found by"""
+        self.categories = list(texts)
+        self._words = []  # Sorted (word, category) pairs for prefix lookups
+        self._texts = {}  # Category -> all its texts joined, for substrings
+        for category, strings in texts.items():
+            folded = [string.casefold() for string in strings if string]
+            self._texts[category] = "\n".join(folded)
+            for string in folded:
+                for word in string.split():
+                    self._words.append((word, category))
+        self._words.sort()
+        self._cache = {}
+
+    @classmethod
+    def for_categories(cls, categories, get_terms):
+        """Builds the index from view metadata and per-category terms"""
+        return cls(
+            {
+                category: [*get_terms(category), *get_view_search_text(category)]
+                for category in categories
+            }
+        )
+
+    def search(self, query):
+        """Gets the set of categories matching a query"""
+        query = query.casefold().strip()
+        matches = self._cache.get(query)
+        if matches is not None:
+            return matches
+
+        matches = set()
+        # Prefix lookup over the sorted words
+        position = bisect.bisect_left(self._words, (query,))
+        while position < len(self._words):
+            word, category = self._words[position]
+            if not word.startswith(query):
+                break
+            matches.add(category)
+            position += 1
+        # Substring lookup for the remaining categories
+        for category, text in self._texts.items():
+            if category not in matches and query in text:
+                matches.add(category)
+
+        self._cache[query] = matches
+        return matches
@@ -0,0 +1,183 @@
+import sys
+import json
+import time
+import logging
+from contextlib import contextmanager
+from gi.repository import Gdk
+
+# Get logger for this module
+logger = logging.getLogger("tweakslite.startup_profile")
+
+
+class Phase:
+    """A timed part of startup, with the phases timed inside it"""
+
+    __slots__ = ("name", "start", "end", "children")
+
+    def __init__(self, name, start, end=None):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.children = []
+
+    @property
+    def duration(self):
+        return (self.end or self.start) - self.start
+
+    def to_dict(self, origin):
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "children": [
+                child.to_dict(origin)
+                for child in sorted(self.children, key=lambda p: -p.duration)
+            ],
+        }
+
+
+class StartupProfiler:
+    """Times the phases of startup up to the first presented frame
+
+    Times are taken from the monotonic clock, which GDK frame timings use as
+    well, so the presentation time of the first frame can be compared with
+    the phases directly.
+    """
+
+    def __init__(self, start=None, json_path=None, clock=time.monotonic):
+        self.clock = clock
+        self.start = start if start is not None else clock()
+        self.json_path = json_path
+        self.phases = []
+        self.presented = None
+        self.finished = False
+        self._stack = []
+
+    def add(self, name, start, end):
+        """Records a phase timed by the caller"""
+        phase = Phase(name, start, end)
+        (self._stack[-1].children if self._stack else self.phases).append(phase)
+        return phase
+
+    @contextmanager
+    def phase(self, name):
+        """Times the phases run inside the block"""
+        phase = self.add(name, self.clock(), None)
+        self._stack.append(phase)
+        try:
+            yield phase
+        finally:
+            self._stack.pop()
+            phase.end = self.clock()
+
+    def watch_first_frame(self, window):
+        """Reports once the first frame of the window has been presented"""
+        present_start = self.clock()
+        handler_id = None
+        first_frame = None
+
+        def on_after_paint(frame_clock):
+            nonlocal first_frame
+            if first_frame is None:
+                first_frame = frame_clock.get_frame_counter()
+            # Timings are only complete once the compositor has reported back
+            timings = frame_clock.get_timings(first_frame)
+            if timings is None or not timings.get_complete():
+                frame_clock.request_phase(Gdk.FrameClockPhase.AFTER_PAINT)
+                return
+            frame_clock.disconnect(handler_id)
+            presentation_time = timings.get_presentation_time()
+            # Presentation time is in microseconds, or 0 if not known
+            if presentation_time:
+                self.presented = presentation_time / 1_000_000
+            else:
+                self.presented = self.clock()
+            self.add("first frame", present_start, self.presented)
+            self.finish()
+
+        def on_map(window):
+            nonlocal handler_id
+            frame_clock = window.get_frame_clock()
+            handler_id = frame_clock.connect("after-paint", on_after_paint)
+
+        if window.get_mapped():
+            on_map(window)
+        else:
+            window.connect("map", on_map)
+
+    @property
+    def total(self):
+        end = self.presented
+        if end is None:
+            end = max((phase.end or phase.start for phase in self.phases), default=0)
+        return max(end - self.start, 0)
+
+    def get_report(self):
+        """Gets the phases, longest first, as a JSON-serializable dict"""
+        phases = [
+            phase.to_dict(self.start)
+            for phase in sorted(self.phases, key=lambda p: -p.duration)
+        ]
+        accounted = sum(phase.duration for phase in self.phases)
+        return {
+            "total_ms": round(self.total * 1000, 3),
+            "unaccounted_ms": round(max(self.total - accounted, 0) * 1000, 3),
+            "phases": phases,
+        }
+
+    def format_report(self):
+        """Formats the report as a table of phase times"""
+        report = self.get_report()
+        total = report["total_ms"] or 1
+        lines = [f"Startup took {report['total_ms']:.1f} ms to the first frame"]
+
+        def add_lines(phases, depth):
+            for phase in phases:
+                lines.append(
+                    f"{phase['duration_ms']:9.1f} ms {phase['duration_ms'] / total:6.1%}"
+                    f"  {'  ' * depth}{phase['name']}"
+                )
+                add_lines(phase["children"], depth + 1)
+
+        add_lines(report["phases"], 0)
+        lines.append(
+            f"{report['unaccounted_ms']:9.1f} ms "
+            f"{report['unaccounted_ms'] / total:6.1%}  (other)"
+        )
+        return "\n".join(lines)
+
+    def finish(self):
+        """Prints the report and writes it as JSON if requested"""
+        self.finished = True
+        print(self.format_report(), file=sys.stderr)
+        if self.json_path:
+            try:
+                with open(self.json_path, "w") as f:
+                    json.dump(self.get_report(), f, indent=2)
+            except OSError as e:
+                logger.error(f"Could not write startup profile: {e}")
+
+
+_profiler = None
+
+
+def enable_profiling(start=None, json_path=None):
+    """Starts profiling startup with a shared profiler"""
+    global _profiler
+    _profiler = StartupProfiler(start, json_path)
+    return _profiler
+
+
+def get_profiler():
+    """Gets the shared profiler, or None when startup is not profiled"""
+    return _profiler
+
+
+@contextmanager
+def profile_phase(name):
+    """Times a block as a startup phase when profiling is enabled"""
+    if _profiler is None or _profiler.finished:
+        yield
+        return
+    with _profiler.phase(name):
+        yield
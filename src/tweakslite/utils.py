@@ -3,6 +3,10 @@ import os
 import subprocess
 import shlex
 import logging
+import threading
+from gi.repository import Gio, GLib
+from .environment import get_runtime_environment
+from .host import HostHelperError, HostHelperLostError, get_host_helper
 
 # Configure logger
 logger = logging.getLogger("tweakslite")
@@ -77,12 +81,12 @@ def format_key_description(text: str) -> str:
 
 def is_flatpak():
     """Check if the application is running inside Flatpak"""
-    return os.path.exists("/.flatpak-info")
+    return get_runtime_environment().is_flatpak
 
 
-def run_command(command, shell=False):
-    """Run a command, using flatpak-spawn if in Flatpak environment"""
-    if is_flatpak():
+def _build_command(command, shell=False):
+    """Builds the command to run, wrapping it with flatpak-spawn in Flatpak"""
+    if get_runtime_environment().is_flatpak:
         if isinstance(command, str):
             if shell:
                 # For dconf commands, handle them with flatpak-spawn
@@ -149,17 +153,40 @@ def run_command(command, shell=False):
     else:
         full_command = command
 
+    return full_command
+
+
+def run_command(command, shell=False):
+    """Run a command, using flatpak-spawn if in Flatpak environment"""
+    full_command = _build_command(command, shell)
+
     try:
         logger.debug(
             f"Running command: {' '.join(full_command if isinstance(full_command, list) else [full_command])}"
         )
-        result = subprocess.run(
-            full_command,
-            shell=shell if not is_flatpak() else False,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        result = None
+        if get_runtime_environment().is_flatpak and full_command[:2] == [
+            "flatpak-spawn",
+            "--host",
+        ]:
+            # Reuse the persistent host helper instead of spawning per command
+            try:
+                result = get_host_helper().run(full_command[2:])
+            except HostHelperError as e:
+                # Only reached when the helper never got the command
+                logger.warning(f"Falling back to flatpak-spawn: {e}")
+            if result is not None and result.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    result.returncode, full_command, result.stdout, result.stderr
+                )
+        if result is None:
+            result = subprocess.run(
+                full_command,
+                shell=shell if not get_runtime_environment().is_flatpak else False,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
         if result.stdout:
             logger.debug(f"Command stdout: {result.stdout}")
         if result.stderr:
@@ -170,6 +197,161 @@ def run_command(command, shell=False):
         if e.stderr:
             logger.error(f"Command stderr: {e.stderr}")
         return None
+    except subprocess.TimeoutExpired as e:
+        logger.error(f"Command timed out: {e}")
+        return None
+    except HostHelperLostError as e:
+        # The command may have run, so it is not run again
+        logger.error(f"Lost the result of a host command: {e}")
+        return None
+
+
+def run_command_async(
+    command, callback=None, shell=False, cancellable=None, binary=False
+):
+    """Run a command without blocking the main loop.
+
+    The command is built exactly like run_command. In Flatpak, host commands
+    go through the persistent host helper on a worker thread; other commands
+    are started with Gio.Subprocess. When it finishes, callback is invoked on
+    the main loop with the stripped stdout, or None if the command failed or
+    was cancelled. With binary=True stdout is passed on as unmodified bytes
+    instead. Returns the Gio.Cancellable that can be used to abort the
+    command.
+    """
+    full_command = _build_command(command, shell)
+    if isinstance(full_command, str):
+        full_command = ["/bin/sh", "-c", full_command]
+
+    if cancellable is None:
+        cancellable = Gio.Cancellable()
+
+    def finish(output):
+        if callback is not None:
+            callback(output)
+
+    logger.debug(f"Running command asynchronously: {' '.join(full_command)}")
+    if get_runtime_environment().is_flatpak and full_command[:2] == [
+        "flatpak-spawn",
+        "--host",
+    ]:
+        _run_host_command_async(full_command, finish, cancellable, binary)
+    else:
+        _spawn_async(full_command, finish, cancellable, binary)
+    return cancellable
+
+
+def _run_host_command_async(full_command, finish, cancellable, binary):
+    """Runs a host command through the host helper on a worker thread
+
+    Cancelling stops the command on the host. If the helper never got the
+    command, it is spawned with flatpak-spawn instead.
+    """
+    cancelled = threading.Event()
+    # Runs right away if the cancellable is already cancelled
+    handler_id = cancellable.connect(lambda *args: cancelled.set())
+
+    def deliver(output):
+        cancellable.disconnect(handler_id)
+        if cancellable.is_cancelled():
+            logger.debug("Command cancelled")
+            output = None
+        finish(output)
+        return GLib.SOURCE_REMOVE
+
+    def spawn():
+        cancellable.disconnect(handler_id)
+        _spawn_async(full_command, finish, cancellable, binary)
+        return GLib.SOURCE_REMOVE
+
+    def run():
+        if cancelled.is_set():
+            GLib.idle_add(deliver, None)
+            return
+        try:
+            result = get_host_helper().run(
+                full_command[2:], text=not binary, cancelled=cancelled
+            )
+        except HostHelperError as e:
+            # Only reached when the helper never got the command
+            logger.warning(f"Falling back to flatpak-spawn: {e}")
+            GLib.idle_add(spawn)
+            return
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"Command timed out: {e}")
+            GLib.idle_add(deliver, None)
+            return
+        except HostHelperLostError as e:
+            # The command may have run, so it is not run again
+            logger.error(f"Lost the result of a host command: {e}")
+            GLib.idle_add(deliver, None)
+            return
+
+        if result.stderr:
+            logger.debug(f"Command stderr: {result.stderr}")
+        if result.returncode != 0:
+            if not cancelled.is_set():
+                logger.error(f"Error running command: exit status {result.returncode}")
+            GLib.idle_add(deliver, None)
+            return
+        if binary:
+            GLib.idle_add(deliver, result.stdout)
+            return
+        if result.stdout:
+            logger.debug(f"Command stdout: {result.stdout}")
+        GLib.idle_add(deliver, result.stdout.strip())
+
+    threading.Thread(target=run, name="host-command", daemon=True).start()
+
+
+def _spawn_async(full_command, finish, cancellable, binary):
+    """Runs a command with Gio.Subprocess and passes its output to finish"""
+    try:
+        process = Gio.Subprocess.new(
+            full_command,
+            Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE,
+        )
+    except GLib.Error as e:
+        logger.error(f"Error running command: {e.message}")
+        GLib.idle_add(finish, None)
+        return
+
+    def on_communicated(process, result):
+        try:
+            if binary:
+                _, stdout, stderr = process.communicate_finish(result)
+                stdout = stdout.get_data() if stdout is not None else b""
+                stderr = stderr.get_data().decode(errors="replace") if stderr else ""
+            else:
+                _, stdout, stderr = process.communicate_utf8_finish(result)
+        except GLib.Error as e:
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                logger.debug("Command cancelled")
+                process.force_exit()
+            else:
+                logger.error(f"Error running command: {e.message}")
+            finish(None)
+            return
+
+        if stderr:
+            logger.debug(f"Command stderr: {stderr}")
+        if not process.get_successful():
+            logger.error(
+                f"Error running command: exit status {process.get_exit_status()}"
+            )
+            finish(None)
+            return
+        if binary:
+            finish(stdout)
+            return
+        if stdout:
+            logger.debug(f"Command stdout: {stdout}")
+        finish((stdout or "").strip())
+
+    if binary:
+        process.communicate_async(None, cancellable, on_communicated)
+    else:
+        process.communicate_utf8_async(None, cancellable, on_communicated)
 
 
 def debug_print(*args, **kwargs):
@@ -1,21 +1,26 @@
-from .base import BaseView
-from .fonts import View as FontsView
-from .appearance import View as AppearanceView
-from .sound import View as SoundView
-from .mouse_and_touchpad import View as MouseView
-from .keyboard import View as KeyboardView
-from .windows import View as WindowsView
-from .startup_applications import View as StartupView
-from .extensions import View as ExtensionsView
+import importlib
 
-__all__ = [
-    "BaseView",
-    "FontsView",
-    "AppearanceView",
-    "SoundView",
-    "MouseView",
-    "KeyboardView",
-    "WindowsView",
-    "StartupView",
-    "ExtensionsView",
-]
+# View classes by exported name, imported on first access so that loading
+# one view does not import every other view and its dependencies
+_VIEWS = {
+    "BaseView": ("base", "BaseView"),
+    "FontsView": ("fonts", "View"),
+    "AppearanceView": ("appearance", "View"),
+    "SoundView": ("sound", "View"),
+    "MouseView": ("mouse_and_touchpad", "View"),
+    "KeyboardView": ("keyboard", "View"),
+    "WindowsView": ("windows", "View"),
+    "StartupView": ("startup_applications", "View"),
+    "ExtensionsView": ("extensions", "View"),
+}
+
+__all__ = list(_VIEWS)
+
+
+def __getattr__(name):
+    if name not in _VIEWS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _VIEWS[name]
+    view = getattr(importlib.import_module(f".{module_name}", __name__), attribute)
+    globals()[name] = view
+    return view
@@ -1,10 +1,65 @@
 from gi.repository import Gtk, Adw, GLib, Gio
 from .base import BaseView
+from ..settings_registry import register
+
+VIEW = "Appearance"
+
+ICON_THEME = register(
+    VIEW,
+    "Styles",
+    "interface",
+    "icon-theme",
+    "s",
+    "Icons",
+    options={
+        theme: theme
+        for theme in ("Adwaita", "HighContrast", "AdwaitaLegacy", "Hicolor")
+    },
+)
+GTK_THEME = register(
+    VIEW,
+    "Styles",
+    "interface",
+    "gtk-theme",
+    "s",
+    "Legacy Applications",
+    options={
+        theme: theme
+        for theme in ("Adwaita", "HighContrastInverse", "Adwaita-dark", "HighContrast")
+    },
+)
+CURSOR_THEME = register(VIEW, "Styles", "interface", "cursor-theme", "s", "Cursor")
+COLOR_SCHEME = register(VIEW, "Styles", "interface", "color-scheme", "s", "Style")
+PICTURE_OPTIONS = register(
+    VIEW,
+    "Background",
+    "background",
+    "picture-options",
+    "s",
+    "Adjustment",
+    options={
+        "none": "None",
+        "wallpaper": "Wallpaper",
+        "centered": "Centered",
+        "scaled": "Scaled",
+        "stretched": "Stretched",
+        "zoom": "Zoom",
+        "spanned": "Spanned",
+    },
+    # Resetting the appearance keeps the wallpaper and how it is shown
+    reset=False,
+)
+
+# The background images are left out of the registry so that resetting the
+# appearance keeps the wallpaper
+SEARCH_TEXT = ("Background", "Default Image", "Dark Style Image")
 
 
 class View(BaseView):
     """View for appearance settings"""
 
+    category = VIEW
+
     def build(self):
         """Builds the appearance settings view"""
         # Styles section
@@ -15,57 +70,19 @@ class View(BaseView):
 
     def create_styles_section(self):
         """Creates the styles section"""
-        styles_group = self.create_section("Styles")
+        styles_group = self.create_section(ICON_THEME.section)
 
         # Icons theme selection
-        current_icons = self.dconf.get_string("interface", "icon-theme")
-        default_icons = self.dconf.get_default_string("interface", "icon-theme")
-
-        # Get available icon themes
-        icon_themes = ["Adwaita", "HighContrast", "AdwaitaLegacy", "Hicolor"]
-        icon_themes = self.dconf.mark_default_in_list(icon_themes, default_icons)
-
-        icons_row = Adw.ComboRow(title="Icons", model=Gtk.StringList.new(icon_themes))
-
-        # Set active option
-        for i, theme in enumerate(icon_themes):
-            theme_value = theme.replace(" (default)", "")
-            if theme_value == current_icons:
-                icons_row.set_selected(i)
-                break
-
-        icons_row.connect(
-            "notify::selected", self.on_theme_changed, "interface", "icon-theme"
-        )
-        styles_group.add(icons_row)
+        styles_group.add(self.create_combo_row(ICON_THEME, mark_default=True))
 
         # Legacy Applications (GTK Theme)
-        current_theme = self.dconf.get_string("interface", "gtk-theme")
-        default_theme = self.dconf.get_default_string("interface", "gtk-theme")
-
-        gtk_themes = ["Adwaita", "HighContrastInverse", "Adwaita-dark", "HighContrast"]
-        gtk_themes = self.dconf.mark_default_in_list(gtk_themes, default_theme)
-
-        legacy_row = Adw.ComboRow(
-            title="Legacy Applications", model=Gtk.StringList.new(gtk_themes)
-        )
-
-        for i, theme in enumerate(gtk_themes):
-            theme_value = theme.replace(" (default)", "")
-            if theme_value == current_theme:
-                legacy_row.set_selected(i)
-                break
-
-        legacy_row.connect(
-            "notify::selected", self.on_theme_changed, "interface", "gtk-theme"
-        )
-        styles_group.add(legacy_row)
+        styles_group.add(self.create_combo_row(GTK_THEME, mark_default=True))
 
         return styles_group
 
     def create_background_section(self):
         """Creates the background section"""
-        background_group = self.create_section("Background")
+        background_group = self.create_section(PICTURE_OPTIONS.section)
 
         # Default Image
         default_uri = self.dconf.get_string("background", "picture-uri") or ""
@@ -102,48 +119,10 @@ class View(BaseView):
         background_group.add(dark_row)
 
         # Adjustment
-        current_option = self.dconf.get_string("background", "picture-options")
-        default_option = self.dconf.get_default_string("background", "picture-options")
-
-        options_map = {
-            "none": "None",
-            "wallpaper": "Wallpaper",
-            "centered": "Centered",
-            "scaled": "Scaled",
-            "stretched": "Stretched",
-            "zoom": "Zoom",
-            "spanned": "Spanned",
-        }
-
-        options = self.dconf.mark_default_in_list(
-            list(options_map.values()), options_map[default_option]
-        )
-
-        adjustment_row = Adw.ComboRow(
-            title="Adjustment", model=Gtk.StringList.new(options)
-        )
-
-        if current_option in options_map:
-            current_label = options_map[current_option]
-            for i, option in enumerate(options):
-                if option.startswith(current_label):
-                    adjustment_row.set_selected(i)
-                    break
-
-        adjustment_row.connect(
-            "notify::selected", self.on_background_adjustment_changed, options_map
-        )
-        background_group.add(adjustment_row)
+        background_group.add(self.create_combo_row(PICTURE_OPTIONS, mark_default=True))
 
         return background_group
 
-    def on_theme_changed(self, row, pspec, schema, key):
-        """Handles changes to theme selections"""
-        selected = row.get_selected()
-        selected_text = row.get_model().get_string(selected)
-        theme_value = selected_text.replace(" (default)", "")
-        self.dconf.set_string(schema, key, theme_value)
-
     def on_background_clicked(self, button, schema, key, row):
         """Opens file chooser for background image selection"""
         dialog = Gtk.FileDialog()
@@ -169,23 +148,3 @@ class View(BaseView):
                 print(f"Error selecting file: {error.message}")
 
         dialog.open(self.get_root(), None, on_response)
-
-    def on_background_adjustment_changed(self, row, pspec, options_map):
-        """Handles changes to background adjustment option"""
-        selected = row.get_selected()
-        selected_text = row.get_model().get_string(selected)
-        clean_text = selected_text.replace(" (default)", "")
-        for key, value in options_map.items():
-            if value == clean_text:
-                self.dconf.set_string("background", "picture-options", key)
-                break
-
-    def reset_settings(self):
-        """Resets appearance settings to defaults"""
-        self.dconf.reset("interface", "gtk-theme")
-        self.dconf.reset("interface", "icon-theme")
-        self.dconf.reset("interface", "cursor-theme")
-        self.dconf.reset("interface", "color-scheme")
-
-        # Refresh the view
-        self.build()
@@ -1,4 +1,6 @@
+from typing import Optional
 from gi.repository import Gtk, Adw
+from ..settings_registry import registry
 import logging
 
 # Get logger for this module
@@ -8,6 +10,9 @@ logger = logging.getLogger(__name__)
 class BaseView(Gtk.Box):
     """Base class for all settings views"""
 
+    # Sidebar category of the view, which its settings are registered under
+    category: Optional[str] = None
+
     def __init__(self, dconf, autostart_manager=None, show_reset=True):
         logger.debug("Initializing BaseView")
         super().__init__(
@@ -19,6 +24,10 @@ class BaseView(Gtk.Box):
 
         self.dconf = dconf
         self.autostart_manager = autostart_manager
+        self.environment = dconf.environment
+
+        # Setting change subscriptions made by the widgets of this view
+        self._setting_handlers = []
 
         if show_reset:
             logger.debug("Adding reset button to view")
@@ -77,8 +86,111 @@ class BaseView(Gtk.Box):
         raise NotImplementedError
 
     def reset_settings(self):
-        """Resets settings to defaults - to be implemented by subclasses"""
-        raise NotImplementedError
+        """Resets the registered settings of the view to their defaults
+
+        Views without registered settings override this or have nothing to
+        reset.
+        """
+        if self.category is not None:
+            registry.reset(self.dconf, self.category)
+
+    def rebuild(self):
+        """Clears the view content and builds it again"""
+        self.unwatch_settings()
+        while True:
+            child = self.content_box.get_first_child()
+            if child is None:
+                break
+            self.content_box.remove(child)
+        self.build()
+
+    def watch_setting(self, schema, key, callback, blocked=()):
+        """Calls callback() when the setting changes, until the next rebuild
+
+        blocked lists (widget, handler_id) pairs of the handlers that write
+        the setting. They are blocked while callback() updates the widgets,
+        so a change made elsewhere is not written straight back.
+        """
+
+        def on_changed(schema, key):
+            for widget, handler_id in blocked:
+                widget.handler_block(handler_id)
+            try:
+                callback()
+            finally:
+                for widget, handler_id in blocked:
+                    widget.handler_unblock(handler_id)
+
+        handler_id = self.dconf.connect_changed(schema, key, on_changed)
+        self._setting_handlers.append(handler_id)
+
+    def unwatch_settings(self):
+        """Drops all setting change subscriptions made by this view"""
+        for handler_id in self._setting_handlers:
+            self.dconf.disconnect_changed(handler_id)
+        self._setting_handlers = []
+
+    def bind_switch(self, switch, handler_id, schema, key):
+        """Keeps a switch in sync with a boolean setting changed elsewhere
+
+        handler_id is the handler of the switch that writes the setting.
+        """
+        self.watch_setting(
+            schema,
+            key,
+            lambda: switch.set_active(self.dconf.get_boolean(schema, key)),
+            blocked=[(switch, handler_id)],
+        )
+
+    def create_switch_row(self, setting):
+        """Creates a row with a switch for a registered boolean setting"""
+        schema, key = setting.schema, setting.key
+        row = Adw.ActionRow(title=setting.label, subtitle=setting.subtitle or "")
+        row.switch = Gtk.Switch(
+            active=self.dconf.get_boolean(schema, key), valign=Gtk.Align.CENTER
+        )
+        handler_id = row.switch.connect(
+            "notify::active",
+            lambda switch, pspec: self.dconf.set_boolean(
+                schema, key, switch.get_active()
+            ),
+        )
+        self.bind_switch(row.switch, handler_id, schema, key)
+        row.add_suffix(row.switch)
+        return row
+
+    def create_combo_row(self, setting, mark_default=False):
+        """Creates a combo row for a registered string setting with options"""
+        schema, key = setting.schema, setting.key
+        values = setting.get_option_values()
+        labels = setting.get_option_labels()
+        if mark_default:
+            default = self.dconf.get_default_string(schema, key)
+            labels = [
+                f"{label} (default)" if value == default else label
+                for value, label in zip(values, labels)
+            ]
+        row = Adw.ComboRow(title=setting.label, model=Gtk.StringList.new(labels))
+        if setting.subtitle:
+            row.set_subtitle(setting.subtitle)
+
+        def on_setting_changed():
+            current = self.dconf.get_string(schema, key)
+            if current in values:
+                row.set_selected(values.index(current))
+
+        def on_selected(row, pspec):
+            selected = row.get_selected()
+            if selected >= len(values):
+                return
+            # Selecting the current value, e.g. while syncing, writes nothing
+            if self.dconf.get_string(schema, key) != values[selected]:
+                self.dconf.set_string(schema, key, values[selected])
+
+        on_setting_changed()
+        row.connect("notify::selected", on_selected)
+        self.watch_setting(schema, key, on_setting_changed)
+        return row
 
     def create_section(self, title=None):
         """Creates a new preferences group with card styling"""
@@ -108,15 +220,10 @@ class BaseView(Gtk.Box):
         def on_response(dialog, response):
             if response == "reset":
                 logger.info("Resetting page settings to defaults")
-                self.reset_settings()
-                # Clear existing content
-                while True:
-                    child = self.content_box.get_first_child()
-                    if child is None:
-                        break
-                    self.content_box.remove(child)
+                with self.dconf.batch():
+                    self.reset_settings()
                 # Rebuild the view
-                self.build()
+                self.rebuild()
                 logger.debug("View rebuilt after reset")
                 # Show confirmation toast
                 window = self.get_root()
@@ -5,12 +5,17 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, Gio, GLib  # noqa: E402
 import sys  # noqa: E402
 import os  # noqa: E402
-import dbus  # noqa: E402
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from tweakslite.bus import get_session_bus  # noqa: E402
 from tweakslite.views.base import BaseView  # noqa: E402
-from tweakslite.utils import is_flatpak  # noqa: E402
+
+SEARCH_TEXT = (
+    "User Extensions",
+    "Enable or disable all user extensions",
+    "Installed Extensions",
+)
 
 
 class ExtensionState:
@@ -39,19 +44,22 @@ class View(BaseView):
         # Load extensions after view is built
         self.load_extensions()
 
+    def _get_extensions_interface(self):
+        """Gets the GNOME Shell extensions interface using dbus-python"""
+        import dbus
+
+        shell_object = get_session_bus().get_object(
+            "org.gnome.Shell", "/org/gnome/Shell"
+        )
+        return dbus.Interface(shell_object, "org.gnome.Shell.Extensions")
+
     def _get_extensions_flatpak(self):
         """Get extensions list using dbus-python in Flatpak environment"""
         try:
-            # Connect to the session bus
-            bus = dbus.SessionBus()
-
-            # Get the GNOME Shell object
-            shell_object = bus.get_object("org.gnome.Shell", "/org/gnome/Shell")
+            import dbus
 
-            # Get the extensions interface
-            extensions_iface = dbus.Interface(
-                shell_object, "org.gnome.Shell.Extensions"
-            )
+            # Get the extensions interface of GNOME Shell
+            extensions_iface = self._get_extensions_interface()
 
             # Call ListExtensions method
             raw_extensions = extensions_iface.ListExtensions()
@@ -82,11 +90,7 @@ class View(BaseView):
     def _toggle_extension_flatpak(self, uuid, enable):
         """Toggle extension state using dbus-python in Flatpak environment"""
         try:
-            bus = dbus.SessionBus()
-            shell_object = bus.get_object("org.gnome.Shell", "/org/gnome/Shell")
-            extensions_iface = dbus.Interface(
-                shell_object, "org.gnome.Shell.Extensions"
-            )
+            extensions_iface = self._get_extensions_interface()
 
             if enable:
                 extensions_iface.EnableExtension(uuid)
@@ -100,11 +104,7 @@ class View(BaseView):
     def _open_prefs_flatpak(self, uuid):
         """Open extension preferences using dbus-python in Flatpak environment"""
         try:
-            bus = dbus.SessionBus()
-            shell_object = bus.get_object("org.gnome.Shell", "/org/gnome/Shell")
-            extensions_iface = dbus.Interface(
-                shell_object, "org.gnome.Shell.Extensions"
-            )
+            extensions_iface = self._get_extensions_interface()
 
             extensions_iface.LaunchExtensionPrefs(uuid)
             return True
@@ -121,7 +121,10 @@ class View(BaseView):
             settings = Gio.Settings.new("org.gnome.shell")
             enabled_extensions = settings.get_strv("enabled-extensions")
 
-            if is_flatpak():
+            if not self.environment.has_shell_extensions:
+                print("GNOME Shell extensions interface is not available")
+                shell_extensions = {}
+            elif self.environment.is_flatpak:
                 shell_extensions = self._get_extensions_flatpak()
             else:
                 # Connect to GNOME Shell extensions interface via D-Bus
@@ -176,25 +179,14 @@ class View(BaseView):
 
     def update_view(self):
         """Updates the view with loaded extensions data"""
-        # Clear existing content
-        while True:
-            child = self.content_box.get_first_child()
-            if child is None:
-                break
-            self.content_box.remove(child)
-
         # Rebuild the view with current data
-        self.build()
+        self.rebuild()
         return False
 
     def _toggle_global_extensions_flatpak(self, enable):
         """Toggle global extensions state using dbus-python in Flatpak environment"""
         try:
-            bus = dbus.SessionBus()
-            shell_object = bus.get_object("org.gnome.Shell", "/org/gnome/Shell")
-            extensions_iface = dbus.Interface(
-                shell_object, "org.gnome.Shell.Extensions"
-            )
+            extensions_iface = self._get_extensions_interface()
 
             # Get all extensions
             extensions = extensions_iface.ListExtensions()
@@ -246,7 +238,7 @@ class View(BaseView):
                 enable = switch.get_active()
                 success = False
 
-                if is_flatpak():
+                if self.environment.is_flatpak:
                     success = self._toggle_global_extensions_flatpak(enable)
                 else:
                     settings = Gio.Settings.new("org.gnome.shell")
@@ -331,7 +323,7 @@ class View(BaseView):
                             # Enable the extension
                             if ext_uuid not in enabled_extensions:
                                 enabled_extensions.append(ext_uuid)
-                                if is_flatpak():
+                                if self.environment.is_flatpak:
                                     self._toggle_extension_flatpak(ext_uuid, True)
                                 else:
                                     self.proxy.call_sync(
@@ -345,7 +337,7 @@ class View(BaseView):
                             # Disable the extension
                             if ext_uuid in enabled_extensions:
                                 enabled_extensions.remove(ext_uuid)
-                                if is_flatpak():
+                                if self.environment.is_flatpak:
                                     self._toggle_extension_flatpak(ext_uuid, False)
                                 else:
                                     self.proxy.call_sync(
@@ -376,7 +368,7 @@ class View(BaseView):
 
                     def on_prefs_clicked(button, ext_uuid=uuid):
                         """Opens extension preferences dialog"""
-                        if is_flatpak():
+                        if self.environment.is_flatpak:
                             self._open_prefs_flatpak(ext_uuid)
                         else:
                             self.proxy.call_sync(
@@ -1,32 +1,80 @@
 from gi.repository import Gtk, Adw
 from .base import BaseView
+from ..settings_registry import register
+from ..startup_profile import profile_phase
+
+VIEW = "Fonts"
+
+INTERFACE_FONT = register(
+    VIEW,
+    "Preferred Fonts",
+    "interface",
+    "font-name",
+    "s",
+    "Interface Text",
+    subtitle="Used for application interface elements",
+)
+DOCUMENT_FONT = register(
+    VIEW,
+    "Preferred Fonts",
+    "interface",
+    "document-font-name",
+    "s",
+    "Document Text",
+    subtitle="Used for reading documents and web pages",
+)
+MONOSPACE_FONT = register(
+    VIEW,
+    "Preferred Fonts",
+    "interface",
+    "monospace-font-name",
+    "s",
+    "Monospace Text",
+    subtitle="Used for code and terminal text",
+)
+TEXT_SCALING_FACTOR = register(
+    VIEW, "Rendering", "interface", "text-scaling-factor", "d", "Scaling Factor"
+)
+FONT_HINTING = register(
+    VIEW,
+    "Rendering",
+    "interface",
+    "font-hinting",
+    "s",
+    "Hinting",
+    options={"full": "Full", "medium": "Medium", "slight": "Slight", "none": "None"},
+)
+FONT_ANTIALIASING = register(
+    VIEW,
+    "Rendering",
+    "interface",
+    "font-antialiasing",
+    "s",
+    "Antialiasing",
+    options={
+        "rgba": "Subpixel (for LCD screens)",
+        "grayscale": "Standard (greyscale)",
+        "none": "None",
+    },
+)
+
+# Text of the font chooser page
+SEARCH_TEXT = ("Font Size",)
 
 
 class View(BaseView):
     """View for font settings"""
 
+    category = VIEW
+
     def build(self):
         """Builds the fonts settings view"""
         # Preferred Fonts section
-        preferred_group = self.create_section("Preferred Fonts")
+        preferred_group = self.create_section(INTERFACE_FONT.section)
 
         # Get available fonts
-        fonts = self.get_system_fonts()
-
-        # Create font rows with size selectors
-        font_configs = [
-            ("Interface Text", "font-name", "Used for application interface elements"),
-            (
-                "Document Text",
-                "document-font-name",
-                "Used for reading documents and web pages",
-            ),
-            (
-                "Monospace Text",
-                "monospace-font-name",
-                "Used for code and terminal text",
-            ),
-        ]
+        with profile_phase("font enumeration"):
+            fonts = self.get_system_fonts()
 
         def create_font_section(title, schema_key, subtitle):
             """Creates a font section with its own state"""
@@ -80,6 +128,15 @@ class View(BaseView):
             click = Gtk.GestureClick()
             click.connect("released", lambda g, n, x, y: on_row_activated(row))
             row.add_controller(click)
+
+            # Show a font chosen elsewhere as if it was selected here
+            self.watch_setting(
+                "interface",
+                schema_key,
+                lambda: row.set_subtitle(
+                    self.dconf.get_string("interface", schema_key)
+                ),
+            )
             return row
 
         def create_font_content(window, navigation_view, schema_key, original_row):
@@ -320,8 +377,8 @@ class View(BaseView):
             return toolbar_view
 
         # Create each font section
-        for title, schema_key, subtitle in font_configs:
-            section = create_font_section(title, schema_key, subtitle)
+        for setting in (INTERFACE_FONT, DOCUMENT_FONT, MONOSPACE_FONT):
+            section = create_font_section(setting.label, setting.key, setting.subtitle)
             preferred_group.add(section)
 
         self.append(preferred_group)
@@ -329,10 +386,10 @@ class View(BaseView):
 
     def create_rendering_section(self):
         """Creates the font rendering section"""
-        rendering_group = self.create_section("Rendering")
+        rendering_group = self.create_section(FONT_HINTING.section)
 
         # Hinting
-        hinting_row = Adw.ExpanderRow(title="Hinting")
+        hinting_row = Adw.ExpanderRow(title=FONT_HINTING.label)
         current_hinting = self.dconf.get_string("interface", "font-hinting")
 
         # Create box for hinting options
@@ -346,22 +403,25 @@ class View(BaseView):
         )
 
         first_radio = None
-        for option in ["Full", "Medium", "Slight", "None"]:
-            radio = Gtk.CheckButton(label=option)
+        hinting_radios = {}
+        for value, label in FONT_HINTING.options.items():
+            radio = Gtk.CheckButton(label=label)
             if first_radio:
                 radio.set_group(first_radio)
             else:
                 first_radio = radio
-            if option.lower() == current_hinting:
+            if value == current_hinting:
                 radio.set_active(True)
-            radio.connect("toggled", self.on_hinting_changed, option.lower())
+            handler_id = radio.connect("toggled", self.on_hinting_changed, value)
+            hinting_radios[value] = (radio, handler_id)
             hinting_box.append(radio)
+        self.watch_radios(FONT_HINTING, hinting_radios)
 
         hinting_row.add_row(hinting_box)
         rendering_group.add(hinting_row)
 
         # Antialiasing
-        antialiasing_row = Adw.ExpanderRow(title="Antialiasing")
+        antialiasing_row = Adw.ExpanderRow(title=FONT_ANTIALIASING.label)
         current_aa = self.dconf.get_string("interface", "font-antialiasing")
 
         # Create box for antialiasing options
@@ -374,14 +434,9 @@ class View(BaseView):
             margin_end=8,
         )
 
-        aa_map = {
-            "rgba": "Subpixel (for LCD screens)",
-            "grayscale": "Standard (greyscale)",
-            "none": "None",
-        }
-
         first_aa_radio = None
-        for value, label in aa_map.items():
+        antialiasing_radios = {}
+        for value, label in FONT_ANTIALIASING.options.items():
             radio = Gtk.CheckButton(label=label)
             if first_aa_radio:
                 radio.set_group(first_aa_radio)
@@ -389,14 +444,34 @@ class View(BaseView):
                 first_aa_radio = radio
             if value == current_aa:
                 radio.set_active(True)
-            radio.connect("toggled", self.on_antialiasing_changed, value)
+            handler_id = radio.connect("toggled", self.on_antialiasing_changed, value)
+            antialiasing_radios[value] = (radio, handler_id)
             antialiasing_box.append(radio)
+        self.watch_radios(FONT_ANTIALIASING, antialiasing_radios)
 
         antialiasing_row.add_row(antialiasing_box)
         rendering_group.add(antialiasing_row)
 
         return rendering_group
 
+    def watch_radios(self, setting, radios):
+        """Selects the radio of a value set elsewhere
+
+        radios maps each value of the setting to its (radio, handler_id).
+        """
+
+        def on_setting_changed():
+            current = self.dconf.get_string(setting.schema, setting.key)
+            if current in radios:
+                radios[current][0].set_active(True)
+
+        self.watch_setting(
+            setting.schema,
+            setting.key,
+            on_setting_changed,
+            blocked=list(radios.values()),
+        )
+
     def on_hinting_changed(self, button, value):
         """Updates font hinting when radio button selection changes"""
         if button.get_active():
@@ -407,18 +482,6 @@ class View(BaseView):
         if button.get_active():
             self.dconf.set_string("interface", "font-antialiasing", value)
 
-    def reset_settings(self):
-        """Resets font settings to defaults"""
-        self.dconf.reset("interface", "font-name")
-        self.dconf.reset("interface", "document-font-name")
-        self.dconf.reset("interface", "monospace-font-name")
-        self.dconf.reset("interface", "text-scaling-factor")
-        self.dconf.reset("interface", "font-antialiasing")
-        self.dconf.reset("interface", "font-hinting")
-
-        # Refresh the view
-        self.build()
-
     def get_system_fonts(self):
         """Gets list of available system fonts"""
         try:
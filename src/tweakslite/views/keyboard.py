@@ -4,14 +4,62 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 gi.require_version("GnomeDesktop", "4.0")
 
-from gi.repository import Gtk, Adw, GnomeDesktop, GLib  # noqa: E402
+from gi.repository import Gtk, Adw, GLib  # noqa: E402
 from .base import BaseView  # noqa: E402
+from ..settings_registry import register  # noqa: E402
 from ..utils import format_keyboard_option  # noqa: E402
 
+VIEW = "Keyboard"
+
+SHOW_ALL_SOURCES = register(
+    VIEW,
+    None,
+    "input-sources",
+    "show-all-sources",
+    "b",
+    "Show Extended Input Sources",
+    subtitle="Increases the choice of input sources in the Settings application",
+)
+KEY_THEME = register(
+    VIEW,
+    "Layout",
+    "interface",
+    "gtk-key-theme",
+    "s",
+    "Emacs Input",
+    subtitle="Overrides shortcuts to use keybindings from the Emacs editor",
+)
+OVERLAY_KEY = register(
+    VIEW,
+    "Layout",
+    "mutter",
+    "overlay-key",
+    "s",
+    "Overview Shortcut",
+    options={"Left Super": "Left Super", "Right Super": "Right Super"},
+)
+XKB_OPTIONS = register(
+    VIEW,
+    "Layout",
+    "input-sources",
+    "xkb-options",
+    "as",
+    "Additional Layout Options",
+)
+
+
+def get_xkb_info():
+    """Gets the XKB layout database, loading GnomeDesktop on first use"""
+    from gi.repository import GnomeDesktop
+
+    return GnomeDesktop.XkbInfo()
+
 
 class View(BaseView):
     """View for keyboard settings"""
 
+    category = VIEW
+
     def build(self):
         """Builds the keyboard settings view"""
         # Input Sources section
@@ -22,77 +70,51 @@ class View(BaseView):
 
     def create_input_section(self):
         """Creates the input sources section"""
-        input_group = self.create_section()
+        input_group = self.create_section(SHOW_ALL_SOURCES.section)
 
         # Extended Input Sources toggle
-        current_show_all = self.dconf.get_boolean("input-sources", "show-all-sources")
-        sources_row = Adw.ActionRow(
-            title="Show Extended Input Sources",
-            subtitle="Increases the choice of input sources in the Settings application",
-        )
-        sources_switch = Gtk.Switch(active=current_show_all, valign=Gtk.Align.CENTER)
-        sources_switch.connect("notify::active", self.on_show_all_sources_changed)
-        sources_row.add_suffix(sources_switch)
-        input_group.add(sources_row)
+        input_group.add(self.create_switch_row(SHOW_ALL_SOURCES))
 
         return input_group
 
     def create_layout_section(self):
         """Creates the keyboard layout section"""
-        layout_group = self.create_section("Layout")
+        layout_group = self.create_section(KEY_THEME.section)
 
         # Emacs Input
         current_theme = self.dconf.get_string("interface", "gtk-key-theme")
-        emacs_row = Adw.ActionRow(
-            title="Emacs Input",
-            subtitle="Overrides shortcuts to use keybindings from the Emacs editor",
-        )
+        emacs_row = Adw.ActionRow(title=KEY_THEME.label, subtitle=KEY_THEME.subtitle)
         emacs_switch = Gtk.Switch(
             active=current_theme == "Emacs", valign=Gtk.Align.CENTER
         )
-        emacs_switch.connect("notify::active", self.on_emacs_input_changed)
+        handler_id = emacs_switch.connect("notify::active", self.on_emacs_input_changed)
+        self.watch_setting(
+            "interface",
+            "gtk-key-theme",
+            lambda: emacs_switch.set_active(
+                self.dconf.get_string("interface", "gtk-key-theme") == "Emacs"
+            ),
+            blocked=[(emacs_switch, handler_id)],
+        )
         emacs_row.add_suffix(emacs_switch)
         layout_group.add(emacs_row)
 
         # Overview Shortcut
-        current_key = self.dconf.get_string("mutter", "overlay-key")
-        options = ["Left Super", "Right Super"]
-
-        shortcut_row = Adw.ComboRow(
-            title="Overview Shortcut", model=Gtk.StringList.new(options)
-        )
-
-        # Set initial selection
-        shortcut_row.set_selected(1 if current_key == "Right Super" else 0)
-
-        # Connect to changes
-        shortcut_row.connect("notify::selected", self.on_overlay_key_changed)
-
-        layout_group.add(shortcut_row)
+        layout_group.add(self.create_combo_row(OVERLAY_KEY))
 
         # Additional Layout Options button
-        options_row = Adw.ActionRow(title="Additional Layout Options", activatable=True)
+        options_row = Adw.ActionRow(title=XKB_OPTIONS.label, activatable=True)
         options_row.connect("activated", self.on_additional_options_clicked)
         layout_group.add(options_row)
 
         return layout_group
 
-    def on_show_all_sources_changed(self, switch, pspec):
-        """Handles changes to show all input sources setting"""
-        self.dconf.set_boolean("input-sources", "show-all-sources", switch.get_active())
-
     def on_emacs_input_changed(self, switch, pspec):
         """Handles changes to Emacs input setting"""
         self.dconf.set_string(
             "interface", "gtk-key-theme", "Emacs" if switch.get_active() else "Default"
         )
 
-    def on_overlay_key_changed(self, row, pspec):
-        """Handles changes to overview shortcut key"""
-        selected = row.get_selected()
-        key = "Right Super" if selected == 1 else "Left Super"
-        self.dconf.set_string("mutter", "overlay-key", key)
-
     def on_additional_options_clicked(self, button):
         """Opens the additional layout options page"""
         window = self.get_root()
@@ -120,7 +142,7 @@ class View(BaseView):
                 )
 
                 try:
-                    xkb_info = GnomeDesktop.XkbInfo()
+                    xkb_info = get_xkb_info()
                     blacklist = {"grp_led", "Compose key"}
 
                     # Get all option groups except blacklisted ones
@@ -204,7 +226,7 @@ class View(BaseView):
         toolbar_view.add_top_bar(header)
 
         # Create content
-        xkb_info = GnomeDesktop.XkbInfo()
+        xkb_info = get_xkb_info()
         group_desc = xkb_info.description_for_group(group_id)
 
         # Create preferences group
@@ -212,7 +234,7 @@ class View(BaseView):
         group.add_css_class("card")
 
         # Get current options
-        current_options = self.dconf.settings["input-sources"].get_strv("xkb-options")
+        current_options = self.dconf.get_strv("input-sources", "xkb-options")
 
         # Add options
         first_radio = None
@@ -268,13 +290,3 @@ class View(BaseView):
             self.dconf.setting_remove_from_list(
                 "input-sources", "xkb-options", option_id
             )
-
-    def reset_settings(self):
-        """Resets keyboard settings to defaults"""
-        self.dconf.reset("input-sources", "show-all-sources")
-        self.dconf.reset("interface", "gtk-key-theme")
-        self.dconf.reset("mutter", "overlay-key")
-        self.dconf.reset("input-sources", "xkb-options")
-
-        # Refresh the view
-        self.build()
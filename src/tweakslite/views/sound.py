@@ -1,17 +1,29 @@
 from gi.repository import Gtk, Adw
 from .base import BaseView
+from ..settings_registry import register
+
+VIEW = "Sound"
+
+THEME_NAME = register(
+    VIEW, "System Sound Theme", "sound", "theme-name", "s", "System Sound Theme"
+)
+EVENT_SOUNDS = register(
+    VIEW, "System Sound Theme", "sound", "event-sounds", "b", "Event Sounds"
+)
 
 
 class View(BaseView):
     """View for sound settings"""
 
+    category = VIEW
+
     def build(self):
         """Builds the sound settings view"""
         # System Sound Theme section
-        theme_group = self.create_section("System Sound Theme")
+        theme_group = self.create_section(THEME_NAME.section)
 
         # Theme selector row
-        theme_row = Adw.ActionRow(title="System Sound Theme", subtitle="Default")
+        theme_row = Adw.ActionRow(title=THEME_NAME.label, subtitle="Default")
         theme_button = Gtk.Button(label="Default")
         theme_button.add_css_class("flat")
         theme_button.set_valign(Gtk.Align.CENTER)
@@ -19,11 +31,3 @@ class View(BaseView):
         theme_group.add(theme_row)
 
         self.append(theme_group)
-
-    def reset_settings(self):
-        """Resets sound settings to defaults"""
-        self.dconf.reset("sound", "theme-name")
-        self.dconf.reset("sound", "event-sounds")
-
-        # Refresh the view
-        self.build()
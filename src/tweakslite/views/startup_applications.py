@@ -1,15 +1,284 @@
-from gi.repository import Gtk, Adw, Gio, GLib
+from gi.repository import Gtk, Adw, Gio, GLib, GObject, Pango
 from .base import BaseView
 import os
-from ..utils import is_flatpak, run_command
+from ..managers.app_index import HOST_APPLICATION_DIR, get_flatpak_application_dirs
+from ..managers.autostart import ENTRY_REMOVED
 from ..desktop_entry import DesktopEntry
-import tempfile
+from ..icons import get_icon_resolver, get_icon_value
+from ..search_index import SearchIndex, tokenize
+import threading
 import shutil
 import logging
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+SEARCH_TEXT = (
+    "Startup Applications",
+    "Applications that will start automatically when you log in",
+    "Add Startup Application",
+)
+
+# Number of applications added to the picker per main loop iteration
+LOAD_CHUNK_SIZE = 25
+
+# Weights of the application fields in search results
+NAME_WEIGHT = 4.0
+GENERIC_NAME_WEIGHT = 2.0
+KEYWORDS_WEIGHT = 2.0
+EXECUTABLE_WEIGHT = 1.5
+DESCRIPTION_WEIGHT = 1.0
+
+
+def process_host_app(desktop_file, content):
+    """Builds a DesktopEntry for a host application that can be shown in
+    the sandbox, or None if the file does not describe an application"""
+    if not content or "[Desktop Entry]" not in content:
+        return None
+
+    processed_content = []
+    has_name = False
+    has_type = False
+    has_exec = False
+    for line in content.split("\n"):
+        # Skip certain entries
+        if (
+            line.startswith("DBusActivatable=")
+            or line.startswith("X-")
+            or line.startswith("Actions=")
+        ):
+            continue
+
+        # Process specific entries
+        if line.startswith("Name="):
+            has_name = True
+        elif line.startswith("Type=Application"):
+            has_type = True
+        elif line.startswith("Exec="):
+            has_exec = True
+            # Replace actual command with placeholder
+            line = "Exec=true"
+
+        processed_content.append(line)
+
+    # Skip if missing essential fields
+    if not (has_name and has_type):
+        return None
+
+    # Add Exec if missing
+    if not has_exec:
+        processed_content.append("Exec=true")
+
+    return DesktopEntry(desktop_file, "\n".join(processed_content))
+
+
+def process_flatpak_app(desktop_file, content):
+    """Builds a DesktopEntry for an exported Flatpak application, or None
+    if the file does not describe an application
+
+    The entry is built straight from the exported file, so adding it to
+    startup writes the real `flatpak run` command.
+    """
+    if not content or "[Desktop Entry]" not in content:
+        return None
+    entry = DesktopEntry(desktop_file, content)
+    if entry.type != "Application" or not entry.name:
+        return None
+    return entry
+
+
+def process_desktop_files(files, cancelled):
+    """Parses (process, desktop_file, content) tuples and yields the entries
+    to show, stopping early once cancelled is set"""
+    for process, desktop_file, content in files:
+        if cancelled.is_set():
+            return
+        try:
+            app = process(desktop_file, content)
+            if app and app.should_show():
+                yield app
+        except Exception as e:
+            logger.error(f"Error processing {desktop_file}: {e}", exc_info=True)
+
+
+def set_app_icon(image, app):
+    """Shows the icon of a DesktopEntry or Gio.AppInfo in an image"""
+    get_icon_resolver().set_image(image, get_icon_value(app))
+
+
+class ApplicationItem(GObject.Object):
+    """List model record of an application offered in the picker"""
+
+    __gtype_name__ = "TweaksLiteApplicationItem"
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.name = app.get_name() or ""
+        self.description = app.get_description() or ""
+        self.icon_value = get_icon_value(app)
+
+    def get_search_fields(self):
+        """Lists the (text, weight) pairs the application is found by"""
+        app = self.app
+        fields = [(self.name, NAME_WEIGHT), (self.description, DESCRIPTION_WEIGHT)]
+        if hasattr(app, "get_generic_name"):
+            fields.append((app.get_generic_name(), GENERIC_NAME_WEIGHT))
+        if hasattr(app, "get_keywords"):
+            fields.append((" ".join(app.get_keywords() or []), KEYWORDS_WEIGHT))
+        executable = app.get_executable()
+        if executable:
+            fields.append((os.path.basename(executable), EXECUTABLE_WEIGHT))
+        return fields
+
+
+class ApplicationSearch:
+    """Filters and ranks the picker applications by the search text
+
+    Applications are indexed as they are discovered, so a keystroke only
+    costs an index lookup. Without a query every application is shown in
+    discovery order.
+    """
+
+    def __init__(self):
+        self.index = SearchIndex()
+        self.query = ""
+        self.results = None
+
+    def add(self, items):
+        """Indexes newly discovered application items"""
+        for item in items:
+            self.index.add(item, item.get_search_fields())
+        self._update()
+
+    def set_query(self, query):
+        """Looks up the applications matching a new search text"""
+        self.query = query
+        self._update()
+
+    def _update(self):
+        if tokenize(self.query):
+            self.results = self.index.search(self.query)
+        else:
+            self.results = None
+
+    def matches(self, item):
+        """Checks whether an item is part of the current results"""
+        return self.results is None or item in self.results
+
+    def compare(self, a, b):
+        """Orders items by score, then by the order they were found in"""
+        if self.results:
+            score_a = self.results.get(a, 0)
+            score_b = self.results.get(b, 0)
+            if score_a != score_b:
+                return -1 if score_a > score_b else 1
+        position_a = self.index.order.get(a, 0)
+        position_b = self.index.order.get(b, 0)
+        return (position_a > position_b) - (position_a < position_b)
+
+
+def discover_applications(environment, app_index, cancelled, icon_resolver=None):
+    """Yields the applications that can be added to startup
+
+    Runs on the loader thread; stops early once cancelled is set. With an
+    icon_resolver, the icon of each application is resolved before it is
+    yielded so rows never wait on icon lookups.
+    """
+    for app in _discover_applications(environment, app_index, cancelled):
+        if icon_resolver is not None:
+            icon_resolver.resolve(get_icon_value(app))
+        yield app
+
+
+def _discover_applications(environment, app_index, cancelled):
+    logger.debug("Loading applications list")
+    if not environment.is_flatpak:
+        logger.debug("Loading applications in non-Flatpak environment")
+        app_list = Gio.AppInfo.get_all()
+        logger.debug(f"Found {len(app_list)} applications")
+        for app in app_list:
+            if cancelled.is_set():
+                return
+            if app.should_show():
+                yield app
+        return
+
+    # Desktop files come from the on-disk index, which only reads files from
+    # the host that changed since last time
+    index = app_index.load()
+    files = [
+        (process_host_app, desktop_file, content)
+        for desktop_file, content in index.get(HOST_APPLICATION_DIR, [])
+    ]
+    logger.debug(f"Found {len(files)} host applications")
+    for location in get_flatpak_application_dirs():
+        files += [
+            (process_flatpak_app, desktop_file, content)
+            for desktop_file, content in index.get(location, [])
+        ]
+    logger.debug(f"Processing {len(files)} desktop files")
+
+    # Parsing is pure Python, so it runs right here on the loader thread;
+    # threads would only contend for the GIL
+    yield from process_desktop_files(files, cancelled)
+
+
+class ApplicationLoader:
+    """Runs application discovery on a worker thread
+
+    Found applications are handed to on_chunk on the main loop in lists of
+    up to chunk_size items, followed by one call to on_done. After cancel()
+    the worker stops at the next application and nothing more is delivered.
+    """
+
+    def __init__(self, discover, on_chunk, on_done, chunk_size=LOAD_CHUNK_SIZE):
+        self.discover = discover
+        self.on_chunk = on_chunk
+        self.on_done = on_done
+        self.chunk_size = chunk_size
+        self.cancelled = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Starts discovery in the background"""
+        self.thread = threading.Thread(
+            target=self._run, name="application-loader", daemon=True
+        )
+        self.thread.start()
+
+    def cancel(self):
+        """Stops discovery and drops undelivered applications"""
+        logger.debug("Cancelling application loading")
+        self.cancelled.set()
+
+    def _run(self):
+        """Collects applications into chunks and posts them to the main loop"""
+        chunk = []
+        try:
+            for app in self.discover(self.cancelled):
+                if self.cancelled.is_set():
+                    return
+                chunk.append(app)
+                if len(chunk) >= self.chunk_size:
+                    GLib.idle_add(self._deliver, chunk)
+                    chunk = []
+        except Exception as e:
+            logger.error(f"Error loading applications: {e}", exc_info=True)
+        if chunk:
+            GLib.idle_add(self._deliver, chunk)
+        GLib.idle_add(self._finish)
+
+    def _deliver(self, chunk):
+        if not self.cancelled.is_set():
+            self.on_chunk(chunk)
+        return GLib.SOURCE_REMOVE
+
+    def _finish(self):
+        if not self.cancelled.is_set():
+            self.on_done()
+        return GLib.SOURCE_REMOVE
+
 
 class View(BaseView):
     """View for startup applications settings"""
@@ -19,6 +288,10 @@ class View(BaseView):
         # Call parent init but with show_reset=False
         super().__init__(dconf, autostart_manager, show_reset=False)
 
+        self._autostart_handler = None
+        self.connect("realize", self.on_realize)
+        self.connect("unrealize", self.on_unrealize)
+
     def build(self):
         """Builds the startup applications view"""
         # Create title box for desktop view
@@ -77,8 +350,9 @@ class View(BaseView):
             vexpand=True,
         )
 
-        # Create list group for applications
+        # Create list group for applications, with one row per desktop file
         self.startup_list = Adw.PreferencesGroup()
+        self.rows = {}
 
         # Add both states to stack
         self.startup_stack.add_named(empty_state, "empty")
@@ -91,35 +365,56 @@ class View(BaseView):
         self.refresh_list()
 
     def refresh_list(self):
-        """Updates the list of startup applications"""
+        """Shows the current startup applications
+
+        The directory is only read once; after that the manager keeps its
+        entries current and this just reconciles the rows with them.
+        """
         logger.debug("Refreshing startup applications list")
-        # Create new preferences group
-        new_list = Adw.PreferencesGroup()
+        self.autostart_manager.load_entries_async(self.on_autostart_files_loaded)
 
-        apps = self.autostart_manager.get_autostart_files()
-        logger.debug(f"Found {len(apps)} startup applications")
+    def on_realize(self, widget):
+        """Follows entry changes while the view is on screen"""
+        self._autostart_handler = self.autostart_manager.connect_changed(
+            self.on_autostart_changed
+        )
+        # Catch up with changes made while the view was not listening
+        self.refresh_list()
+
+    def on_unrealize(self, widget):
+        if self._autostart_handler is not None:
+            self.autostart_manager.disconnect_changed(self._autostart_handler)
+            self._autostart_handler = None
 
+    def on_autostart_files_loaded(self, apps):
+        """Brings the rows in line with a full list of applications"""
+        logger.debug(f"Found {len(apps)} startup applications")
+        paths = {app.get_filename() for app in apps}
+        for path in list(self.rows):
+            if path not in paths:
+                self.remove_row(path)
         for app in apps:
-            # Create a new row for each app
-            row = Adw.ActionRow(
-                title=app.get_name(),
-                subtitle=app.get_description() or "",
-                activatable=False,
-            )
+            self.update_row(app)
+        self.update_empty_state()
+
+    def on_autostart_changed(self, event, path, app):
+        """Adds, updates or removes the row of a single application"""
+        if event == ENTRY_REMOVED:
+            self.remove_row(path)
+        else:
+            self.update_row(app)
+        self.update_empty_state()
+
+    def update_row(self, app):
+        """Shows an application in its row, creating the row if needed"""
+        path = app.get_filename()
+        row = self.rows.get(path)
+        if row is None:
+            row = Adw.ActionRow(activatable=False)
 
             # Add app icon
-            icon = Gtk.Image()
-            if isinstance(app, DesktopEntry):
-                # For our custom DesktopEntry class
-                icon.set_from_icon_name(app.get_icon_name())
-            else:
-                # For GDesktopAppInfo
-                if app.get_icon():
-                    icon.set_from_gicon(app.get_icon())
-                else:
-                    icon.set_from_icon_name("application-x-executable")
-            icon.set_pixel_size(32)
-            row.add_prefix(icon)
+            row.icon = Gtk.Image(pixel_size=32)
+            row.add_prefix(row.icon)
 
             # Add remove button
             remove_button = Gtk.Button(
@@ -127,25 +422,27 @@ class View(BaseView):
                 valign=Gtk.Align.CENTER,
                 css_classes=["flat", "dim-label"],
             )
-            remove_button.connect("clicked", self.on_remove_clicked, app)
+            remove_button.connect(
+                "clicked", lambda button: self.on_remove_clicked(button, row.app)
+            )
             row.add_suffix(remove_button)
 
-            new_list.add(row)
+            self.startup_list.add(row)
+            self.rows[path] = row
 
-        # Remove old list from stack if it exists
-        old_list = self.startup_stack.get_child_by_name("list")
-        if old_list:
-            self.startup_stack.remove(old_list)
+        row.app = app
+        row.set_title(app.get_name())
+        row.set_subtitle(app.get_description() or "")
+        set_app_icon(row.icon, app)
 
-        # Add new list to stack
-        self.startup_list = new_list
-        self.startup_stack.add_named(self.startup_list, "list")
+    def remove_row(self, path):
+        row = self.rows.pop(path, None)
+        if row is not None:
+            self.startup_list.remove(row)
 
-        # Show empty state or list
-        if len(apps) > 0:
-            self.startup_stack.set_visible_child_name("list")
-        else:
-            self.startup_stack.set_visible_child_name("empty")
+    def update_empty_state(self):
+        """Shows the empty state when there are no startup applications"""
+        self.startup_stack.set_visible_child_name("list" if self.rows else "empty")
 
     def on_add_clicked(self, button):
         """Shows dialog to add startup application"""
@@ -162,27 +459,39 @@ class View(BaseView):
         # Create navigation view for add dialog
         navigation_view = Adw.NavigationView()
 
-        def create_app_row(app):
-            # Create row
-            row = Adw.ActionRow(
-                title=app.get_name() or "",
-                subtitle=app.get_description() or "",
-                activatable=True,
+        def on_setup_item(factory, list_item):
+            # Row widgets are created once per visible slot and then reused
+            box = Gtk.Box(
+                orientation=Gtk.Orientation.HORIZONTAL,
+                spacing=12,
+                margin_start=6,
+                margin_end=6,
+                margin_top=6,
+                margin_bottom=6,
             )
-
-            # Add application icon
-            icon = Gtk.Image(pixel_size=32)
-            if isinstance(app, DesktopEntry):
-                icon.set_from_icon_name(app.get_icon_name())
-            else:
-                if app.get_icon():
-                    icon.set_from_gicon(app.get_icon())
-                else:
-                    icon.set_from_icon_name("application-x-executable")
-
-            row.add_prefix(icon)
-            row.app_info = app
-            return row
+            box.icon = Gtk.Image(pixel_size=32)
+            labels = Gtk.Box(
+                orientation=Gtk.Orientation.VERTICAL, valign=Gtk.Align.CENTER
+            )
+            box.title = Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
+            box.subtitle = Gtk.Label(
+                xalign=0,
+                ellipsize=Pango.EllipsizeMode.END,
+                css_classes=["dim-label", "caption"],
+            )
+            labels.append(box.title)
+            labels.append(box.subtitle)
+            box.append(box.icon)
+            box.append(labels)
+            list_item.set_child(box)
+
+        def on_bind_item(factory, list_item):
+            item = list_item.get_item()
+            box = list_item.get_child()
+            box.title.set_label(item.name)
+            box.subtitle.set_label(item.description)
+            box.subtitle.set_visible(bool(item.description))
+            get_icon_resolver().set_image(box.icon, item.icon_value)
 
         def create_app_page():
             toolbar_view = Adw.ToolbarView()
@@ -231,14 +540,41 @@ class View(BaseView):
 
             stack.add_named(loading_box, "loading")
 
-            # Create list box for applications
-            list_box = Gtk.ListBox(
-                selection_mode=Gtk.SelectionMode.SINGLE,
-                css_classes=["boxed-list"],
+            # Applications are kept as lightweight records in a list store and
+            # shown through a list view that only creates the visible rows
+            store = Gio.ListStore(item_type=ApplicationItem)
+            search_entry = Gtk.SearchEntry(
+                placeholder_text="Search applications",
                 margin_start=12,
                 margin_end=12,
-                margin_top=12,
-                margin_bottom=12,
+                margin_bottom=6,
+            )
+            # The search index decides which items are shown and in which
+            # order, so the filter and sorter only look up precomputed results
+            search = ApplicationSearch()
+            app_filter = Gtk.CustomFilter.new(search.matches)
+            app_sorter = Gtk.CustomSorter.new(search.compare)
+            filter_model = Gtk.FilterListModel(model=store, filter=app_filter)
+            sort_model = Gtk.SortListModel(model=filter_model, sorter=app_sorter)
+            selection = Gtk.SingleSelection(
+                model=sort_model, autoselect=False, can_unselect=True
+            )
+
+            def on_search_changed(entry):
+                search.set_query(entry.get_text())
+                app_filter.changed(Gtk.FilterChange.DIFFERENT)
+                app_sorter.changed(Gtk.SorterChange.DIFFERENT)
+
+            search_entry.connect("search-changed", on_search_changed)
+            toolbar_view.add_top_bar(search_entry)
+
+            factory = Gtk.SignalListItemFactory()
+            factory.connect("setup", on_setup_item)
+            factory.connect("bind", on_bind_item)
+            list_view = Gtk.ListView(
+                model=selection,
+                factory=factory,
+                css_classes=["navigation-sidebar"],
             )
 
             # Create scrolled window for list
@@ -247,219 +583,48 @@ class View(BaseView):
                 vscrollbar_policy=Gtk.PolicyType.AUTOMATIC,
                 vexpand=True,
             )
-            scroll.set_child(list_box)
+            scroll.set_child(list_view)
 
             stack.add_named(scroll, "list")
             stack.set_visible_child_name("loading")
 
             toolbar_view.set_content(stack)
 
-            # Load applications in an idle callback to allow the UI to show
-            def load_applications():
-                logger.debug("Loading applications list")
-                if is_flatpak():
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        logger.debug(f"Created temp directory: {temp_dir}")
-
-                        # First handle host applications
-                        host_apps_cmd = (
-                            "ls /usr/share/applications/*.desktop 2>/dev/null"
-                        )
-                        result = run_command(host_apps_cmd, shell=True)
-
-                        if result:
-                            desktop_files = result.strip().split("\n")
-                            logger.debug(
-                                f"Found {len(desktop_files)} host applications"
-                            )
-                            for desktop_file in desktop_files:
-                                if not desktop_file.strip():
-                                    continue
-
-                                try:
-                                    logger.debug(f"Processing host app: {desktop_file}")
-                                    cat_cmd = f"cat '{desktop_file}'"
-                                    content = run_command(cat_cmd, shell=True)
-
-                                    if content and "[Desktop Entry]" in content:
-                                        # Process the desktop file content
-                                        processed_content = []
-                                        has_name = False
-                                        has_type = False
-                                        has_exec = False
-                                        icon_name = None
-
-                                        for line in content.split("\n"):
-                                            # Skip certain entries
-                                            if (
-                                                line.startswith("DBusActivatable=")
-                                                or line.startswith("X-")
-                                                or line.startswith("Actions=")
-                                            ):
-                                                continue
-
-                                            # Process specific entries
-                                            if line.startswith("Name="):
-                                                has_name = True
-                                            elif line.startswith("Type=Application"):
-                                                has_type = True
-                                            elif line.startswith("Exec="):
-                                                has_exec = True
-                                                # Replace actual command with placeholder
-                                                line = "Exec=true"
-                                            elif line.startswith("Icon="):
-                                                # Extract just the icon name without path
-                                                icon_name = line.split("=")[1].strip()
-                                                if "/" in icon_name:
-                                                    icon_name = os.path.basename(
-                                                        icon_name
-                                                    )
-                                                    if (
-                                                        "." in icon_name
-                                                    ):  # Remove extension if present
-                                                        icon_name = icon_name.rsplit(
-                                                            ".", 1
-                                                        )[0]
-                                                line = f"Icon={icon_name}"
-
-                                            processed_content.append(line)
-
-                                        # Skip if missing essential fields
-                                        if not (has_name and has_type):
-                                            continue
-
-                                        # Add Exec if missing
-                                        if not has_exec:
-                                            processed_content.append("Exec=true")
-
-                                        # Create desktop entry directly with processed content
-                                        final_content = "\n".join(processed_content)
-                                        entry = DesktopEntry(
-                                            desktop_file, final_content
-                                        )
-
-                                        if entry.should_show():
-                                            print(
-                                                f"Adding host app: {entry.get_name()}"
-                                            )
-                                            row = create_app_row(entry)
-                                            list_box.append(row)
-
-                                except Exception as e:
-                                    logger.error(
-                                        f"Error processing host app {desktop_file}: {e}",
-                                        exc_info=True,
-                                    )
-
-                        # Then handle Flatpak applications
-                        flatpak_locations = [
-                            "/var/lib/flatpak/exports/share/applications/*.desktop",
-                            f"{os.environ.get('HOME')}/.local/share/flatpak/exports/share/applications/*.desktop",
-                        ]
-
-                        for location in flatpak_locations:
-                            logger.debug(f"Scanning Flatpak location: {location}")
-                            cmd = f"ls {location} 2>/dev/null || true"
-                            result = run_command(cmd, shell=True)
-
-                            if result and result != "true":
-                                desktop_files = result.strip().split("\n")
-                                logger.debug(
-                                    f"Found {len(desktop_files)} Flatpak applications in {location}"
-                                )
-                                for desktop_file in desktop_files:
-                                    if not desktop_file.strip():
-                                        continue
-
-                                    try:
-                                        logger.debug(
-                                            f"\nProcessing Flatpak app: {desktop_file}"
-                                        )
-                                        cat_cmd = f"cat '{desktop_file}'"
-                                        content = run_command(cat_cmd, shell=True)
-
-                                        if content and "[Desktop Entry]" in content:
-                                            # Process the desktop file content
-                                            processed_content = []
-                                            has_name = False
-                                            has_type = False
-                                            has_exec = False
-
-                                            for line in content.split("\n"):
-                                                if line.startswith("Name="):
-                                                    has_name = True
-                                                elif line.startswith(
-                                                    "Type=Application"
-                                                ):
-                                                    has_type = True
-                                                elif line.startswith("Exec="):
-                                                    has_exec = True
-                                                    if "flatpak run" in line:
-                                                        # Replace Flatpak exec with a simple command
-                                                        line = "Exec=true"
-                                                elif line.startswith("X-Flatpak="):
-                                                    # Skip Flatpak metadata
-                                                    continue
-                                                processed_content.append(line)
-
-                                            # Add Exec if missing
-                                            if not has_exec:
-                                                processed_content.append("Exec=true")
-
-                                            if has_name and has_type:
-                                                # Write processed content to temp file
-                                                temp_path = os.path.join(
-                                                    temp_dir,
-                                                    os.path.basename(desktop_file),
-                                                )
-                                                with open(temp_path, "w") as f:
-                                                    f.write(
-                                                        "\n".join(processed_content)
-                                                    )
-
-                                                # Try to create app info from the modified file
-                                                app_info = Gio.DesktopAppInfo.new_from_filename(
-                                                    temp_path
-                                                )
-                                                if app_info and app_info.should_show():
-                                                    print(
-                                                        f"Adding Flatpak app: {app_info.get_name()}"
-                                                    )
-                                                    row = create_app_row(app_info)
-                                                    list_box.append(row)
-
-                                    except Exception as e:
-                                        logger.error(
-                                            f"Error processing Flatpak app {desktop_file}: {e}",
-                                            exc_info=True,
-                                        )
-                else:
-                    logger.debug("Loading applications in non-Flatpak environment")
-                    app_list = Gio.AppInfo.get_all()
-                    logger.debug(f"Found {len(app_list)} applications")
-                    for app in app_list:
-                        if not app.should_show():
-                            continue
-                        row = create_app_row(app)
-                        list_box.append(row)
-
-                # Switch to the list view once loading is complete
+            # Discover applications on a worker thread and append their rows
+            # as they arrive, so the dialog stays responsive while loading
+            def on_applications_found(apps):
+                items = [ApplicationItem(app) for app in apps]
+                # Index first so the filter sees the new items
+                search.add(items)
+                store.splice(store.get_n_items(), 0, items)
+                stack.set_visible_child_name("list")
+
+            def on_applications_loaded():
+                logger.debug("Finished loading applications list")
                 stack.set_visible_child_name("list")
-                return GLib.SOURCE_REMOVE
 
-            # Schedule the loading to happen in an idle callback
-            GLib.idle_add(load_applications)
+            # Created here on the main thread before the loader uses it
+            icon_resolver = get_icon_resolver()
+            loader = ApplicationLoader(
+                lambda cancelled: discover_applications(
+                    self.environment,
+                    self.autostart_manager.app_index,
+                    cancelled,
+                    icon_resolver,
+                ),
+                on_applications_found,
+                on_applications_loaded,
+            )
+            dialog.connect("destroy", lambda _: loader.cancel())
+            loader.start()
 
             # Handle selection
-            def on_row_selected(box, row):
-                if row:
-                    self.selected_app = row.app_info
-                    add_button.set_sensitive(True)
-                else:
-                    self.selected_app = None
-                    add_button.set_sensitive(False)
+            def on_selection_changed(selection, pspec):
+                item = selection.get_selected_item()
+                self.selected_app = item.app if item else None
+                add_button.set_sensitive(item is not None)
 
-            list_box.connect("row-selected", on_row_selected)
+            selection.connect("notify::selected-item", on_selection_changed)
 
             return toolbar_view
 
@@ -482,7 +647,6 @@ class View(BaseView):
             )
             if self.autostart_manager.add_app_to_autostart(self.selected_app):
                 logger.debug("Successfully added application to startup")
-                self.refresh_list()
             else:
                 logger.error("Failed to add application to startup")
         dialog.destroy()
@@ -492,7 +656,6 @@ class View(BaseView):
         logger.info(f"Removing application from startup: {app_info.get_name()}")
         if self.autostart_manager.remove_app_from_autostart(app_info):
             logger.debug("Successfully removed application from startup")
-            self.refresh_list()
         else:
             logger.error("Failed to remove application from startup")
 
@@ -505,7 +668,7 @@ class View(BaseView):
         """Adds an application to autostart"""
         logger.info(f"Adding {app_info.get_name()} to autostart")
         try:
-            if is_flatpak():
+            if self.environment.is_flatpak:
                 logger.debug("Processing Flatpak application")
                 desktop_file = app_info.get_filename()
                 logger.debug(f"Reading desktop file: {desktop_file}")
@@ -1,6 +1,11 @@
 from gi.repository import Adw, Gtk, Gio
 from .managers import DConfSettings, AutostartManager
 from .config import Config
+from .environment import get_runtime_environment
+from .prefetch import ViewPrefetcher, VisitHistory
+from .settings_registry import registry
+from .startup_profile import profile_phase
+from .settings_search import SettingsSearchIndex, get_view_module_name
 import logging
 
 # Get logger for this module
@@ -16,17 +21,45 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
 
         # Initialize managers
         logger.debug("Initializing settings managers")
-        self.dconf = DConfSettings()
-        self.autostart_manager = AutostartManager()
+        self.environment = get_runtime_environment()
+        with profile_phase("settings manager"):
+            self.dconf = DConfSettings(self.environment)
+        with profile_phase("autostart manager"):
+            self.autostart_manager = AutostartManager(self.environment)
+
+        # Sidebar search, indexed on first use
+        self.search_index = None
+        self.search_matches = None
 
         # Load configuration
         logger.debug("Loading configuration")
         self.config = Config()
+        self.visit_history = VisitHistory()
 
         # Build UI
         logger.debug("Building window UI")
         self.build()
 
+        # Build the other pages in the background once the window is shown
+        self.prefetcher = ViewPrefetcher(
+            [item[0] for item in Config.NAV_ITEMS if item is not None],
+            self.get_view,
+            self.visit_history,
+        )
+        self.prefetcher.attach(self)
+
+        # Make sure queued settings writes reach the host before closing
+        self.connect("close-request", self.on_close_request)
+
+    def on_close_request(self, window):
+        """Flushes pending settings writes when the window is closed"""
+        self.prefetcher.stop()
+        self.visit_history.save()
+        logger.debug("Flushing pending settings writes")
+        self.dconf.close()
+        logger.debug(f"Settings read cache: {self.dconf.get_cache_stats()}")
+        return False
+
     def build(self):
         """Builds the main user interface"""
         # Set up window properties
@@ -34,7 +67,8 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
         self.set_default_size(980, 640)
 
         # Load CSS
-        Config.load_css()
+        with profile_phase("load CSS"):
+            Config.load_css()
 
         # Initialize UI
         self.setup_ui()
@@ -168,7 +202,8 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
 
         # Load first category by default
         first_category = Config.NAV_ITEMS[0][0]  # Get first non-separator category
-        self.load_category(first_category)
+        with profile_phase(f"first view ({first_category})"):
+            self.load_category(first_category)
         self.set_title(first_category)
 
     def setup_breakpoint(self):
@@ -242,7 +277,17 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
 
     def on_search_changed(self, entry):
         """Handles changes to search text"""
-        # Refilter the sidebar list
+        # Look the text up once, then refilter the sidebar list
+        search_text = entry.get_text()
+        if search_text.strip():
+            if self.search_index is None:
+                self.search_index = SettingsSearchIndex.for_categories(
+                    [item[0] for item in Config.NAV_ITEMS if item is not None],
+                    self.get_search_terms_for_category,
+                )
+            self.search_matches = self.search_index.search(search_text)
+        else:
+            self.search_matches = None
         self.sidebar_list.invalidate_filter()
 
     def filter_sidebar_items(self, row):
@@ -255,83 +300,13 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
         if row.get_css_classes() and "compact" in row.get_css_classes():
             return False
 
-        search_text = self.search_entry.get_text().lower()
-        if not search_text:
+        if self.search_matches is None:
             return True
 
         # Get the row's label
         box = row.get_child()
         label = [w for w in box if isinstance(w, Gtk.Label)][0]
-        category = label.get_label()
-
-        # First check category name and basic terms
-        terms = self.get_search_terms_for_category(category)
-        if any(search_text in term.lower() for term in terms):
-            return True
-
-        # Then search through the actual content
-        return self.search_in_view_content(category, search_text)
-
-    def search_in_view_content(self, category, search_text):
-        """Searches through the actual content of a view"""
-        # Convert category name to view name
-        view_name = category.lower()
-        view_name = view_name.replace(" & ", "_and_")
-        view_name = view_name.replace(" ", "_")
-
-        try:
-            # Get or create the view
-            view = self.content_stack.get_child_by_name(category)
-            if not view:
-                view_module = __import__(
-                    f"tweakslite.views.{view_name}", fromlist=["View"]
-                )
-                view_class = getattr(view_module, "View")
-                view = view_class(self.dconf, self.autostart_manager)
-
-            # Search through the view's content
-            searchable_content = self.get_view_searchable_content(view)
-            return any(search_text in content.lower() for content in searchable_content)
-
-        except (ImportError, AttributeError) as e:
-            print(f"Error searching in {category}: {e}")
-            return False
-
-    def get_view_searchable_content(self, view):
-        """Gets all searchable content from a view"""
-        searchable_content = set()
-
-        def process_widget(widget):
-            if isinstance(widget, Adw.ActionRow):
-                # Add row title and subtitle
-                if widget.get_title():
-                    searchable_content.add(widget.get_title().lower())
-                if widget.get_subtitle():
-                    searchable_content.add(widget.get_subtitle().lower())
-
-            elif isinstance(widget, Adw.ComboRow):
-                # Add combo row options
-                model = widget.get_model()
-                if model:
-                    for i in range(model.get_n_items()):
-                        searchable_content.add(model.get_string(i).lower())
-
-            elif isinstance(widget, Gtk.Label):
-                if widget.get_text():
-                    searchable_content.add(widget.get_text().lower())
-
-            # Recursively process children
-            if isinstance(widget, Gtk.Widget):
-                child = widget.get_first_child()
-                while child:
-                    process_widget(child)
-                    child = child.get_next_sibling()
-
-        # Start processing from the view's content box
-        if hasattr(view, "content_box"):
-            process_widget(view.content_box)
-
-        return searchable_content
+        return label.get_label() in self.search_matches
 
     def on_sidebar_item_activated(self, list_box, row):
         """Handles sidebar item selection"""
@@ -345,6 +320,7 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
         category = label.get_label()
 
         # Load or show category content
+        self.visit_history.record(category)
         self.load_category(category)
 
         # Update window title
@@ -354,21 +330,24 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
         if self.split_view.get_collapsed():
             self.split_view.set_show_content(True)
 
-    def load_category(self, category):
-        """Loads the content for a category"""
-        try:
+    def get_view(self, category):
+        """Gets the view of a category, creating it if it doesn't exist"""
+        view = self.content_stack.get_child_by_name(category)
+        if view is None:
             # Convert category name to module name
-            view_name = category.lower()
-            view_name = view_name.replace(" & ", "_and_")
-            view_name = view_name.replace(" ", "_")
+            view_name = get_view_module_name(category)
 
             view_module = __import__(f"tweakslite.views.{view_name}", fromlist=["View"])
             view_class = getattr(view_module, "View")
 
-            # Create view if it doesn't exist
-            if not self.content_stack.get_child_by_name(category):
-                view = view_class(self.dconf, self.autostart_manager)
-                self.content_stack.add_named(view, category)
+            view = view_class(self.dconf, self.autostart_manager)
+            self.content_stack.add_named(view, category)
+        return view
+
+    def load_category(self, category):
+        """Loads the content for a category"""
+        try:
+            self.get_view(category)
 
             # Show the view
             self.content_stack.set_visible_child_name(category)
@@ -390,47 +369,51 @@ class TweaksLiteWindow(Adw.ApplicationWindow):
         for item in Config.NAV_ITEMS:
             if item is not None:  # Skip separators
                 category = item[0]
-                view_name = category.lower()
-                view_name = view_name.replace(" & ", "_and_")
-                view_name = view_name.replace(" ", "_")
+                view_name = get_view_module_name(category)
                 view_names.append((category, view_name))
 
-        # Reset each view's settings
-        for category, view_name in view_names:
-            try:
-                # Get existing view if it's loaded
-                existing_view = self.content_stack.get_child_by_name(category)
-
-                # Import and instantiate the view if needed
-                if not existing_view:
+        # Reset each view's settings in a single dconf batch
+        loaded_views = []
+        with self.dconf.batch():
+            for category, view_name in view_names:
+                try:
+                    # Get existing view if it's loaded
+                    existing_view = self.content_stack.get_child_by_name(category)
+                    if existing_view:
+                        loaded_views.append((view_name, existing_view))
+
+                    # Importing the module registers the settings of its view
                     view_module = __import__(
                         f"tweakslite.views.{view_name}", fromlist=["View"]
                     )
-                    view_class = getattr(view_module, "View")
-                    view = view_class(self.dconf, self.autostart_manager)
-                else:
-                    view = existing_view
-
-                # Reset its settings if it has a reset method
-                if hasattr(view, "reset_settings"):
-                    view.reset_settings()
-
-                # If it's startup applications, refresh the list
-                if view_name == "startup_applications":
-                    view.refresh_list()
-                # For other views that are loaded, rebuild them
-                elif existing_view:
-                    # Clear existing content
-                    while True:
-                        child = existing_view.content_box.get_first_child()
-                        if child is None:
-                            break
-                        existing_view.content_box.remove(child)
-                    # Rebuild the view
-                    existing_view.build()
-
-            except (ImportError, AttributeError) as e:
-                print(f"Error resetting {category}: {e}")
+
+                    # Registered settings are reset without building the view
+                    if category in registry.get_views():
+                        registry.reset(self.dconf, category)
+                        continue
+
+                    # Instantiate the view if needed
+                    if not existing_view:
+                        view_class = getattr(view_module, "View")
+                        view = view_class(self.dconf, self.autostart_manager)
+                    else:
+                        view = existing_view
+
+                    # Reset its settings if it has a reset method
+                    if hasattr(view, "reset_settings"):
+                        view.reset_settings()
+
+                except (ImportError, AttributeError) as e:
+                    print(f"Error resetting {category}: {e}")
+
+        # Refresh loaded views once the batch has been applied
+        for view_name, view in loaded_views:
+            # If it's startup applications, refresh the list
+            if view_name == "startup_applications":
+                view.refresh_list()
+                continue
+            # Rebuild the view
+            view.rebuild()
 
         # Show confirmation toast
         self.show_toast("All settings have been reset to defaults")
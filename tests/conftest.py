@@ -42,3 +42,17 @@ def mock_dbus(mocker):
     mocker.patch("dbus.SessionBus", return_value=mock_bus)
     mocker.patch("dbus.Interface", return_value=mock_interface)
     return mock_bus
+
+
+@pytest.fixture
+def runtime_environment():
+    """Factory installing a shared RuntimeEnvironment with fixed capabilities"""
+    from tweakslite.environment import RuntimeEnvironment, set_runtime_environment
+
+    def install(**overrides):
+        environment = RuntimeEnvironment(**overrides)
+        set_runtime_environment(environment)
+        return environment
+
+    yield install
+    set_runtime_environment(None)
@@ -0,0 +1,161 @@
+import os
+import pytest
+from tweakslite.managers import app_index as app_index_module
+from tweakslite.environment import RuntimeEnvironment
+from tweakslite.host_files import HostFiles
+from tweakslite.managers.app_index import ApplicationIndex
+
+
+@pytest.fixture
+def app_dirs(tmp_path):
+    """Two application directories, one of them with symlinked exports"""
+    system = tmp_path / "applications"
+    system.mkdir()
+    (system / "files.desktop").write_text("[Desktop Entry]\nName=Files\n")
+    (system / "notes.txt").write_text("ignored")
+
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "org.example.App.desktop").write_text("[Desktop Entry]\nName=App\n")
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    (exports / "org.example.App.desktop").symlink_to(app / "org.example.App.desktop")
+    return system, exports
+
+
+def _hidden_host_files(mocker):
+    """Host file access that sees nothing, so everything goes through commands"""
+    host_files = mocker.Mock()
+    host_files.scan_directory.return_value = None
+    host_files.read_file.return_value = None
+    return host_files
+
+
+@pytest.fixture
+def index(app_dirs, tmp_path, mocker, runtime_environment):
+    """Index over the test directories that counts host commands"""
+    runtime_environment(is_flatpak=False)
+    index = ApplicationIndex(
+        directories=[str(d) for d in app_dirs] + [str(tmp_path / "missing")],
+        cache_path=str(tmp_path / "cache" / "applications.db"),
+        host_files=_hidden_host_files(mocker),
+    )
+    index.commands = mocker.spy(app_index_module, "run_command")
+    return index
+
+
+def test_index_reads_all_files(index, app_dirs):
+    """Test the first load reads every desktop file, following symlinks"""
+    system, exports = app_dirs
+    result = index.load()
+
+    assert result[str(system)] == [
+        (str(system / "files.desktop"), "[Desktop Entry]\nName=Files\n")
+    ]
+    assert result[str(exports)] == [
+        (str(exports / "org.example.App.desktop"), "[Desktop Entry]\nName=App\n")
+    ]
+    assert index.commands.call_count == 2
+
+
+def test_index_unchanged_load_uses_one_command(index):
+    """Test that a second load only lists the directories"""
+    first = index.load()
+    index.commands.reset_mock()
+
+    assert index.load() == first
+    assert index.commands.call_count == 1
+
+
+def test_index_rereads_only_changed_files(index, app_dirs):
+    """Test that changed, added and removed files are picked up"""
+    system, exports = app_dirs
+    index.load()
+    index.commands.reset_mock()
+
+    files = system / "files.desktop"
+    files.write_text("[Desktop Entry]\nName=Files 2\n")
+    os.utime(files, (1, 1))
+    (system / "new.desktop").write_text("[Desktop Entry]\nName=New\n")
+    (exports / "org.example.App.desktop").unlink()
+
+    result = index.load()
+    assert result[str(system)] == [
+        (str(files), "[Desktop Entry]\nName=Files 2\n"),
+        (str(system / "new.desktop"), "[Desktop Entry]\nName=New\n"),
+    ]
+    assert str(exports) not in result
+    read_command = index.commands.call_args[0][0]
+    assert "new.desktop" in read_command
+    assert "org.example.App" not in read_command
+
+
+def test_index_recovers_from_corrupt_database(index, tmp_path):
+    """Test that an unreadable cache file is rebuilt"""
+    cache = tmp_path / "cache" / "applications.db"
+    cache.parent.mkdir()
+    cache.write_bytes(b"this is not an sqlite database" * 100)
+
+    assert len(index.load()) == 2
+    index.commands.reset_mock()
+    index.load()
+    assert index.commands.call_count == 1
+
+
+def test_index_reads_visible_files_directly(app_dirs, tmp_path, mocker):
+    """Test that visible directories are loaded without any host command"""
+    system, exports = app_dirs
+    commands = mocker.spy(app_index_module, "run_command")
+    index = ApplicationIndex(
+        directories=[str(system), str(exports)],
+        cache_path=str(tmp_path / "applications.db"),
+        host_files=HostFiles(RuntimeEnvironment(is_flatpak=False)),
+    )
+
+    first = index.load()
+    assert first[str(exports)] == [
+        (str(exports / "org.example.App.desktop"), "[Desktop Entry]\nName=App\n")
+    ]
+    files = system / "files.desktop"
+    files.write_text("[Desktop Entry]\nName=Files 2\n")
+    os.utime(files, (1, 1))
+    assert index.load()[str(system)] == [
+        (str(files), "[Desktop Entry]\nName=Files 2\n")
+    ]
+    assert commands.call_count == 0
+
+
+def test_index_falls_back_for_hidden_directories(app_dirs, tmp_path, mocker):
+    """Test that only directories the sandbox cannot see use host commands"""
+    system, exports = app_dirs
+    commands = mocker.spy(app_index_module, "run_command")
+    host_files = HostFiles(RuntimeEnvironment(is_flatpak=False))
+    mocker.patch.object(
+        host_files,
+        "local_path",
+        side_effect=lambda path: None if path.startswith(str(exports)) else path,
+    )
+    index = ApplicationIndex(
+        directories=[str(system), str(exports)],
+        cache_path=str(tmp_path / "applications.db"),
+        host_files=host_files,
+    )
+
+    assert len(index.load()) == 2
+    assert commands.call_count == 2
+    assert str(system) not in commands.call_args_list[0][0][0]
+
+
+def test_host_paths_in_flatpak(tmp_path):
+    """Test that host /usr paths are read below the host root in Flatpak"""
+    (tmp_path / "usr/share/applications").mkdir(parents=True)
+    host_files = HostFiles(RuntimeEnvironment(is_flatpak=True, host_root=str(tmp_path)))
+    assert host_files.local_path("/usr/share/applications") == str(
+        tmp_path / "usr/share/applications"
+    )
+    assert host_files.local_path("/usr/share/missing") is None
+    assert host_files.scan_directory("/usr/share/missing") is None
+    assert host_files.scan_directory("/usr/share/applications") == []
+
+    no_host = HostFiles(RuntimeEnvironment(is_flatpak=True, host_root=None))
+    assert no_host.local_path("/usr/share/applications") is None
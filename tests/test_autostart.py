@@ -0,0 +1,119 @@
+import subprocess
+from tweakslite.environment import RuntimeEnvironment
+from tweakslite.managers import autostart as autostart_module
+from tweakslite.managers.autostart import AutostartManager, parse_desktop_file_stream
+
+
+def _write(path, content):
+    path.write_text(content)
+    return path
+
+
+def test_bulk_read_script_round_trip(tmp_path):
+    """Test that the bulk read output parses back into every file"""
+    directory = tmp_path / "autostart"
+    directory.mkdir()
+    _write(directory / "one.desktop", "[Desktop Entry]\nName=Łódź\n")
+    _write(directory / "two.desktop", "[Desktop Entry]\nName=Two\n\n")
+    _write(directory / "notes.txt", "ignored")
+
+    manager = AutostartManager(RuntimeEnvironment(is_flatpak=True))
+    manager.autostart_dir = str(directory)
+    output = subprocess.run(
+        ["bash", "-c", manager._bulk_read_command()],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+    entries = parse_desktop_file_stream(output.decode())
+    assert [entry.get_name() for entry in entries] == ["Łódź", "Two"]
+    assert entries[1].path == str(directory / "two.desktop")
+    assert entries[1].get_content() == "[Desktop Entry]\nName=Two\n\n"
+    assert entries[0].mtime == int((directory / "one.desktop").stat().st_mtime)
+
+
+def test_bulk_read_creates_missing_directory(tmp_path):
+    """Test that an empty listing is returned for a new directory"""
+    manager = AutostartManager(RuntimeEnvironment(is_flatpak=True))
+    manager.autostart_dir = str(tmp_path / "missing dir")
+    output = subprocess.run(
+        ["bash", "-c", manager._bulk_read_command()],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+    assert output == b""
+    assert (tmp_path / "missing dir").is_dir()
+
+
+def test_parse_truncated_stream():
+    """Test that an incomplete trailing record is dropped"""
+    data = "/a.desktop\x00100\x00[Desktop Entry]\nName=A\n\x00/b.desktop\x00"
+    entries = parse_desktop_file_stream(data)
+    assert [entry.path for entry in entries] == ["/a.desktop"]
+
+
+def test_flatpak_listing_uses_one_host_call(mocker):
+    """Test that all files are read with a single host command"""
+    run_command = mocker.patch.object(
+        autostart_module,
+        "run_command",
+        return_value="/x/a.desktop\x001\x00[Desktop Entry]\nName=A\n\x00",
+    )
+    manager = AutostartManager(RuntimeEnvironment(is_flatpak=True))
+
+    entries = manager.get_autostart_files()
+    assert run_command.call_count == 1
+    assert [entry.get_name() for entry in entries] == ["A"]
+
+
+def _event(manager, path, event_type):
+    manager._on_directory_changed(
+        None, autostart_module.Gio.File.new_for_path(str(path)), None, event_type
+    )
+
+
+def test_entries_follow_directory_events(tmp_path, mocker):
+    """Test that monitor events update single entries and notify subscribers"""
+    mocker.patch.object(AutostartManager, "_start_monitor")
+    manager = AutostartManager(RuntimeEnvironment(is_flatpak=True))
+    manager.autostart_dir = str(tmp_path)
+    manager._on_entries_loaded([])
+    events = []
+    manager.connect_changed(lambda event, path, app: events.append((event, app)))
+
+    FileMonitorEvent = autostart_module.Gio.FileMonitorEvent
+    path = _write(tmp_path / "app.desktop", "[Desktop Entry]\nName=App\n")
+    _event(manager, path, FileMonitorEvent.CHANGES_DONE_HINT)
+    _event(manager, path, FileMonitorEvent.CHANGES_DONE_HINT)
+    _write(path, "[Desktop Entry]\nName=Renamed App\n")
+    _event(manager, path, FileMonitorEvent.CHANGES_DONE_HINT)
+    _event(manager, _write(tmp_path / "notes.txt", ""), FileMonitorEvent.CREATED)
+    path.unlink()
+    _event(manager, path, FileMonitorEvent.DELETED)
+
+    assert [(event, app.get_name()) for event, app in events] == [
+        ("added", "App"),
+        ("changed", "Renamed App"),
+        ("removed", "Renamed App"),
+    ]
+    assert manager.entries == {}
+
+
+def test_entries_are_loaded_once(mocker):
+    """Test that later listings come from memory instead of the host"""
+    mocker.patch.object(AutostartManager, "_start_monitor")
+    run_command_async = mocker.patch.object(
+        autostart_module,
+        "run_command_async",
+        side_effect=lambda command, callback, **kwargs: callback(
+            b"/x/a.desktop\x001\x00[Desktop Entry]\nName=A\n\x00"
+        ),
+    )
+    manager = AutostartManager(RuntimeEnvironment(is_flatpak=True))
+    results = []
+    manager.load_entries_async(results.append)
+    manager.load_entries_async(results.append)
+
+    assert run_command_async.call_count == 1
+    assert [[app.get_name() for app in apps] for apps in results] == [["A"], ["A"]]
@@ -0,0 +1,547 @@
+import pytest
+from gi.repository import GLib
+from tweakslite.managers import dconf as dconf_module
+from tweakslite.managers import dconf_snapshot
+from tweakslite.environment import RuntimeEnvironment
+from tweakslite.managers.dconf import DConfSettings
+from tweakslite.managers.gvdb import DConfUserDatabase
+from test_gvdb import build_gvdb
+
+
+HOST_DUMP = """[desktop/interface]
+gtk-theme='Adwaita-dark'
+font-name='Cantarell 12'
+
+[desktop/input-sources]
+xkb-options=@as []
+
+[mutter]
+center-new-windows=true
+"""
+
+
+@pytest.fixture
+def make_dconf(mocker, mock_dbus, tmp_path):
+    """Factory for DConfSettings with mocked GSettings and host commands"""
+
+    def make(flatpak):
+        mocker.patch.object(
+            dconf_module.Gio.Settings,
+            "new",
+            side_effect=lambda schema_id: mocker.MagicMock(),
+        )
+        run_command = mocker.patch.object(
+            dconf_module,
+            "run_command_async",
+            side_effect=lambda cmd, callback, **kwargs: callback(""),
+        )
+        # Host dumps finish right away unless a test holds them back
+        dump_command = mocker.Mock(return_value=HOST_DUMP)
+        mocker.patch.object(
+            dconf_snapshot,
+            "run_command_async",
+            side_effect=lambda cmd, callback: callback(dump_command(cmd)),
+        )
+        # Capture write-behind ticks instead of scheduling them on a main loop
+        timeouts = []
+        mocker.patch.object(
+            dconf_module.GLib,
+            "timeout_add",
+            side_effect=lambda interval, callback: timeouts.append(callback) or 1,
+        )
+        mocker.patch.object(dconf_module.GLib, "source_remove")
+        mocker.patch.object(dconf_module, "DConfWatcher")
+        mocker.patch.object(
+            dconf_module,
+            "DConfUserDatabase",
+            side_effect=lambda: DConfUserDatabase(str(tmp_path / "user")),
+        )
+        settings = DConfSettings(
+            RuntimeEnvironment(is_flatpak=flatpak, has_host_dconf=True)
+        )
+        settings.run_command = run_command
+        settings.dump_command = dump_command
+        settings.timeouts = timeouts
+        return settings
+
+    return make
+
+
+@pytest.fixture
+def flatpak_dconf(make_dconf):
+    """DConfSettings in Flatpak mode"""
+    return make_dconf(flatpak=True)
+
+
+@pytest.fixture
+def local_dconf(make_dconf):
+    """DConfSettings outside Flatpak"""
+    return make_dconf(flatpak=False)
+
+
+def _tick(dconf_settings):
+    """Runs the pending write-behind tick"""
+    dconf_settings.timeouts.pop()()
+
+
+@pytest.fixture
+def cli_dconf(flatpak_dconf):
+    """Flatpak DConfSettings without a reachable dconf writer"""
+    flatpak_dconf.dconf_interface = None
+    return flatpak_dconf
+
+
+def test_writes_are_sent_on_tick(cli_dconf):
+    """Test that writes outside a batch are sent on the write-behind tick"""
+    cli_dconf.set_boolean("wm", "auto-raise", True)
+    cli_dconf.run_command.assert_not_called()
+
+    _tick(cli_dconf)
+    assert cli_dconf.run_command.call_count == 1
+
+
+def test_rapid_writes_are_coalesced(cli_dconf):
+    """Test that only the last value per key is written"""
+    for size in (11, 12, 13):
+        cli_dconf.set_string("interface", "font-name", f"Cantarell {size}")
+    cli_dconf.set_boolean("wm", "auto-raise", True)
+
+    assert len(cli_dconf.timeouts) == 1
+    _tick(cli_dconf)
+    cli_dconf.run_command.assert_called_once()
+    script = cli_dconf.run_command.call_args[0][0]
+    assert "font-name='Cantarell 13'" in script
+    assert "Cantarell 12" not in script
+    assert cli_dconf.coalesced_writes == 2
+
+
+def test_batch_uses_single_host_call(cli_dconf):
+    """Test that batched writes and resets are applied in one host call"""
+    with cli_dconf.batch():
+        cli_dconf.set_string("interface", "gtk-theme", "Adwaita")
+        cli_dconf.set_boolean("mutter", "center-new-windows", True)
+        cli_dconf.reset("wm", "focus-mode")
+        assert cli_dconf.run_command.call_count == 0
+
+    cli_dconf.run_command.assert_called_once()
+    script = cli_dconf.run_command.call_args[0][0]
+    assert script.startswith("dconf load / <<'EOF'\n")
+    assert "[org/gnome/desktop/interface]\ngtk-theme='Adwaita'" in script
+    assert "[org/gnome/mutter]\ncenter-new-windows=true" in script
+    assert script.endswith("dconf reset /org/gnome/desktop/wm/preferences/focus-mode")
+
+
+def test_cli_script_keeps_value_types(cli_dconf):
+    """Test that dconf load gets values it can parse back with their type"""
+    script = cli_dconf._changes_to_script(
+        {
+            "/org/gnome/desktop/input-sources/xkb-options": GLib.Variant("as", []),
+            "/org/gnome/mutter/draggable-border-width": GLib.Variant("u", 10),
+        }
+    )
+    values = dict(line.split("=", 1) for line in script.splitlines() if "=" in line)
+    assert values["xkb-options"] == "@as []"
+    for text, variant in [
+        (values["xkb-options"], GLib.Variant("as", [])),
+        (values["draggable-border-width"], GLib.Variant("u", 10)),
+    ]:
+        assert GLib.Variant.parse(None, text, None, None).equal(variant)
+
+
+def test_batch_keeps_last_change_per_key(cli_dconf):
+    """Test that a later reset overrides an earlier write of the same key"""
+    with cli_dconf.batch():
+        cli_dconf.set_string("interface", "gtk-theme", "Adwaita-dark")
+        cli_dconf.reset("interface", "gtk-theme")
+
+    script = cli_dconf.run_command.call_args[0][0]
+    assert "dconf load" not in script
+    assert script == "dconf reset /org/gnome/desktop/interface/gtk-theme"
+
+
+def test_nested_batches_commit_once(cli_dconf):
+    """Test that only the outermost batch commits"""
+    with cli_dconf.batch():
+        with cli_dconf.batch():
+            cli_dconf.reset("sound", "theme-name")
+        assert cli_dconf.run_command.call_count == 0
+    assert cli_dconf.run_command.call_count == 1
+
+
+def test_empty_batch_skips_host_call(cli_dconf):
+    """Test that an empty batch does not touch the host"""
+    with cli_dconf.batch():
+        pass
+    cli_dconf.run_command.assert_not_called()
+
+
+def test_host_commands_run_in_order(cli_dconf, mocker):
+    """Test that queued host commands start one after another"""
+    callbacks = []
+    cli_dconf.run_command.side_effect = lambda cmd, callback, **kwargs: (
+        callbacks.append(callback)
+    )
+
+    cli_dconf.reset("wm", "focus-mode")
+    _tick(cli_dconf)
+    cli_dconf.reset("wm", "auto-raise")
+    _tick(cli_dconf)
+    assert cli_dconf.run_command.call_count == 1
+
+    callbacks.pop()("")
+    assert cli_dconf.run_command.call_count == 2
+    assert cli_dconf.run_command.call_args[0][0].endswith("auto-raise")
+
+
+def test_flush_writes_pending_changes(cli_dconf, mocker):
+    """Test that flush synchronously writes changes not yet sent"""
+    cli_dconf.run_command.side_effect = lambda cmd, callback, **kwargs: None
+    run_sync = mocker.patch.object(dconf_module, "run_command", return_value="")
+
+    cli_dconf.reset("wm", "focus-mode")
+    _tick(cli_dconf)
+    cli_dconf.reset("wm", "auto-raise")
+    cli_dconf.flush()
+
+    assert cli_dconf.run_command.call_count == 1
+    run_sync.assert_called_once_with(
+        "dconf reset /org/gnome/desktop/wm/preferences/auto-raise", shell=True
+    )
+
+
+def _sent_changeset(dconf_settings):
+    """Decodes the changeset passed to the mocked dconf writer"""
+    blob = dconf_settings.dconf_interface.Change.call_args[0][0]
+    return GLib.Variant.new_from_bytes(
+        GLib.VariantType("a{smv}"), GLib.Bytes.new(bytes(blob)), False
+    ).unpack()
+
+
+def test_write_uses_dconf_writer(flatpak_dconf):
+    """Test that writes go over D-Bus instead of spawning a process"""
+    flatpak_dconf.set_boolean("wm", "auto-raise", True)
+    _tick(flatpak_dconf)
+
+    flatpak_dconf.run_command.assert_not_called()
+    assert _sent_changeset(flatpak_dconf) == {
+        "/org/gnome/desktop/wm/preferences/auto-raise": True
+    }
+
+
+def test_batch_sends_single_changeset(flatpak_dconf):
+    """Test that a batch is sent as one writer changeset"""
+    input_sources = flatpak_dconf.settings["input-sources"]
+    input_sources.get_default_value.return_value = GLib.Variant("as", [])
+    with flatpak_dconf.batch():
+        flatpak_dconf.set_string("interface", "gtk-theme", "Adwaita")
+        flatpak_dconf.setting_add_to_list("input-sources", "xkb-options", "a")
+        flatpak_dconf.reset("wm", "focus-mode")
+
+    assert flatpak_dconf.dconf_interface.Change.call_count == 1
+    assert _sent_changeset(flatpak_dconf) == {
+        "/org/gnome/desktop/interface/gtk-theme": "Adwaita",
+        "/org/gnome/desktop/input-sources/xkb-options": ["a"],
+        "/org/gnome/desktop/wm/preferences/focus-mode": None,
+    }
+
+
+def test_writer_error_falls_back_to_cli(flatpak_dconf):
+    """Test that a failing writer falls back to the dconf CLI"""
+    flatpak_dconf.set_boolean("mutter", "center-new-windows", False)
+    flatpak_dconf.flush()
+    error_handler = flatpak_dconf.dconf_interface.Change.call_args[1]["error_handler"]
+    error_handler(Exception("ServiceUnknown"))
+
+    assert flatpak_dconf.dconf_interface is None
+    flatpak_dconf.run_command.assert_called_once()
+    assert "center-new-windows=false" in flatpak_dconf.run_command.call_args[0][0]
+
+
+def _emit_changed(settings, key):
+    """Invokes the "changed" handler connected to a mocked settings object"""
+    _, handler, schema = settings.connect.call_args[0]
+    handler(settings, key, schema)
+
+
+def test_reads_are_cached_until_changed(local_dconf):
+    """Test that values are served from the cache until GSettings changes"""
+    settings = local_dconf.settings["wm"]
+    settings.get_value.return_value = GLib.Variant("s", "click")
+
+    assert local_dconf.get_string("wm", "focus-mode") == "click"
+    assert local_dconf.get_string("wm", "focus-mode") == "click"
+    assert settings.get_value.call_count == 1
+
+    settings.get_value.return_value = GLib.Variant("s", "sloppy")
+    _emit_changed(settings, "focus-mode")
+    assert local_dconf.get_string("wm", "focus-mode") == "sloppy"
+    assert local_dconf.get_cache_stats()["hits"] == 1
+    assert local_dconf.get_cache_stats()["misses"] == 2
+
+
+def test_write_invalidates_cached_value(local_dconf):
+    """Test that writing a key drops its cached value"""
+    settings = local_dconf.settings["mutter"]
+    settings.get_value.return_value = GLib.Variant("b", False)
+    assert not local_dconf.get_boolean("mutter", "center-new-windows")
+
+    local_dconf.set_boolean("mutter", "center-new-windows", True)
+    settings.get_value.return_value = GLib.Variant("b", True)
+    assert local_dconf.get_boolean("mutter", "center-new-windows")
+
+
+def test_defaults_and_ranges_are_cached(local_dconf):
+    """Test that defaults and ranges are looked up only once"""
+    settings = local_dconf.settings["background"]
+    settings.get_default_value.return_value = GLib.Variant("s", "zoom")
+    settings.get_value.return_value = GLib.Variant("s", "zoom")
+    settings.get_range.return_value = GLib.Variant(
+        "(sv)", ("enum", GLib.Variant("as", ["none", "zoom"]))
+    )
+
+    for _ in range(3):
+        assert local_dconf.get_default_string("background", "picture-options")
+        assert local_dconf.is_value_default("background", "picture-options")
+        assert local_dconf.get_available_values("background", "picture-options") == [
+            "none",
+            "zoom",
+        ]
+
+    _emit_changed(settings, "picture-options")
+    local_dconf.get_default_string("background", "picture-options")
+    assert settings.get_default_value.call_count == 1
+    assert settings.get_range.call_count == 1
+
+
+def test_parse_dconf_dump():
+    """Test parsing `dconf dump` output into a directory tree"""
+    tree = dconf_snapshot.parse_dconf_dump(
+        "[/]\nkey='root'\n\n[desktop/wm/preferences]\nfocus-mode='sloppy'\n"
+        "button-layout='appmenu:close'\n",
+        "/org/gnome/",
+    )
+    assert tree == {
+        "/org/gnome/": {"key": "'root'"},
+        "/org/gnome/desktop/wm/preferences/": {
+            "focus-mode": "'sloppy'",
+            "button-layout": "'appmenu:close'",
+        },
+    }
+
+
+def test_flatpak_reads_use_host_snapshot(flatpak_dconf):
+    """Test that Flatpak reads come from a single host dump"""
+    interface = flatpak_dconf.settings["interface"]
+    interface.get_default_value.return_value = GLib.Variant("s", "Adwaita")
+    flatpak_dconf.settings["mutter"].get_default_value.return_value = GLib.Variant(
+        "b", False
+    )
+
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita-dark"
+    assert flatpak_dconf.get_string("interface", "icon-theme") == "Adwaita"
+    assert flatpak_dconf.get_boolean("mutter", "center-new-windows")
+    assert not flatpak_dconf.is_value_default("interface", "gtk-theme")
+
+    flatpak_dconf.dump_command.assert_called_once_with(["dconf", "dump", "/org/gnome/"])
+    interface.get_value.assert_not_called()
+
+
+def test_flatpak_writes_update_snapshot(flatpak_dconf):
+    """Test that the application's own writes are visible without a reload"""
+    interface = flatpak_dconf.settings["interface"]
+    interface.get_default_value.return_value = GLib.Variant("s", "Adwaita")
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita-dark"
+
+    flatpak_dconf.set_string("interface", "gtk-theme", "HighContrast")
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "HighContrast"
+    _tick(flatpak_dconf)
+    flatpak_dconf._value_cache.clear()
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "HighContrast"
+
+    flatpak_dconf.reset("interface", "gtk-theme")
+    _tick(flatpak_dconf)
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita"
+    assert flatpak_dconf.dump_command.call_count == 1
+
+
+def test_pending_writes_win_over_host_dump(flatpak_dconf):
+    """Test that queued writes are seen even if the dump happens later"""
+    interface = flatpak_dconf.settings["interface"]
+    interface.get_default_value.return_value = GLib.Variant("s", "Adwaita")
+
+    flatpak_dconf.set_string("interface", "font-name", "Cantarell 14")
+    assert flatpak_dconf.get_string("interface", "font-name") == "Cantarell 14"
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita-dark"
+
+
+def test_refresh_host_values_reloads_subtree(flatpak_dconf):
+    """Test that refreshing one directory dumps only that directory"""
+    mutter = flatpak_dconf.settings["mutter"]
+    mutter.get_default_value.return_value = GLib.Variant("b", False)
+    assert flatpak_dconf.get_boolean("mutter", "center-new-windows")
+
+    flatpak_dconf.dump_command.return_value = "[/]\ncenter-new-windows=false\n"
+    flatpak_dconf.refresh_host_values("/org/gnome/mutter/")
+
+    flatpak_dconf.dump_command.assert_called_with(
+        ["dconf", "dump", "/org/gnome/mutter/"]
+    )
+    assert not flatpak_dconf.get_boolean("mutter", "center-new-windows")
+    assert (
+        flatpak_dconf.snapshot.lookup(
+            "/org/gnome/desktop/interface/gtk-theme", "s"
+        ).get_string()
+        == "Adwaita-dark"
+    )
+
+
+def test_host_dump_does_not_block_reads(flatpak_dconf, mocker):
+    """Test that reads use defaults until the host dump arrives"""
+    dumps = []
+    mocker.patch.object(
+        dconf_snapshot,
+        "run_command_async",
+        side_effect=lambda cmd, callback: dumps.append((cmd, callback)),
+    )
+    interface = flatpak_dconf.settings["interface"]
+    interface.get_default_value.return_value = GLib.Variant("s", "Adwaita")
+    callback = mocker.Mock()
+    flatpak_dconf.connect_changed("interface", "gtk-theme", callback)
+
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita"
+    assert flatpak_dconf.get_string("interface", "icon-theme") == "Adwaita"
+    assert len(dumps) == 1
+    callback.assert_not_called()
+
+    command, finish = dumps.pop()
+    assert command == ["dconf", "dump", "/org/gnome/"]
+    finish(HOST_DUMP)
+    callback.assert_called_once_with("interface", "gtk-theme")
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita-dark"
+
+
+def test_watcher_parses_key_changes():
+    """Test parsing of `dconf watch` output into key changes"""
+    changes = []
+    watcher = dconf_snapshot.DConfWatcher(
+        "/org/gnome/", lambda key, text: changes.append((key, text))
+    )
+    for line in [
+        "/org/gnome/desktop/interface/gtk-theme",
+        "  'Adwaita-dark'",
+        "",
+        "/org/gnome/mutter/center-new-windows",
+        "  unset",
+        "",
+        "/org/gnome/mutter/",
+        "",
+    ]:
+        watcher.handle_line(line)
+
+    assert changes == [
+        ("/org/gnome/desktop/interface/gtk-theme", "'Adwaita-dark'"),
+        ("/org/gnome/mutter/center-new-windows", None),
+        ("/org/gnome/mutter/", None),
+    ]
+
+
+def test_host_change_notifies_only_affected_key(flatpak_dconf, mocker):
+    """Test that a streamed change updates the snapshot and one subscriber"""
+    interface = flatpak_dconf.settings["interface"]
+    interface.get_default_value.return_value = GLib.Variant("s", "Adwaita")
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "Adwaita-dark"
+    flatpak_dconf.watcher.start.assert_called_once()
+
+    theme_changed = mocker.Mock()
+    font_changed = mocker.Mock()
+    flatpak_dconf.connect_changed("interface", "gtk-theme", theme_changed)
+    flatpak_dconf.connect_changed("interface", "font-name", font_changed)
+
+    flatpak_dconf._on_host_changed(
+        "/org/gnome/desktop/interface/gtk-theme", "'HighContrast'"
+    )
+
+    theme_changed.assert_called_once_with("interface", "gtk-theme")
+    font_changed.assert_not_called()
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "HighContrast"
+    assert flatpak_dconf.dump_command.call_count == 1
+
+
+def test_host_directory_change_refreshes_subtree(flatpak_dconf, mocker):
+    """Test that a directory change reloads only that directory"""
+    mutter = flatpak_dconf.settings["mutter"]
+    mutter.get_default_value.return_value = GLib.Variant("b", False)
+    assert flatpak_dconf.get_boolean("mutter", "center-new-windows")
+    callback = mocker.Mock()
+    flatpak_dconf.connect_changed("mutter", "center-new-windows", callback)
+
+    flatpak_dconf.dump_command.return_value = ""
+    flatpak_dconf._on_host_changed("/org/gnome/mutter/", None)
+
+    flatpak_dconf.dump_command.assert_called_with(
+        ["dconf", "dump", "/org/gnome/mutter/"]
+    )
+    callback.assert_called_once_with("mutter", "center-new-windows")
+    assert not flatpak_dconf.get_boolean("mutter", "center-new-windows")
+
+
+def test_disconnect_changed(local_dconf, mocker):
+    """Test that disconnected callbacks are no longer called"""
+    callback = mocker.Mock()
+    handler_id = local_dconf.connect_changed("wm", "auto-raise", callback)
+    local_dconf.disconnect_changed(handler_id)
+
+    _emit_changed(local_dconf.settings["wm"], "auto-raise")
+    callback.assert_not_called()
+
+
+def test_flatpak_reads_prefer_user_database(flatpak_dconf, tmp_path):
+    """Test that values are read from the database file without host calls"""
+    (tmp_path / "user").write_bytes(
+        build_gvdb(
+            [
+                (
+                    "/org/gnome/desktop/interface/gtk-theme",
+                    None,
+                    "/org/gnome/desktop/interface/gtk-theme",
+                    GLib.Variant("s", "HighContrast"),
+                ),
+                (
+                    "/org/gnome/mutter/center-new-windows",
+                    None,
+                    "/org/gnome/mutter/center-new-windows",
+                    GLib.Variant("s", "wrong type"),
+                ),
+            ]
+        )
+    )
+    flatpak_dconf.settings["interface"].get_default_value.return_value = GLib.Variant(
+        "s", "Adwaita"
+    )
+    flatpak_dconf.settings["mutter"].get_default_value.return_value = GLib.Variant(
+        "b", False
+    )
+
+    assert flatpak_dconf.get_string("interface", "gtk-theme") == "HighContrast"
+    assert flatpak_dconf.get_string("interface", "font-name") == "Adwaita"
+    assert not flatpak_dconf.get_boolean("mutter", "center-new-windows")
+    flatpak_dconf.dump_command.assert_not_called()
+
+
+def test_settings_objects_created_on_first_use(local_dconf):
+    """Test that a GSettings object is only made for schemas that are used"""
+    assert dict(local_dconf.settings) == {}
+    local_dconf.get_boolean("wm", "auto-raise")
+    local_dconf.connect_changed("mutter", "center-new-windows", lambda *args: None)
+    assert set(local_dconf.settings) == {"wm", "mutter"}
+    local_dconf.settings["wm"].connect.assert_called_once()
+
+
+def test_session_bus_connected_on_first_write(flatpak_dconf, mock_dbus):
+    """Test that the dconf writer is only looked up when writing"""
+    mock_dbus.get_object.assert_not_called()
+    flatpak_dconf.set_boolean("wm", "auto-raise", True)
+    _tick(flatpak_dconf)
+    mock_dbus.get_object.assert_called_once_with(
+        "ca.desrt.dconf", "/ca/desrt/dconf/Writer/user"
+    )
@@ -76,3 +76,78 @@ def test_desktop_entry_icon_handling():
             content += f"\nIcon={input_icon}"
         entry = DesktopEntry(path=None, content=content)
         assert entry.get_icon_name() == expected
+
+
+LOCALIZED_CONTENT = """# Comment before the group
+[Desktop Entry]
+Type=Application
+Name=Files
+Name[de]=Dateien
+Name[pt_BR]=Arquivos
+Name[pt]=Ficheiros
+GenericName=File Manager
+GenericName[de]=Dateiverwaltung
+Comment=Access and organize files
+Keywords=folder;manager;explore;
+Keywords[de]=Ordner;Verwaltung;
+Exec=nautilus --new-window %U
+TryExec=nautilus
+OnlyShowIn=GNOME;Unity;
+X-GNOME-Autostart-enabled=false
+X-GNOME-Autostart-Delay=5
+
+[Desktop Action new-window]
+Name=New Window
+Exec=nautilus --new-window
+"""
+
+
+def test_desktop_entry_localized_keys():
+    """Test that the best translation for the locale is used"""
+    entry = DesktopEntry("/a.desktop", LOCALIZED_CONTENT, locale="de_DE.UTF-8")
+    assert entry.name == "Dateien"
+    assert entry.generic_name == "Dateiverwaltung"
+    assert entry.keywords == ["Ordner", "Verwaltung"]
+    assert entry.description == "Access and organize files"
+
+    assert DesktopEntry("/a", LOCALIZED_CONTENT, locale="pt_BR").name == "Arquivos"
+    assert DesktopEntry("/a", LOCALIZED_CONTENT, locale="pt_PT@euro").name == (
+        "Ficheiros"
+    )
+    assert DesktopEntry("/a", LOCALIZED_CONTENT, locale="C").name == "Files"
+
+
+def test_desktop_entry_extended_keys():
+    """Test keys beyond the basic set and stopping after the main group"""
+    entry = DesktopEntry("/a.desktop", LOCALIZED_CONTENT, locale="en_US")
+    assert entry.type == "Application"
+    assert entry.exec == "nautilus --new-window %U"
+    assert entry.try_exec == "nautilus"
+    assert entry.keywords == ["folder", "manager", "explore"]
+    assert entry.only_show_in == ["GNOME", "Unity"]
+    assert not entry.is_autostart_enabled()
+    assert entry.get_autostart_delay() == 5
+    # Keys from the action group must not override the entry itself
+    assert entry.name == "Files"
+    assert entry.is_shown_in(["GNOME"])
+    assert not entry.is_shown_in(["KDE"])
+
+
+def test_desktop_entry_escapes():
+    """Test escape sequences in string and list values"""
+    content = (
+        "[Desktop Entry]\n"
+        "Name=Tab\\there\n"
+        "Comment=\\sLeading space\\nand a line\\\\break\n"
+        "Keywords=semi\\;colon;plain;\n"
+    )
+    entry = DesktopEntry(None, content)
+    assert entry.name == "Tab\there"
+    assert entry.description == " Leading space\nand a line\\break"
+    assert entry.keywords == ["semi;colon", "plain"]
+
+
+def test_desktop_entry_uses_slots():
+    """Test that entries do not carry a per-instance dict"""
+    entry = DesktopEntry(None, "[Desktop Entry]\nName=Test")
+    assert not hasattr(entry, "__dict__")
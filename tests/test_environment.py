@@ -0,0 +1,79 @@
+import pytest
+from tweakslite import environment as environment_module
+from tweakslite.environment import (
+    RuntimeEnvironment,
+    get_runtime_environment,
+    set_runtime_environment,
+)
+
+
+def test_capabilities_are_probed_once(monkeypatch):
+    """Test that a capability is probed lazily and then remembered"""
+    probes = []
+
+    def exists(path):
+        probes.append(path)
+        return path == "/.flatpak-info"
+
+    monkeypatch.setattr("os.path.exists", exists)
+    environment = RuntimeEnvironment()
+    assert probes == []
+
+    assert environment.is_flatpak
+    assert environment.is_flatpak
+    assert probes == ["/.flatpak-info"]
+
+
+def test_overrides_skip_probes(monkeypatch):
+    """Test that overridden capabilities never probe the system"""
+
+    def fail(*args):
+        raise AssertionError("probe should not run")
+
+    monkeypatch.setattr("os.path.exists", fail)
+    monkeypatch.setattr(RuntimeEnvironment, "_probe_shell", fail)
+    environment = RuntimeEnvironment(is_flatpak=True, has_shell_extensions=False)
+    assert environment.is_flatpak
+    assert not environment.has_shell_extensions
+
+
+def test_unknown_override_is_rejected():
+    """Test that misspelled capability overrides fail loudly"""
+    with pytest.raises(TypeError):
+        RuntimeEnvironment(is_flatpack=True)
+
+
+def test_host_root(monkeypatch):
+    """Test detection of the host file system mounted into the sandbox"""
+    assert RuntimeEnvironment(is_flatpak=False).host_root == "/"
+
+    monkeypatch.setattr("os.path.isdir", lambda path: path == "/run/host/usr/share")
+    assert RuntimeEnvironment(is_flatpak=True).host_root == "/run/host"
+
+    monkeypatch.setattr("os.path.isdir", lambda path: False)
+    assert RuntimeEnvironment(is_flatpak=True).host_root is None
+
+
+def test_shell_probe(mocker):
+    """Test that GNOME Shell is asked for its extensions interface once"""
+    proxy = mocker.Mock()
+    proxy.get_name_owner.return_value = ":1.42"
+    new_proxy = mocker.patch.object(
+        environment_module.Gio.DBusProxy, "new_for_bus_sync", return_value=proxy
+    )
+
+    environment = RuntimeEnvironment()
+    assert environment.has_shell_extensions
+    assert environment.has_shell_extensions
+    new_proxy.assert_called_once()
+
+
+def test_shared_environment():
+    """Test replacing and resetting the shared environment"""
+    custom = RuntimeEnvironment(is_flatpak=True)
+    set_runtime_environment(custom)
+    try:
+        assert get_runtime_environment() is custom
+    finally:
+        set_runtime_environment(None)
+    assert get_runtime_environment() is not custom
@@ -0,0 +1,161 @@
+import os
+import struct
+import pytest
+from gi.repository import GLib
+from tweakslite.managers.gvdb import (
+    DConfUserDatabase,
+    GvdbError,
+    GvdbTable,
+    gvdb_hash,
+)
+
+
+def build_gvdb(entries, byteorder="<"):
+    """Builds a single-bucket GVDB file like the ones dconf writes
+
+    entries is a list of (key, parent index, full name, value) where a value
+    of None marks a directory item.
+    """
+    items_offset = 24 + 8 + 4
+    data_offset = items_offset + 24 * len(entries)
+    items = b""
+    blobs = b""
+    for key, parent, full_name, value in entries:
+        key_bytes = key.encode()
+        key_start = data_offset + len(blobs)
+        blobs += key_bytes
+        if value is None:
+            item_type, start, end = b"L", 0, 0
+        else:
+            blobs += b"\0" * (-(data_offset + len(blobs)) % 8)
+            boxed = GLib.Variant("v", value)
+            if byteorder == ">":
+                boxed = boxed.byteswap()
+            payload = boxed.get_data_as_bytes().get_data()
+            start = data_offset + len(blobs)
+            end = start + len(payload)
+            blobs += payload
+            item_type = b"v"
+        items += struct.pack(
+            byteorder + "IIIHccII",
+            gvdb_hash(full_name.encode()),
+            0xFFFFFFFF if parent is None else parent,
+            key_start,
+            len(key_bytes),
+            item_type,
+            b"\0",
+            start,
+            end,
+        )
+    signature = b"GVariant" if byteorder == "<" else b"raVGtnai"
+    header = signature + struct.pack(byteorder + "IIII", 0, 0, 24, data_offset)
+    table = struct.pack(byteorder + "III", 0, 1, 0)
+    return header + table + items + blobs
+
+
+ENTRIES = [
+    ("/org/gnome/", None, "/org/gnome/", None),
+    ("desktop/interface/", 0, "/org/gnome/desktop/interface/", None),
+    (
+        "gtk-theme",
+        1,
+        "/org/gnome/desktop/interface/gtk-theme",
+        GLib.Variant("s", "Adwaita-dark"),
+    ),
+    (
+        "/org/gnome/mutter/center-new-windows",
+        None,
+        "/org/gnome/mutter/center-new-windows",
+        GLib.Variant("b", True),
+    ),
+    (
+        "/org/gnome/desktop/input-sources/xkb-options",
+        None,
+        "/org/gnome/desktop/input-sources/xkb-options",
+        GLib.Variant("as", ["caps:escape", "compose:ralt"]),
+    ),
+]
+
+
+@pytest.fixture
+def user_db_file(tmp_path):
+    """dconf user database file with a few values"""
+    path = tmp_path / "user"
+    path.write_bytes(build_gvdb(ENTRIES))
+    return path
+
+
+def test_gvdb_lookup(user_db_file):
+    """Test reading values, including keys split across parent items"""
+    table = GvdbTable.open(user_db_file)
+    theme = table.lookup("/org/gnome/desktop/interface/gtk-theme")
+    assert theme.get_type_string() == "s"
+    assert theme.get_string() == "Adwaita-dark"
+    assert table.lookup("/org/gnome/mutter/center-new-windows").get_boolean()
+    assert table.lookup("/org/gnome/desktop/input-sources/xkb-options").unpack() == [
+        "caps:escape",
+        "compose:ralt",
+    ]
+    table.close()
+
+
+def test_gvdb_missing_keys_and_directories(user_db_file):
+    """Test that unknown keys and directory items have no value"""
+    table = GvdbTable.open(user_db_file)
+    assert table.lookup("/org/gnome/desktop/interface/font-name") is None
+    assert table.lookup("/org/gnome/desktop/interface/") is None
+    assert table.lookup("gtk-theme") is None
+    table.close()
+
+
+def test_gvdb_big_endian(tmp_path):
+    """Test files written in the other byte order"""
+    path = tmp_path / "user"
+    path.write_bytes(build_gvdb(ENTRIES, byteorder=">"))
+    table = GvdbTable.open(path)
+    assert table.lookup("/org/gnome/desktop/interface/gtk-theme").get_string() == (
+        "Adwaita-dark"
+    )
+    table.close()
+
+
+def test_gvdb_rejects_invalid_files(tmp_path):
+    """Test that files that are not GVDB databases are rejected"""
+    path = tmp_path / "user"
+    path.write_bytes(b"not a database at all, clearly")
+    with pytest.raises(GvdbError):
+        GvdbTable.open(path)
+
+
+def test_user_database_reloads_on_change(user_db_file):
+    """Test that the database is mapped again after it is replaced"""
+    database = DConfUserDatabase(str(user_db_file))
+    assert database.refresh()
+    assert database.lookup("/org/gnome/mutter/center-new-windows").get_boolean()
+
+    replacement = user_db_file.with_name("user.new")
+    replacement.write_bytes(
+        build_gvdb(
+            [
+                (
+                    "/org/gnome/mutter/center-new-windows",
+                    None,
+                    "/org/gnome/mutter/center-new-windows",
+                    GLib.Variant("b", False),
+                )
+            ]
+        )
+    )
+    os.replace(replacement, user_db_file)
+
+    assert database.refresh()
+    assert not database.lookup("/org/gnome/mutter/center-new-windows").get_boolean()
+    assert database.lookup("/org/gnome/desktop/interface/gtk-theme") is None
+    database.close()
+
+
+def test_user_database_missing_file(tmp_path):
+    """Test that a missing database is reported as unusable"""
+    database = DConfUserDatabase(str(tmp_path / "user"))
+    assert not database.refresh()
+    assert database.lookup("/org/gnome/mutter/center-new-windows") is None
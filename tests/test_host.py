@@ -0,0 +1,201 @@
+import subprocess
+import threading
+import time
+import pytest
+from tweakslite.host import HostHelper, HostHelperError, HostHelperLostError
+
+
+@pytest.fixture
+def helper():
+    """Host helper running a local bash instead of flatpak-spawn"""
+    helper = HostHelper(spawn_prefix=(), timeout=5)
+    yield helper
+    helper.close()
+
+
+def test_host_helper_runs_commands(helper):
+    """Test that commands run over the persistent pipe"""
+    result = helper.run(["echo", "hello world"])
+    assert result.returncode == 0
+    assert result.stdout == "hello world\n"
+    assert result.stderr == ""
+
+
+def test_host_helper_reuses_process(helper):
+    """Test that consecutive commands share one helper process"""
+    helper.run("true")
+    pid = helper.process.pid
+    helper.run("true")
+    assert helper.process.pid == pid
+
+
+def test_host_helper_reports_failures(helper):
+    """Test exit status and stderr propagation"""
+    result = helper.run("echo oops >&2; exit 3")
+    assert result.returncode == 3
+    assert result.stdout == ""
+    assert result.stderr == "oops\n"
+
+
+def test_host_helper_binary_safe_framing(helper):
+    """Test multi-line and non-ASCII payloads survive the framing"""
+    text = "line one\nłine two ✓\n\n"
+    result = helper.run(["printf", "%s", text])
+    assert result.stdout == text
+
+
+def test_host_helper_bytes_output(helper):
+    """Test that text=False passes stdout on as bytes"""
+    result = helper.run(r"printf 'a\0b'", text=False)
+    assert result.stdout == b"a\0b"
+
+
+def test_host_helper_cancel_stops_command(helper, tmp_path):
+    """Test that cancelling stops the whole command but keeps the helper"""
+    helper.run("true")
+    pid = helper.process.pid
+    marker = tmp_path / "done"
+    cancelled = threading.Event()
+    threading.Timer(0.2, cancelled.set).start()
+
+    start = time.monotonic()
+    result = helper.run(f"sleep 5; touch {marker}", cancelled=cancelled)
+    assert time.monotonic() - start < 3
+    assert result.returncode != 0
+    assert not marker.exists()
+    assert helper.process.pid == pid
+    assert helper.run(["echo", "ok"]).stdout == "ok\n"
+
+
+def test_host_helper_restarts_after_exit(helper):
+    """Test that the helper restarts itself when the process dies"""
+    helper.run("true")
+    helper.process.kill()
+    helper.process.wait()
+    result = helper.run(["echo", "back"])
+    assert result.stdout == "back\n"
+
+
+def test_host_helper_timeout(helper):
+    """Test that a hung command gives up and resets the helper"""
+    with pytest.raises(subprocess.TimeoutExpired):
+        helper.run("sleep 5", timeout=0.2)
+    assert not helper.is_running()
+    assert helper.run(["echo", "ok"]).stdout == "ok\n"
+
+
+def test_host_helper_start_failure():
+    """Test that a missing spawn binary raises HostHelperError"""
+    helper = HostHelper(spawn_prefix=("/nonexistent/flatpak-spawn",))
+    with pytest.raises(HostHelperError):
+        helper.run("true")
+
+
+def test_host_helper_does_not_rerun_sent_commands(helper, tmp_path):
+    """Test that a command is not run again when the helper dies mid-way"""
+    marker = tmp_path / "runs"
+    with pytest.raises(HostHelperLostError):
+        helper.run(f"echo run >> {marker}; kill -9 $PPID")
+    assert marker.read_text() == "run\n"
+    assert helper.run(["echo", "ok"]).stdout == "ok\n"
+
+
+def test_run_command_skips_fallback_for_sent_commands(mocker, runtime_environment):
+    """Test that run_command only falls back when the helper never got it"""
+    from tweakslite import utils
+
+    runtime_environment(is_flatpak=True)
+    helper = mocker.Mock()
+    mocker.patch.object(utils, "get_host_helper", return_value=helper)
+    spawn = mocker.patch.object(
+        utils.subprocess,
+        "run",
+        return_value=subprocess.CompletedProcess([], 0, "spawned\n", ""),
+    )
+
+    helper.run.side_effect = HostHelperLostError("helper died")
+    assert utils.run_command(["dconf", "load", "/"]) is None
+    spawn.assert_not_called()
+
+    helper.run.side_effect = HostHelperError("could not start")
+    assert utils.run_command(["dconf", "load", "/"]) == "spawned"
+    spawn.assert_called_once()
+
+    helper.run.side_effect = subprocess.TimeoutExpired("dconf", 30)
+    assert utils.run_command(["dconf", "load", "/"]) is None
+
+
+def _run_async_and_wait(command, cancel=False, **kwargs):
+    """Runs run_command_async in a main loop and returns its results"""
+    from gi.repository import GLib
+    from tweakslite.utils import run_command_async
+
+    loop = GLib.MainLoop()
+    results = []
+
+    def on_done(output):
+        results.append(output)
+        loop.quit()
+
+    cancellable = run_command_async(command, on_done, **kwargs)
+    if cancel:
+        GLib.timeout_add(200, cancellable.cancel)
+    GLib.timeout_add_seconds(5, loop.quit)
+    loop.run()
+    return results
+
+
+def test_run_command_async_uses_helper(helper, mocker, runtime_environment):
+    """Test that async host commands reuse the helper instead of spawning"""
+    from tweakslite import utils
+
+    runtime_environment(is_flatpak=True)
+    mocker.patch.object(utils, "get_host_helper", return_value=helper)
+    spawn = mocker.spy(utils, "_spawn_async")
+
+    assert _run_async_and_wait(["echo", "one"]) == ["one"]
+    pid = helper.process.pid
+    output = _run_async_and_wait(r"printf 'a\0b'", shell=True, binary=True)
+    assert output == [b"a\0b"]
+    assert helper.process.pid == pid
+    spawn.assert_not_called()
+
+
+def test_run_command_async_cancel_stops_host_command(
+    helper, mocker, runtime_environment, tmp_path
+):
+    """Test that cancelling an async host command stops it on the host"""
+    from tweakslite import utils
+
+    runtime_environment(is_flatpak=True)
+    mocker.patch.object(utils, "get_host_helper", return_value=helper)
+    marker = tmp_path / "done"
+
+    start = time.monotonic()
+    results = _run_async_and_wait(f"sleep 5; touch {marker}", shell=True, cancel=True)
+    assert results == [None]
+    assert time.monotonic() - start < 3
+    assert not marker.exists()
+    assert helper.run(["echo", "ok"]).stdout == "ok\n"
+
+
+def test_run_command_async_falls_back_when_not_sent(mocker, runtime_environment):
+    """Test that async commands are spawned only if the helper never got them"""
+    from tweakslite import utils
+
+    runtime_environment(is_flatpak=True)
+    helper = mocker.Mock()
+    mocker.patch.object(utils, "get_host_helper", return_value=helper)
+    spawn = mocker.patch.object(
+        utils,
+        "_spawn_async",
+        side_effect=lambda command, finish, cancellable, binary: finish("spawned"),
+    )
+
+    helper.run.side_effect = HostHelperLostError("helper died")
+    assert _run_async_and_wait(["dconf", "load", "/"]) == [None]
+    spawn.assert_not_called()
+
+    helper.run.side_effect = HostHelperError("could not start")
+    assert _run_async_and_wait(["dconf", "load", "/"]) == ["spawned"]
+    assert spawn.call_args.args[0] == ["flatpak-spawn", "--host", "dconf", "load", "/"]
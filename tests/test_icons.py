@@ -0,0 +1,70 @@
+from gi.repository import Gio
+from tweakslite.desktop_entry import DesktopEntry
+from tweakslite.environment import RuntimeEnvironment
+from tweakslite.icons import FALLBACK_ICON, IconResolver, get_icon_value
+
+
+def _resolver(mocker, names=(), **environment):
+    theme = mocker.Mock()
+    theme.get_search_path.return_value = []
+    theme.has_icon.side_effect = lambda name: name in names
+    environment.setdefault("is_flatpak", False)
+    environment.setdefault("host_root", "/")
+    return IconResolver(theme, RuntimeEnvironment(**environment)), theme
+
+
+def _name(icon):
+    return icon.get_names()[0] if isinstance(icon, Gio.ThemedIcon) else None
+
+
+def test_resolve_theme_names(mocker):
+    """Test that theme names are checked, cleaned up and defaulted"""
+    resolver, _ = _resolver(mocker, names={"org.gnome.Example", "test"})
+    assert _name(resolver.resolve("org.gnome.Example")) == "org.gnome.Example"
+    assert _name(resolver.resolve("test.png")) == "test"
+    assert _name(resolver.resolve("missing")) == FALLBACK_ICON
+    assert _name(resolver.resolve(None)) == FALLBACK_ICON
+
+
+def test_resolve_paths(mocker, tmp_path):
+    """Test that absolute paths are looked up in the sandbox and on the host"""
+    (tmp_path / "usr/share/pixmaps").mkdir(parents=True)
+    (tmp_path / "usr/share/pixmaps/tool.png").write_bytes(b"")
+    resolver, _ = _resolver(
+        mocker, names={"gone"}, is_flatpak=True, host_root=str(tmp_path)
+    )
+
+    icon = resolver.resolve("/usr/share/pixmaps/tool.png")
+    assert icon.get_file().get_path() == str(tmp_path / "usr/share/pixmaps/tool.png")
+    assert _name(resolver.resolve("/opt/app/gone.svg")) == "gone"
+
+
+def test_cache_follows_theme_changes(mocker):
+    """Test that lookups are cached until the icon theme changes"""
+    resolver, theme = _resolver(mocker, names={"app"})
+    first = resolver.resolve("app")
+    assert resolver.resolve("app") is first
+    assert theme.has_icon.call_count == 1
+
+    theme.connect.call_args.args[1](theme)
+    assert resolver.resolve("app") is not first
+    assert theme.has_icon.call_count == 2
+
+
+def test_stale_results_are_not_cached(mocker):
+    """Test that a lookup racing a theme change does not fill the cache"""
+    resolver, theme = _resolver(mocker)
+
+    def change_theme(name):
+        resolver._on_theme_changed(theme)
+        return True
+
+    theme.has_icon.side_effect = change_theme
+    resolver.resolve("app")
+    assert "app" not in resolver._cache
+
+
+def test_icon_value_of_desktop_entry():
+    """Test reading the raw Icon value of our own desktop entries"""
+    entry = DesktopEntry("/a.desktop", "[Desktop Entry]\nIcon=/opt/a.png\n")
+    assert get_icon_value(entry) == "/opt/a.png"
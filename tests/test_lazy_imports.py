@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def test_startup_imports_skip_deferred_modules():
+    """Test that importing the application leaves views and dbus unloaded"""
+    code = (
+        "import gi, sys; "
+        "gi.require_version('Gtk', '4.0'); "
+        "gi.require_version('Adw', '1'); "
+        "import tweakslite.application; "
+        "print('\\n'.join(sys.modules))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    modules = set(result.stdout.split())
+    assert "tweakslite.window" in modules
+    assert not {m for m in modules if m == "dbus" or m.startswith("dbus.")}
+    assert not {m for m in modules if m.startswith("tweakslite.views.")}
+
+
+def test_views_package_loads_views_on_access():
+    """Test that the views package imports a view module when it is used"""
+    import tweakslite.views as views
+
+    assert views.SoundView.__module__ == "tweakslite.views.sound"
+    assert "SoundView" in views.__all__
@@ -0,0 +1,89 @@
+from tweakslite.prefetch import SLICE_BUDGET, ViewPrefetcher, VisitHistory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _history(tmp_path, counts=()):
+    history = VisitHistory(str(tmp_path / "visits.json"))
+    for category, count in counts:
+        for _ in range(count):
+            history.record(category)
+    return history
+
+
+def test_history_round_trip(tmp_path):
+    """Test that visit counts survive a restart"""
+    history = _history(tmp_path, [("Fonts", 2), ("Sound", 1)])
+    history.save()
+    loaded = VisitHistory(history.path)
+    assert loaded.get_count("Fonts") == 2
+    assert loaded.get_count("Windows") == 0
+
+
+def test_unreadable_history_is_ignored(tmp_path):
+    """Test that a corrupt history file starts an empty history"""
+    path = tmp_path / "visits.json"
+    path.write_text("{not json")
+    assert VisitHistory(str(path)).counts == {}
+
+
+def test_most_visited_views_come_first(tmp_path):
+    """Test that views are ordered by visits, then by sidebar order"""
+    history = _history(tmp_path, [("Sound", 3), ("Keyboard", 1)])
+    prefetcher = ViewPrefetcher(
+        ["Fonts", "Appearance", "Sound", "Keyboard"], lambda c: None, history
+    )
+    assert prefetcher.pending == ["Sound", "Keyboard", "Fonts", "Appearance"]
+
+
+def test_slices_respect_budget(tmp_path):
+    """Test that a slice stops starting views once its budget is spent"""
+    clock = FakeClock()
+    built = []
+
+    def build_view(category):
+        built.append(category)
+        clock.now += SLICE_BUDGET / 2
+
+    prefetcher = ViewPrefetcher(
+        ["A", "B", "C"], build_view, _history(tmp_path), clock=clock
+    )
+    assert prefetcher._run_slice()
+    assert built == ["A", "B"]
+    assert not prefetcher._run_slice()
+    assert built == ["A", "B", "C"]
+
+
+def test_failed_view_does_not_stop_prefetch(tmp_path):
+    """Test that a view that fails to build is skipped"""
+    built = []
+
+    def build_view(category):
+        if category == "A":
+            raise RuntimeError("broken")
+        built.append(category)
+
+    prefetcher = ViewPrefetcher(["A", "B"], build_view, _history(tmp_path))
+    prefetcher._run_slice()
+    assert built == ["B"]
+
+
+def test_input_pauses_prefetch(tmp_path):
+    """Test that input cancels the idle slice and schedules a resume"""
+    prefetcher = ViewPrefetcher(["A"], lambda c: None, _history(tmp_path))
+    prefetcher.start()
+    assert prefetcher._idle_id is not None
+    prefetcher._on_input()
+    assert prefetcher._idle_id is None
+    assert prefetcher._resume_id is not None
+    # Starting again waits for the resume
+    prefetcher.start()
+    assert prefetcher._idle_id is None
+    prefetcher.stop()
+    assert prefetcher._resume_id is None
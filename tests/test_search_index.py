@@ -0,0 +1,78 @@
+from tweakslite.search_index import SearchIndex, tokenize
+
+
+def _index(entries):
+    index = SearchIndex()
+    for key, fields in entries:
+        index.add(key, fields)
+    return index
+
+
+def test_tokenize():
+    """Test that text is split into casefolded words"""
+    assert tokenize("GNOME Text-Editor 2") == ["gnome", "text", "editor", "2"]
+    assert tokenize(None) == []
+
+
+def test_prefix_matches():
+    """Test that every query word must prefix a word of the key"""
+    index = _index(
+        [
+            ("editor", [("Text Editor", 4)]),
+            ("terminal", [("Terminal", 4)]),
+        ]
+    )
+    assert set(index.search("te")) == {"editor", "terminal"}
+    assert set(index.search("te ed")) == {"editor"}
+    assert index.search("") == {}
+    assert index.search("xyz") == {}
+
+
+def test_ranking():
+    """Test that exact words, then prefixes, then heavier fields rank first"""
+    index = _index(
+        [
+            ("keyword", [("Notes", 4), ("write", 2)]),
+            ("prefix", [("Writer", 4)]),
+            ("exact", [("Write", 4)]),
+        ]
+    )
+    assert index.rank("write") == ["exact", "prefix", "keyword"]
+
+
+def test_fuzzy_matches():
+    """Test that trigrams find words with typos"""
+    index = _index(
+        [
+            ("firefox", [("Firefox", 4)]),
+            ("files", [("Files", 4)]),
+        ]
+    )
+    assert index.rank("firefx") == ["firefox"]
+    assert index.rank("fierfox") == ["firefox"]
+    # Short query words never match fuzzily
+    assert index.rank("fx") == []
+
+
+def test_results_follow_new_keys():
+    """Test that cached results are dropped when keys are added"""
+    index = _index([("a", [("Alpha", 1)])])
+    assert set(index.search("al")) == {"a"}
+    index.add("b", [("Alps", 1)])
+    assert set(index.search("al")) == {"a", "b"}
+    assert len(index) == 2
+
+
+def test_large_index_queries():
+    """Test that queries against many keys find exactly the matching ones"""
+    index = _index(
+        (i, [(f"Application {i} word{i % 97} tool{i % 13}", 4), ("Utility", 1)])
+        for i in range(1000)
+    )
+    tool12 = {i for i in range(1000) if i % 13 == 12}
+    # Exact words rank above the fuzzy matches of the other tool numbers
+    assert set(index.rank("tool12")[: len(tool12)]) == tool12
+    assert set(index.search("app 5")) == {
+        i for i in range(1000) if str(i).startswith("5")
+    }
+    assert len(index.search("utilty")) == 1000
@@ -0,0 +1,245 @@
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+from gi.repository import GLib
+from tweakslite.settings_registry import SettingsRegistry, registry
+
+
+class FakeDConf:
+    """In-memory stand-in for DConfSettings that records batches"""
+
+    def __init__(self, defaults, values=None):
+        self.defaults = defaults
+        self.values = dict(values or {})
+        self.calls = []
+
+    @contextmanager
+    def batch(self):
+        self.calls.append("begin")
+        yield self
+        self.calls.append("commit")
+
+    def reset(self, schema, key):
+        self.calls.append(("reset", schema, key))
+        self.values.pop((schema, key), None)
+
+    def get_value(self, schema, key):
+        return self.values.get((schema, key), self.defaults[(schema, key)])
+
+    def get_default_value(self, schema, key):
+        return self.defaults[(schema, key)]
+
+
+def _registry():
+    settings = SettingsRegistry()
+    settings.register(
+        "Windows",
+        "Window Focus",
+        "wm",
+        "focus-mode",
+        "s",
+        "Focus Mode",
+        options={"click": "Click to Focus", "sloppy": "Focus on Hover"},
+    )
+    settings.register(
+        "Windows",
+        "Window Focus",
+        "wm",
+        "auto-raise",
+        "b",
+        "Raise Windows When Focused",
+        subtitle="Windows are raised to the top",
+    )
+    settings.register(
+        "Keyboard", "Layout", "input-sources", "xkb-options", "as", "Layout Options"
+    )
+    return settings
+
+
+def _dconf():
+    return FakeDConf(
+        {
+            ("wm", "focus-mode"): GLib.Variant("s", "click"),
+            ("wm", "auto-raise"): GLib.Variant("b", False),
+            ("input-sources", "xkb-options"): GLib.Variant("as", []),
+        },
+        {
+            ("wm", "focus-mode"): GLib.Variant("s", "sloppy"),
+            ("input-sources", "xkb-options"): GLib.Variant("as", ["caps:none"]),
+        },
+    )
+
+
+def test_settings_by_view():
+    """Test that settings are listed per view in registration order"""
+    settings = _registry()
+    assert settings.get_views() == ["Windows", "Keyboard"]
+    assert [s.key for s in settings.get_settings("Windows")] == [
+        "focus-mode",
+        "auto-raise",
+    ]
+    assert settings.get("wm", "focus-mode").get_option_values() == ["click", "sloppy"]
+    assert settings.get("wm", "missing") is None
+
+
+def test_search_text():
+    """Test that sections, labels, subtitles and options are searchable"""
+    assert _registry().get_search_text("Windows") == [
+        "Window Focus",
+        "Focus Mode",
+        "Click to Focus",
+        "Focus on Hover",
+        "Raise Windows When Focused",
+        "Windows are raised to the top",
+    ]
+
+
+def test_reset_is_one_batch():
+    """Test that resetting a view resets its keys inside a single batch"""
+    dconf = _dconf()
+    _registry().reset(dconf, "Windows")
+    assert dconf.calls == [
+        "begin",
+        ("reset", "wm", "focus-mode"),
+        ("reset", "wm", "auto-raise"),
+        "commit",
+    ]
+
+
+def test_reset_skips_kept_settings():
+    """Test that settings registered with reset=False survive a reset"""
+    settings = _registry()
+    settings.register(
+        "Windows", "Window Focus", "wm", "raise-on-click", "b", "Raise", reset=False
+    )
+    dconf = _dconf()
+    settings.reset(dconf)
+    assert ("reset", "wm", "raise-on-click") not in dconf.calls
+    assert ("reset", "wm", "focus-mode") in dconf.calls
+
+
+def test_appearance_reset_keeps_background():
+    """Test that resetting Appearance only resets the baseline style keys"""
+    import tweakslite.views.appearance  # noqa: F401
+
+    dconf = MagicMock()
+    registry.reset(dconf, "Appearance")
+    assert sorted(call.args for call in dconf.reset.call_args_list) == [
+        ("interface", "color-scheme"),
+        ("interface", "cursor-theme"),
+        ("interface", "gtk-theme"),
+        ("interface", "icon-theme"),
+    ]
+
+
+def test_diff_and_export():
+    """Test that only changed settings are reported and exported"""
+    settings = _registry()
+    dconf = _dconf()
+    changes = settings.diff_against_defaults(dconf)
+    assert [(s.key, v.unpack()) for s, v, _ in changes] == [
+        ("focus-mode", "sloppy"),
+        ("xkb-options", ["caps:none"]),
+    ]
+    assert settings.export_profile(dconf) == (
+        "[org/gnome/desktop/wm/preferences]\n"
+        "focus-mode='sloppy'\n"
+        "\n"
+        "[org/gnome/desktop/input-sources]\n"
+        "xkb-options=['caps:none']\n"
+        "\n"
+    )
+    assert settings.export_profile(dconf, "Keyboard").startswith(
+        "[org/gnome/desktop/input-sources]"
+    )
+
+
+def test_export_annotates_types():
+    """Test that exported values keep types dconf load cannot infer"""
+    settings = _registry()
+    dconf = _dconf()
+    dconf.defaults[("input-sources", "xkb-options")] = GLib.Variant("as", ["a"])
+    dconf.values[("input-sources", "xkb-options")] = GLib.Variant("as", [])
+    assert "xkb-options=@as []\n" in settings.export_profile(dconf, "Keyboard")
+
+
+def test_views_register_their_settings():
+    """Test that importing the view modules registers their keys"""
+    from tweakslite.views import fonts, windows  # noqa: F401
+
+    assert registry.get("wm", "button-layout").view == "Windows"
+    assert registry.get("interface", "font-hinting").get_option_labels() == [
+        "Full",
+        "Medium",
+        "Slight",
+        "None",
+    ]
+
+
+def test_view_reset_uses_registry():
+    """Test that a view resets exactly its registered keys"""
+    from tweakslite.views.sound import View
+
+    dconf = MagicMock()
+    view = View.__new__(View)
+    view.dconf = dconf
+    view.reset_settings()
+    dconf.batch.assert_called_once()
+    assert [c.args for c in dconf.reset.call_args_list] == [
+        ("sound", "theme-name"),
+        ("sound", "event-sounds"),
+    ]
+
+
+def test_view_without_settings_resets_nothing():
+    """Test that resetting a view without a category does nothing"""
+    from tweakslite.views.base import BaseView
+
+    dconf = MagicMock()
+    view = BaseView.__new__(BaseView)
+    view.dconf = dconf
+    view.reset_settings()
+    dconf.reset.assert_not_called()
+
+
+def test_watch_setting_blocks_writers():
+    """Test that widget handlers are blocked while a change is shown"""
+    from tweakslite.views.base import BaseView
+
+    dconf = MagicMock()
+    switch = MagicMock()
+    view = BaseView.__new__(BaseView)
+    view.dconf = dconf
+    view._setting_handlers = []
+    view.bind_switch(switch, 7, "wm", "auto-raise")
+
+    schema, key, on_changed = dconf.connect_changed.call_args.args
+    assert (schema, key) == ("wm", "auto-raise")
+    switch.set_active.side_effect = lambda active: (
+        switch.handler_block.assert_called_once_with(7)
+    )
+    on_changed(schema, key)
+    switch.set_active.assert_called_once_with(dconf.get_boolean.return_value)
+    switch.handler_unblock.assert_called_once_with(7)
+
+
+def test_views_follow_changes_made_elsewhere():
+    """Test that the fonts and windows widgets watch the keys they show"""
+    from tweakslite.views import fonts, windows
+
+    for module, keys in [
+        (
+            fonts,
+            {
+                "font-name",
+                "document-font-name",
+                "monospace-font-name",
+                "font-hinting",
+                "font-antialiasing",
+            },
+        ),
+        (windows, {"button-layout", "focus-mode", "auto-raise"}),
+    ]:
+        dconf = MagicMock()
+        module.View(dconf)
+        watched = {call.args[1] for call in dconf.connect_changed.call_args_list}
+        assert keys <= watched
@@ -0,0 +1,48 @@
+from tweakslite.settings_search import (
+    SettingsSearchIndex,
+    get_view_module_name,
+    get_view_search_text,
+)
+
+
+def _index():
+    return SettingsSearchIndex(
+        {
+            "Windows": ["Windows", "Focus on Hover", "Titlebar Buttons"],
+            "Fonts": ["Fonts", "Hinting", "Monospace Text"],
+            "Keyboard": ["Keyboard", "Overview Shortcut"],
+        }
+    )
+
+
+def test_prefix_and_substring_matches():
+    """Test that queries match word prefixes and inner substrings"""
+    index = _index()
+    assert index.search("HOV") == {"Windows"}
+    assert index.search("space") == {"Fonts"}
+    assert index.search("o") == {"Windows", "Fonts", "Keyboard"}
+    assert index.search("overview short") == {"Keyboard"}
+    assert index.search("missing") == set()
+
+
+def test_results_are_cached():
+    """Test that repeating a query returns the stored result"""
+    index = _index()
+    assert index.search("font") is index.search("Font ")
+
+
+def test_view_metadata_is_read_without_building_views(mocker):
+    """Test that indexing reads view modules but never instantiates views"""
+    from tweakslite.views import windows
+
+    build = mocker.patch.object(windows.View, "__init__")
+    assert get_view_module_name("Mouse & Touchpad") == "mouse_and_touchpad"
+    assert "Focus on Hover" in get_view_search_text("Windows")
+    assert get_view_search_text("No Such Page") == ()
+
+    index = SettingsSearchIndex.for_categories(
+        ["Windows", "Sound"], lambda category: [category, category.lower()]
+    )
+    assert index.search("raise windows") == {"Windows"}
+    assert index.search("sound theme") == {"Sound"}
+    build.assert_not_called()
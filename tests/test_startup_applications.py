@@ -0,0 +1,161 @@
+import threading
+from functools import cmp_to_key
+from gi.repository import Gio, GLib
+from tweakslite.desktop_entry import DesktopEntry
+from tweakslite.environment import RuntimeEnvironment
+from tweakslite.managers.app_index import (
+    HOST_APPLICATION_DIR,
+    get_flatpak_application_dirs,
+)
+from tweakslite.views.startup_applications import (
+    ApplicationItem,
+    ApplicationSearch,
+    ApplicationLoader,
+    discover_applications,
+)
+
+
+def _run_loader(loader, timeout=5):
+    """Runs the main loop until the loader finishes or times out"""
+    loop = GLib.MainLoop()
+    on_done = loader.on_done
+
+    def finish():
+        on_done()
+        loop.quit()
+
+    loader.on_done = finish
+    loader.start()
+    GLib.timeout_add_seconds(timeout, loop.quit)
+    loop.run()
+
+
+def test_loader_delivers_chunks_on_main_thread():
+    """Test that results arrive in chunks on the main thread"""
+    chunks = []
+    threads = []
+    done = []
+
+    def on_chunk(chunk):
+        threads.append(threading.current_thread())
+        chunks.append(chunk)
+
+    loader = ApplicationLoader(
+        lambda cancelled: iter(range(7)), on_chunk, lambda: done.append(True), 3
+    )
+    _run_loader(loader)
+
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6]]
+    assert threads == [threading.main_thread()] * 3
+    assert done == [True]
+
+
+def test_loader_cancel_stops_discovery():
+    """Test that cancelling stops the worker and drops pending results"""
+    started = threading.Event()
+    produced = []
+    chunks = []
+    done = []
+
+    def discover(cancelled):
+        for i in range(1000):
+            produced.append(i)
+            if i == 5:
+                started.set()
+                cancelled.wait(5)
+            yield i
+
+    loader = ApplicationLoader(discover, chunks.append, lambda: done.append(1), 2)
+    loader.start()
+    started.wait(5)
+    loader.cancel()
+    loader.thread.join(5)
+
+    context = GLib.MainContext.default()
+    while context.pending():
+        context.iteration(False)
+
+    assert not loader.thread.is_alive()
+    assert len(produced) < 1000
+    assert done == []
+    assert all(chunk in ([0, 1], [2, 3], [4, 5]) for chunk in chunks)
+
+
+def test_discover_flatpak_host_apps(mocker):
+    """Test that host applications from the index are turned into entries"""
+    app_index = mocker.Mock()
+    app_index.load.return_value = {
+        HOST_APPLICATION_DIR: [
+            (
+                "/usr/share/applications/files.desktop",
+                "[Desktop Entry]\nType=Application\nName=Files\nExec=nautilus\n",
+            ),
+            ("/usr/share/applications/broken.desktop", "not a desktop file"),
+        ]
+    }
+    apps = list(
+        discover_applications(
+            RuntimeEnvironment(is_flatpak=True), app_index, threading.Event()
+        )
+    )
+    assert [app.get_name() for app in apps] == ["Files"]
+
+
+def test_application_search_filters_and_ranks():
+    """Test that the picker search filters and orders application records"""
+    store = Gio.ListStore(item_type=ApplicationItem)
+    for name, extra in [
+        ("Files", "Comment=Browse folders\nKeywords=folder;manager;\n"),
+        ("Terminal", "GenericName=Terminal Emulator\nExec=kgx --new-window\n"),
+        ("Folder Colors", ""),
+    ]:
+        content = f"[Desktop Entry]\nName={name}\n{extra}"
+        store.append(ApplicationItem(DesktopEntry(f"/{name}.desktop", content)))
+    items = [store.get_item(i) for i in range(store.get_n_items())]
+    files, terminal, colors = items
+
+    search = ApplicationSearch()
+    search.add(items)
+    assert all(search.matches(item) for item in items)
+
+    search.set_query("FOLDER")
+    assert not search.matches(terminal)
+    assert sorted(items[:1] + items[2:], key=cmp_to_key(search.compare)) == [
+        colors,
+        files,
+    ]
+
+    search.set_query("kgx")
+    assert search.matches(terminal) and not search.matches(files)
+    search.set_query("emulatr")
+    assert search.matches(terminal)
+    search.set_query("")
+    assert sorted(items, key=cmp_to_key(search.compare)) == items
+
+
+def test_discover_flatpak_exports_in_order(mocker):
+    """Test that exported apps are parsed in index order"""
+    location = get_flatpak_application_dirs()[0]
+    app_index = mocker.Mock()
+    app_index.load.return_value = {
+        location: [
+            (
+                f"{location}/app{i:03}.desktop",
+                "[Desktop Entry]\nType=Application\n"
+                f"Name=App {i}\nExec=flatpak run app{i}\n",
+            )
+            for i in range(100)
+        ]
+        + [(f"{location}/link.desktop", "[Desktop Entry]\nType=Link\nName=Link\n")]
+    }
+    apps = list(
+        discover_applications(
+            RuntimeEnvironment(is_flatpak=True),
+            app_index,
+            threading.Event(),
+        )
+    )
+    assert [app.get_name() for app in apps] == [f"App {i}" for i in range(100)]
+    # Built from the exported file itself, so the real command is kept
+    assert apps[0].exec == "flatpak run app0"
+    assert apps[0].get_filename() == f"{location}/app000.desktop"
@@ -0,0 +1,77 @@
+import json
+from tweakslite import startup_profile
+from tweakslite.startup_profile import StartupProfiler, profile_phase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def _profiler(tmp_path=None):
+    clock = FakeClock()
+    profiler = StartupProfiler(
+        start=10.0,
+        json_path=str(tmp_path / "profile.json") if tmp_path else None,
+        clock=clock,
+    )
+    profiler.add("imports", 10.0, 10.1)
+    clock.now = 10.1
+    with profiler.phase("create window"):
+        clock.now = 10.15
+        with profiler.phase("settings manager"):
+            clock.now = 10.2
+        with profiler.phase("load CSS"):
+            clock.now = 10.21
+        clock.now = 10.4
+    profiler.presented = 10.5
+    return profiler
+
+
+def test_report_is_sorted_and_nested():
+    """Test that phases are listed longest first with their inner phases"""
+    report = _profiler().get_report()
+    assert report["total_ms"] == 500.0
+    assert [p["name"] for p in report["phases"]] == ["create window", "imports"]
+    window = report["phases"][0]
+    assert window["start_ms"] == 100.0
+    assert window["duration_ms"] == 300.0
+    assert [p["name"] for p in window["children"]] == ["settings manager", "load CSS"]
+    assert report["unaccounted_ms"] == 100.0
+
+
+def test_format_report():
+    """Test that the text report shows times, shares and nesting"""
+    lines = _profiler().format_report().splitlines()
+    assert lines[0] == "Startup took 500.0 ms to the first frame"
+    assert lines[1].split() == ["300.0", "ms", "60.0%", "create", "window"]
+    assert lines[2].endswith("    settings manager")
+    assert lines[-1].split() == ["100.0", "ms", "20.0%", "(other)"]
+
+
+def test_finish_writes_json(tmp_path, capsys):
+    """Test that finishing prints the report and writes it as JSON"""
+    profiler = _profiler(tmp_path)
+    profiler.finish()
+    assert "Startup took" in capsys.readouterr().err
+    with open(profiler.json_path) as f:
+        assert json.load(f) == profiler.get_report()
+
+
+def test_phases_are_not_timed_without_profiling(monkeypatch):
+    """Test that profile_phase only records while profiling is enabled"""
+    monkeypatch.setattr(startup_profile, "_profiler", None)
+    with profile_phase("ignored"):
+        pass
+
+    profiler = startup_profile.enable_profiling()
+    with profile_phase("timed"):
+        pass
+    profiler.finished = True
+    with profile_phase("after first frame"):
+        pass
+    assert [p.name for p in profiler.phases] == ["timed"]
+    monkeypatch.setattr(startup_profile, "_profiler", None)
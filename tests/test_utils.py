@@ -4,12 +4,14 @@ from tweakslite.utils import (
     setup_logging,
     is_flatpak,
     run_command,
+    run_command_async,
     format_keyboard_option,
     format_key_description,
 )
 import logging
 import os
 import subprocess
+from gi.repository import GLib
 
 
 def test_escape_markup():
@@ -64,14 +66,14 @@ def test_setup_logging_info_level(tmp_path):
     assert logger.level == logging.INFO
 
 
-def test_is_flatpak(tmp_path, monkeypatch):
+def test_is_flatpak(runtime_environment):
     """Test Flatpak environment detection in both scenarios"""
     # Test non-Flatpak environment
-    monkeypatch.setattr("os.path.exists", lambda x: False)
+    runtime_environment(is_flatpak=False)
     assert not is_flatpak()
 
     # Test Flatpak environment
-    monkeypatch.setattr("os.path.exists", lambda x: x == "/.flatpak-info")
+    runtime_environment(is_flatpak=True)
     assert is_flatpak()
 
 
@@ -108,9 +110,7 @@ def test_run_command_timeout(monkeypatch):
 
     monkeypatch.setattr("subprocess.run", mock_run)
 
-    # Since TimeoutExpired isn't explicitly handled, it will propagate
-    with pytest.raises(subprocess.TimeoutExpired):
-        run_command(["test", "command"])
+    assert run_command(["test", "command"]) is None
 
 
 def test_setup_logging_file_error(tmp_path, monkeypatch):
@@ -242,7 +242,7 @@ def test_run_command_error_logging(monkeypatch, capsys):
     assert "error message" in captured.err
 
 
-def test_run_command_timeout_logging(monkeypatch, capsys):
+def test_run_command_timeout_logging(monkeypatch, caplog):
     """Test timeout logging in run_command"""
 
     def mock_run(*args, **kwargs):
@@ -250,6 +250,62 @@ def test_run_command_timeout_logging(monkeypatch, capsys):
 
     monkeypatch.setattr("subprocess.run", mock_run)
 
-    # Should raise TimeoutExpired
-    with pytest.raises(subprocess.TimeoutExpired):
-        run_command(["test", "command"])
+    assert run_command(["test", "command"]) is None
+    assert "Command timed out" in caplog.text
+
+
+def _run_async_and_wait(command, **kwargs):
+    """Runs run_command_async inside a main loop and returns its output"""
+    loop = GLib.MainLoop()
+    results = []
+
+    def on_done(output):
+        results.append(output)
+        loop.quit()
+
+    run_command_async(command, on_done, **kwargs)
+    GLib.timeout_add_seconds(5, loop.quit)
+    loop.run()
+    return results
+
+
+def test_run_command_async_success(runtime_environment):
+    """Test asynchronous command execution"""
+    runtime_environment(is_flatpak=False)
+    assert _run_async_and_wait(["echo", "async output"]) == ["async output"]
+
+
+def test_run_command_async_shell(runtime_environment):
+    """Test asynchronous execution of shell command strings"""
+    runtime_environment(is_flatpak=False)
+    assert _run_async_and_wait("echo one && echo two", shell=True) == ["one\ntwo"]
+
+
+def test_run_command_async_binary(runtime_environment):
+    """Test that binary output is passed on unmodified"""
+    runtime_environment(is_flatpak=False)
+    output = _run_async_and_wait(r"printf ' a\0b\n'", shell=True, binary=True)
+    assert output == [b" a\0b\n"]
+
+
+def test_run_command_async_failure(runtime_environment):
+    """Test that failed asynchronous commands report None"""
+    runtime_environment(is_flatpak=False)
+    assert _run_async_and_wait("exit 1", shell=True) == [None]
+
+
+def test_run_command_async_cancel(runtime_environment):
+    """Test cancelling an asynchronous command"""
+    runtime_environment(is_flatpak=False)
+    loop = GLib.MainLoop()
+    results = []
+
+    def on_done(output):
+        results.append(output)
+        loop.quit()
+
+    cancellable = run_command_async(["sleep", "5"], on_done)
+    cancellable.cancel()
+    GLib.timeout_add_seconds(5, loop.quit)
+    loop.run()
+    assert results == [None]